@@ -1,7 +1,5 @@
 from reportlab.platypus import SimpleDocTemplate
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfbase import pdfmetrics
 from pdf_flowable_blocks.pdf_flowable_blocks.paragraph_block import ParagraphBlockV2
 from pdf_flowable_blocks.pdf_flowable_blocks.header_block import HeaderBlockV2
 from pdf_flowable_blocks.pdf_flowable_blocks.generic_table_block import GenericTableBlockV2
@@ -10,27 +8,8 @@ from pdf_flowable_blocks.pdf_flowable_blocks.grid_block import GridBlockV2
 from pdf_flowable_blocks.pdf_flowable_blocks.list_block import ListBlockV2
 from pdf_flowable_blocks.pdf_flowable_blocks.qr_code_block import QRCodeBlock
 from pdf_flowable_blocks.pdf_flowable_blocks.image_block import ImageBlock, ImageDTO
-
-regular_font_path = "pdf_letter_generator/fonts/Inter-4.1/extras/ttf/Inter-Regular.ttf"
-medium_font_path = "pdf_letter_generator/fonts/Inter-4.1/extras/ttf/Inter-Medium.ttf"
-bold_font_path = "pdf_letter_generator/fonts/Inter-4.1/extras/ttf/Inter-Bold.ttf"
-italic_font_path = "pdf_letter_generator/fonts/Inter-4.1/extras/ttf/Inter-Italic.ttf"
-bolditalic_font_path = "pdf_letter_generator/fonts/Inter-4.1/extras/ttf/Inter-BoldItalic.ttf"
-
-# Register fonts
-pdfmetrics.registerFont(TTFont("Inter", regular_font_path))
-pdfmetrics.registerFont(TTFont("Inter-Medium", medium_font_path))
-pdfmetrics.registerFont(TTFont("Inter-Bold", bold_font_path))
-pdfmetrics.registerFont(TTFont("Inter-Italic", italic_font_path))
-pdfmetrics.registerFont(TTFont("Inter-BoldItalic", bolditalic_font_path))
-
-pdfmetrics.registerFontFamily(
-    "Inter",
-    normal="Inter",
-    bold="Inter-Bold",
-    italic="Inter-Italic",
-    boldItalic="Inter-BoldItalic"
-)
+from pdf_flowable_blocks.pdf_flowable_blocks.outline import DocumentOutline
+from pdf_letter_generator.fonts.font_registry import font_registry
 
 
 def add_watermark(canvas, doc):
@@ -51,16 +30,27 @@ def add_watermark(canvas, doc):
     canvas.restoreState()
 
 
-def generate_pdf_for_letter():
+def add_section(story, outline, title, level=1):
+    # Bookmark the section that follows; sections without a title are skipped
+    entry = outline.entry(title, level=level)
+    if entry:
+        story.append(entry)
+
+
+def generate_pdf_for_letter(with_table_of_contents=False):
+    # Registered on first use, from the parsed-font cache when available
+    font_registry.ensure_family("Inter")
     doc = SimpleDocTemplate("pc_documents.pdf", pagesize=letter, leftMargin=48,
                             rightMargin=48, topMargin=50, bottomMargin=50)
     story = []
+    outline = DocumentOutline()
     logo_url = "https://crm-backend-media-static.s3.ap-south-1.amazonaws.com/alpha/media/tgbpass_logo.png"
     header_text = "If “Title 1” has 2 lines height of the heading"
     sub_header_text = "If “Title 2” has long text of the heading be here"
     sub_sub_header_text = "<b>If “Title 3”</b> has long text of the heading be here"
     right_block_text = "BuildNow"
 
+    add_section(story, outline, header_text, level=0)
     heads = HeaderBlockV2().create_header_flowables(logo_url=logo_url, header_text=header_text,
                                                     sub_header_text=sub_header_text,
                                                     sub_sub_header_text=sub_sub_header_text,
@@ -69,6 +59,7 @@ def generate_pdf_for_letter():
         story.append(head)
     grid_block = GridBlockV2()
     heading = "To,"
+    add_section(story, outline, heading)
     grid_units = [
         {
             "text_lines": ["""1. Smt. DEVULAPALLI PRASANNA KUMARI<br/>
@@ -91,6 +82,7 @@ def generate_pdf_for_letter():
         story.append(value)
 
     heading = "Sir/Madam"
+    add_section(story, outline, heading)
     lines = ["""Sub: Greater Hyderabad Municipal Corporation - Construction of Individual<br/>
                             &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;Residential Building consisting of Ground Floor to an extent of 267.56<br/>
                             &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;Sq.Meters (320.0 Sq.Yds)situated at Plot No: 23, Locality: 23, Survey No: 233,<br/> 
@@ -119,6 +111,7 @@ def generate_pdf_for_letter():
     rows = [RowConfig(cells=row1_cells, height=30), RowConfig(cells=row2_cells, height=30),
             RowConfig(cells=row3_cells, height=36)]
     heading = "Section Heading Title"
+    add_section(story, outline, heading)
     table_values = GenericTableBlockV2().create_generic_table_flowables(heading=heading,
                                                                         rows=rows)
     for value in table_values:
@@ -135,12 +128,14 @@ def generate_pdf_for_letter():
             RowConfig(cells=row3_cells, height=36)]
 
     heading = "Plot Details"
+    add_section(story, outline, heading)
     table_values = GenericTableBlockV2().create_generic_table_flowables(heading=heading,
                                                                         rows=rows)
     for value in table_values:
         story.append(value)
 
     list_block = ListBlockV2()
+    add_section(story, outline, "Conditions of Permission")
     list_values = list_block.create_list_flowables(
                     heading="""The Building permission is sanctioned subject to following conditions
                                The applicant should follow the clause 5.f (i) (ii) (iii) (iv) (v)( vii) (xi)&(xiv) of
@@ -186,6 +181,7 @@ def generate_pdf_for_letter():
     for value in list_values:
         story.append(value)
 
+    add_section(story, outline, "Site Photographs")
     image_block = ImageBlock()
     image_dtos = [
         ImageDTO(header="This is first image",
@@ -212,6 +208,7 @@ def generate_pdf_for_letter():
         story.append(image)
 
     list_block = ListBlockV2()
+    add_section(story, outline, "Project Plan")
     list_values = list_block.create_list_flowables(
         heading="""The Building permission is sanctioned subject to following conditions
                                    The applicant should follow the clause 5.f (i) (ii) (iii) (iv) (v)( vii) (xi)&(xiv) of
@@ -263,4 +260,8 @@ def generate_pdf_for_letter():
     for value in grid_values:
         story.append(value)
 
+    # Page numbers of the contents are filled in during the same build
+    if with_table_of_contents:
+        story = outline.insert_table_of_contents(story)
+
     doc.build(story, onFirstPage=add_watermark, onLaterPages=add_watermark)
@@ -4,9 +4,13 @@ from reportlab.lib.utils import ImageReader
 from qrcode.main import QRCode
 from qrcode.constants import ERROR_CORRECT_L
 from PIL import Image as PILImage
-import requests
 import io
+import logging
 from reportlab.lib.pagesizes import letter
+from pdf_letter_generator.commons.asset_fetch import asset_fetcher
+
+# Configure logging
+logger = logging.getLogger(__name__)
 
 
 class QRCodeBlockCanvas:
@@ -62,8 +66,13 @@ class QRCodeBlockCanvas:
 
     @staticmethod
     def _add_logo_to_qr(qr_img: PILImage.Image, logo_url: str) -> PILImage.Image:
-        response = requests.get(logo_url)
-        logo = PILImage.open(io.BytesIO(response.content)).convert("RGBA")
+        try:
+            logo_data = asset_fetcher.fetch(logo_url)
+        except Exception as e:
+            # A QR code without the logo still scans
+            logger.error(f"Error fetching QR code logo {logo_url}: {str(e)}")
+            return qr_img
+        logo = PILImage.open(io.BytesIO(logo_data)).convert("RGBA")
 
         qr_width, qr_height = qr_img.size
         logo_size = min(qr_width, qr_height) // 4
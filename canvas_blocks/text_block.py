@@ -4,6 +4,8 @@ import io
 from typing import Optional
 from reportlab.lib.units import inch
 
+from pdf_letter_generator.commons.text_utils import wrap_text_to_width
+
 
 class TextBlockCanvas:
 
@@ -62,28 +64,15 @@ class TextBlockCanvas:
         c.setFont(self.FONT, font_size)
         count = 0
         text_count = 1
+        # The same text is repeated, so wrap it once
+        lines = wrap_text_to_width(text, max_width, self.FONT, font_size)
         while y > inch:
-            words = text.split(' ')
-            current_line = ''
-            line_count = 1
-            for word in words:
-                test_line = current_line + ' ' + word if current_line else word
-                test_width = c.stringWidth(test_line, self.FONT, font_size)
-                if test_width > max_width and line_count == 1:
+            for line_count, current_line in enumerate(lines, start=1):
+                if line_count == 1 and len(lines) > 1:
                     current_line = f"{text_count}.{current_line}"
-                    c.drawString(x, y, current_line)
-                    y -= line_height
-                    current_line = word
-                    line_count += 1
-                elif test_width > max_width:
-                    c.drawString(x, y, current_line)
-                    y -= line_height
-                    current_line = word
-                    line_count += 1
-                else:
-                    current_line = test_line
-            if current_line:
                 c.drawString(x, y, current_line)
+                if line_count < len(lines):
+                    y -= line_height
             text_count += 1
             y -= 20
             count += 1
@@ -1,6 +1,7 @@
 import html
 import re
 from io import BytesIO
+from typing import Optional
 
 from bs4 import BeautifulSoup, NavigableString
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT, TA_RIGHT
@@ -9,14 +10,18 @@ from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.platypus import (
     ListFlowable,
     ListItem,
-    Paragraph,
     SimpleDocTemplate,
     Spacer,
 )
 
+from pdf_letter_generator.commons.paragraph_cache import CachedParagraph
+from pdf_letter_generator.commons.render_budget import RenderBudget
+
 
 class HTMLToPDFConverter:
-    def __init__(self):
+    def __init__(self, budget: Optional[RenderBudget] = None):
+        # Checked per tag while converting and per page while building
+        self.budget = budget
         self.buffer = BytesIO()
         self.doc = SimpleDocTemplate(
             self.buffer,
@@ -80,6 +85,10 @@ class HTMLToPDFConverter:
 
     def process_text_with_style(self, element):
         """Process text with inline styling (bold, italic)."""
+        if self.budget is not None:
+            # Deeply nested markup recurses here once per level
+            self.budget.check("html")
+
         text = ""
         for item in element.contents:
             if isinstance(item, NavigableString):
@@ -115,7 +124,7 @@ class HTMLToPDFConverter:
             style = self.get_alignment_style(li)
             items.append(
                 ListItem(
-                    Paragraph(text, style), leftIndent=20, bulletText=bullet
+                    CachedParagraph(text, style), leftIndent=20, bulletText=bullet
                 )
             )
 
@@ -130,10 +139,13 @@ class HTMLToPDFConverter:
 
     def process_tag(self, tag):
         """Process individual HTML tags and convert to appropriate PDF elements."""
+        if self.budget is not None:
+            self.budget.check("html")
+
         if isinstance(tag, NavigableString):
             text = self.clean_text(str(tag))
             if text:
-                self.story.append(Paragraph(text, style=self.custom_styles["remarks"]))
+                self.story.append(CachedParagraph(text, style=self.custom_styles["remarks"]))
             return
 
         if tag.name is None:
@@ -165,7 +177,7 @@ class HTMLToPDFConverter:
                 "CustomH1", parent=base_style, alignment=style.alignment
             )
             self.story.append(Spacer(1, 16))
-            self.story.append(Paragraph(text, custom_style))
+            self.story.append(CachedParagraph(text, custom_style))
             self.story.append(Spacer(1, 16))
 
         elif tag.name == "h2":
@@ -174,7 +186,7 @@ class HTMLToPDFConverter:
                 "CustomH2", parent=base_style, alignment=style.alignment
             )
             self.story.append(Spacer(1, 12))
-            self.story.append(Paragraph(text, custom_style))
+            self.story.append(CachedParagraph(text, custom_style))
             self.story.append(Spacer(1, 12))
 
         elif tag.name == "h3":
@@ -183,11 +195,11 @@ class HTMLToPDFConverter:
                 "CustomH3", parent=base_style, alignment=style.alignment
             )
             self.story.append(Spacer(1, 10))
-            self.story.append(Paragraph(text, custom_style))
+            self.story.append(CachedParagraph(text, custom_style))
             self.story.append(Spacer(1, 10))
 
         elif tag.name in ["p", "div"]:
-            self.story.append(Paragraph(text, style))
+            self.story.append(CachedParagraph(text, style))
             self.story.append(Spacer(1, 12))
 
     def convert_html_content_to_stories(self, html_content):
@@ -198,7 +210,12 @@ class HTMLToPDFConverter:
         # Process body content
         body = soup.find("body") or soup
         for tag in body.children:
+            story_length = len(self.story)
             self.process_tag(tag)
+            if self.budget is not None:
+                self.budget.add_flowables(
+                    len(self.story) - story_length, "html"
+                )
 
         # Build PDF
         return self.story
@@ -211,7 +228,10 @@ class HTMLToPDFConverter:
             html_content (str): HTML content to convert
             output_path (str): Path where the PDF file should be saved
         """
-        self.doc.build(flowables)
+        if self.budget is None:
+            self.doc.build(flowables)
+        else:
+            self.budget.build(self.doc, flowables)
         pdf_bytes = self.buffer.getvalue()
         self.buffer.close()
 
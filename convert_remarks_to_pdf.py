@@ -1,18 +1,23 @@
 from io import BytesIO
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from dataclasses import dataclass
-from reportlab.platypus import SimpleDocTemplate, Spacer, Paragraph
+from reportlab.platypus import SimpleDocTemplate
 import datetime
-from reportlab.lib.styles import ParagraphStyle
 
 from pdf_letter_generator.pdf_blocks.pdf_config import PDFConfig
-from pdf_flowable_blocks.pdf_flowable_blocks.remarks_header_block import (
-    RemarksHeaderBlock,
+from pdf_flowable_blocks.pdf_flowable_blocks.document_ir import (
+    DocumentIR,
+    IRCompiler,
+    RemarkNode,
+    RemarksHeaderNode,
 )
-from pdf_flowable_blocks.pdf_flowable_blocks.remark_block import (
-    RemarkBlock,
+from pdf_flowable_blocks.pdf_flowable_blocks.layout_measure import (
+    LayoutMeasurement,
+    measure_block_flowables,
 )
-from convert_html_to_pdf import HTMLToPDFConverter
+from pdf_letter_generator.commons.author_resolver import AuthorResolver
+from pdf_letter_generator.commons.image_registry import image_registry_scope
+from pdf_letter_generator.commons.render_budget import RenderBudget
 
 
 @dataclass
@@ -44,78 +49,112 @@ class ConvertRemarksToPDFInteractor:
     # def iam_service(self) -> IamService:
     #     return get_service_adapter().iam_service
 
+    def __init__(self, author_resolver: Optional[AuthorResolver] = None):
+        # Plug in AuthorResolver(source=IamServiceProfileSource(iam_service))
+        self.author_resolver = author_resolver or AuthorResolver()
+
     def convert_remarks_to_pdf(
-        self, remark_dtos: List[PipelineItemRemarksDTO],
-            extra_remark_dto: Optional[RemarkDTO] = None
+        self, remark_dtos: Iterable[PipelineItemRemarksDTO],
+            extra_remark_dto: Optional[RemarkDTO] = None,
+            budget: Optional[RenderBudget] = None
     ):
-        # user_ids = [dto.added_by for dto in remark_dtos]
-        # user_dtos, _ = self.iam_service.get_user_profiles(user_ids=user_ids)
-        # user_name_map = {dto.user_id: dto.name for dto in user_dtos}
-
-        flowables = []
-
-        remarks_header_block = RemarksHeaderBlock()
-        header = remarks_header_block.create_remarks_header_flowables(
-            logo_url="https://crm-backend-media-static.s3.ap-south-1.amazonaws.com/alpha/media/tgbpass_logo.png",
-            header_text="HYDERABAD METROPOLITAN DEVELOPMENT AUTHORITY",
-            sub_header_text="TOWN PLANNING SECTION",
-            sub_sub_header_text="NOTESHEET REPORT",
-            right_block_text="BuildNow",
+        document = self.build_remarks_ir(
+            remark_dtos=remark_dtos,
+            extra_remark_dto=extra_remark_dto,
+            budget=budget,
         )
-        flowables.extend(header)
-        for remark_dto in remark_dtos:
-            added_by = remark_dto.added_by
-            user_name = "Sankar"
-            designation = "Planning Ofcr"
+        return self.convert_remarks_ir_to_pdf(document, budget=budget)
 
-            user = f"<b>{user_name}</b> [{designation}]"
-
-            added_at = remark_dto.added_at
-            formatted_date = f"<b><i>{added_at.strftime('%d %B %Y %I:%M:%S %p')}</i></b>"
+    def measure_remarks_pdf(
+        self, remark_dtos: Iterable[PipelineItemRemarksDTO],
+            extra_remark_dto: Optional[RemarkDTO] = None
+    ) -> LayoutMeasurement:
+        """Page count and per-remark placements, without producing a PDF.
 
-            header_right_text = user
-            header_left_text = formatted_date
+        Block 0 is the notesheet header; remarks follow in order.
+        """
+        document = self.build_remarks_ir(
+            remark_dtos=remark_dtos, extra_remark_dto=extra_remark_dto
+        )
+        return self.measure_remarks_ir(document)
+
+    @staticmethod
+    def measure_remarks_ir(document: DocumentIR) -> LayoutMeasurement:
+        # Logos are sized from their headers and never fully fetched
+        with image_registry_scope(probe_only=True):
+            block_flowables = [
+                (type(node).__name__, flowables)
+                for node, flowables in IRCompiler().compile_nodes(document)
+            ]
+        return measure_block_flowables(
+            block_flowables,
+            pagesize=PDFConfig.PAGE_SIZE,
+            margin=PDFConfig.MARGIN,
+        )
 
-            remarks_block = RemarkBlock()
-            header_flowable = remarks_block.create_remark_flowables(
-                header_right_text=header_right_text,
-                header_left_text=header_left_text,
+    def build_remarks_ir(
+        self, remark_dtos: Iterable[PipelineItemRemarksDTO],
+            extra_remark_dto: Optional[RemarkDTO] = None,
+            budget: Optional[RenderBudget] = None
+    ) -> DocumentIR:
+        document = DocumentIR()
+        document.append(
+            RemarksHeaderNode(
+                logo_url="https://crm-backend-media-static.s3.ap-south-1.amazonaws.com/alpha/media/tgbpass_logo.png",
+                header_text="HYDERABAD METROPOLITAN DEVELOPMENT AUTHORITY",
+                sub_header_text="TOWN PLANNING SECTION",
+                sub_sub_header_text="NOTESHEET REPORT",
+                right_block_text="BuildNow",
             )
-            flowables.extend(header_flowable)
-
-            htmltopdf = HTMLToPDFConverter()
-            remark_stories = htmltopdf.convert_html_content_to_stories(
-                html_content=remark_dto.remarks
+        )
+        # Authors are resolved in batches, so remark_dtos may be a lazy iterator
+        for remark_dto, author in self.author_resolver.iter_with_authors(
+            remark_dtos
+        ):
+            if budget is not None:
+                budget.check()
+            document.append(
+                RemarkNode(
+                    header_right_text=self._format_author(
+                        author.name, author.designation
+                    ),
+                    header_left_text=self._format_added_at(remark_dto.added_at),
+                    body=remark_dto.remarks,
+                    is_html=True,
+                )
             )
-            flowables.extend(remark_stories)
-
-            flowables.append(Spacer(1, 12))
 
         if extra_remark_dto:
-            user_name = extra_remark_dto.added_by
-            designation = "Planning Ofcr"
-
-            user = f"<b>{user_name}</b> [{designation}]"
-
-            added_at = extra_remark_dto.added_at
-            formatted_date = f"<b><i>{added_at.strftime('%d %B %Y %I:%M:%S %p')}</i></b>"
-
-            header_right_text = user
-            header_left_text = formatted_date
-
-            remarks_block = RemarkBlock()
-            header_flowable = remarks_block.create_remark_flowables(
-                header_right_text=header_right_text,
-                header_left_text=header_left_text,
+            document.append(
+                RemarkNode(
+                    header_right_text=self._format_author(
+                        extra_remark_dto.added_by,
+                        self.author_resolver.default_designation,
+                    ),
+                    header_left_text=self._format_added_at(
+                        extra_remark_dto.added_at
+                    ),
+                    body=extra_remark_dto.remarks,
+                    is_html=False,
+                )
             )
-            flowables.extend(header_flowable)
 
-            remarks = Paragraph(extra_remark_dto.remarks,
-                                style=ParagraphStyle(name="remarks", fontName="Helvetica", fontSize=12,
-                                                     leading=15))
-            flowables.append(remarks)
+        return document
+
+    @staticmethod
+    def _format_author(user_name: str, designation: str) -> str:
+        return f"<b>{user_name}</b> [{designation}]"
 
+    @staticmethod
+    def _format_added_at(added_at: datetime.datetime) -> str:
+        return f"<b><i>{added_at.strftime('%d %B %Y %I:%M:%S %p')}</i></b>"
 
+    def convert_remarks_ir_to_pdf(
+        self, document: DocumentIR, budget: Optional[RenderBudget] = None
+    ) -> bytes:
+        # The notesheet logo of every page group is embedded once
+        with image_registry_scope():
+            flowables = IRCompiler().compile(document, budget=budget)
 
         buffer = BytesIO()
 
@@ -138,7 +177,10 @@ class ConvertRemarksToPDFInteractor:
             topMargin=PDFConfig.MARGIN,
             bottomMargin=PDFConfig.MARGIN,
         )
-        doc.build(flowables)
+        if budget is None:
+            doc.build(flowables)
+        else:
+            budget.build(doc, flowables)
         pdf_bytes = buffer.getvalue()
         buffer.close()
 
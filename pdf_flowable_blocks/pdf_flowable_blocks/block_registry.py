@@ -0,0 +1,233 @@
+"""
+Block Registry Module for PDF Generation
+
+This module maps block types to block renderer classes. Renderers are
+declared as ``"module:Class"`` specs and imported on first use, new block
+types can be contributed by other packages through entry points, and
+``warm_up()`` lets worker processes pay import, style and font set-up costs,
+and open the shared asset pack, before accepting traffic.
+
+Plugins register renderers in their packaging metadata, e.g.:
+
+    [project.entry-points."pdf_flowable_blocks.block_renderers"]
+    CHART = "my_package.renderers:ChartBlockRenderer"
+"""
+
+import importlib
+import logging
+import threading
+from importlib import metadata
+from typing import Any, Callable, Dict, List, Optional, Type, Union
+
+from reportlab.platypus import Flowable
+
+from plugins.constants.dms_enums import PDFBlockType
+from plugins.interactors.dms.pdf_flowable_blocks.break_block import (
+    BREAK_BLOCK_TYPES,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "pdf_flowable_blocks.block_renderers"
+
+RendererSpec = Union[str, Type["BlockRenderer"]]
+
+
+class BlockRenderer:
+    """Base class for block renderers.
+
+    A renderer turns one block DTO into flowables. One instance is created
+    per process and reused, so renderers build their block (and its styles)
+    once and must not keep per-document state.
+    """
+
+    def render(self, block_dto: Any) -> List[Flowable]:
+        """Render a block DTO into flowables.
+
+        Args:
+            block_dto: Block DTO of the renderer's block type
+
+        Returns:
+            List[Flowable]: Flowables for the block
+        """
+        raise NotImplementedError
+
+    def warm_up(self) -> None:
+        """Prepare expensive resources ahead of the first render."""
+
+
+def _resolve(spec: RendererSpec) -> Type[BlockRenderer]:
+    if not isinstance(spec, str):
+        return spec
+    module_name, _, attribute = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class BlockRegistry:
+    """Registry of block renderers, keyed by block type value."""
+
+    def __init__(self, entry_point_group: Optional[str] = ENTRY_POINT_GROUP):
+        """Initialize an empty registry.
+
+        Args:
+            entry_point_group: Entry point group scanned for plugin
+                renderers, or None to disable discovery
+        """
+        self.entry_point_group = entry_point_group
+        self._specs: Dict[str, RendererSpec] = {}
+        self._renderers: Dict[str, BlockRenderer] = {}
+        self._warm_up_hooks: List[Callable[[], None]] = []
+        self._entry_points_loaded = entry_point_group is None
+        self._lock = threading.RLock()
+
+    def register(
+        self, block_type: str, renderer: RendererSpec, replace: bool = True
+    ) -> None:
+        """Register a renderer class (or a lazy ``"module:Class"`` spec).
+
+        Args:
+            block_type: Block type value, e.g. ``PDFBlockType.TABLE.value``
+            renderer: Renderer class or ``"module:Class"`` string
+            replace: Whether to replace an existing registration
+        """
+        with self._lock:
+            if not replace and block_type in self._specs:
+                return
+            self._specs[block_type] = renderer
+            self._renderers.pop(block_type, None)
+
+    def register_warm_up_hook(self, hook: Callable[[], None]) -> None:
+        """Register a callable run by ``warm_up()`` (fonts, cached assets)."""
+        with self._lock:
+            self._warm_up_hooks.append(hook)
+
+    def load_entry_points(self) -> None:
+        """Register plugin renderers from entry points, without importing them.
+
+        Entry points never replace renderers registered in code.
+        """
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            self._entry_points_loaded = True
+            try:
+                entry_points = metadata.entry_points()
+                if hasattr(entry_points, "select"):
+                    entry_points = entry_points.select(
+                        group=self.entry_point_group
+                    )
+                else:
+                    entry_points = entry_points.get(self.entry_point_group, [])
+            except Exception as e:
+                logger.error(f"Error discovering block renderers: {str(e)}")
+                return
+
+            for entry_point in entry_points:
+                self.register(entry_point.name, entry_point.value, replace=False)
+
+    def get(self, block_type: str) -> Optional[BlockRenderer]:
+        """Return the renderer of a block type, creating it on first use.
+
+        Args:
+            block_type: Block type value
+
+        Returns:
+            Optional[BlockRenderer]: Renderer, or None for unknown types
+        """
+        renderer = self._renderers.get(block_type)
+        if renderer is not None:
+            return renderer
+
+        with self._lock:
+            renderer = self._renderers.get(block_type)
+            if renderer is not None:
+                return renderer
+
+            if block_type not in self._specs:
+                self.load_entry_points()
+            spec = self._specs.get(block_type)
+            if spec is None:
+                return None
+
+            renderer = self._renderers[block_type] = _resolve(spec)()
+            return renderer
+
+    def block_types(self) -> List[str]:
+        """Return every registered block type, including plugin ones."""
+        self.load_entry_points()
+        with self._lock:
+            return list(self._specs)
+
+    def warm_up(self) -> None:
+        """Import and build every renderer, then run the warm-up hooks.
+
+        Failures are logged and do not stop the remaining steps.
+        """
+        for block_type in self.block_types():
+            try:
+                self.get(block_type).warm_up()
+            except Exception as e:
+                logger.error(
+                    f"Error warming up {block_type} renderer: {str(e)}"
+                )
+
+        with self._lock:
+            hooks = list(self._warm_up_hooks)
+        for hook in hooks:
+            try:
+                hook()
+            except Exception as e:
+                logger.error(f"Error running warm-up hook: {str(e)}")
+
+
+def _warm_up_fonts() -> None:
+    from pdf_letter_generator.commons.constants import PDFTextStyles
+    from pdf_letter_generator.commons.glyph_widths import get_glyph_widths
+    from pdf_letter_generator.fonts.font_registry import font_registry
+
+    font_registry.warm_up()
+    for font_name in {
+        PDFTextStyles.DEFAULT_FONT,
+        PDFTextStyles.Body.FONT,
+        PDFTextStyles.TextBlockHeading.FONT,
+    }:
+        get_glyph_widths(font_name)
+
+
+def _warm_up_asset_pack() -> None:
+    from pdf_letter_generator.commons.asset_pack import get_asset_pack
+
+    pack = get_asset_pack()
+    if pack is not None:
+        logger.info(f"Loaded asset pack with {len(pack.names())} assets")
+
+
+_RENDERERS_MODULE = "plugins.interactors.dms.pdf_flowable_blocks.block_renderers"
+
+block_registry = BlockRegistry()
+
+for _block_type, _renderer_name in (
+    (PDFBlockType.HEADER, "HeaderBlockRenderer"),
+    (PDFBlockType.PARAGRAPH, "ParagraphBlockRenderer"),
+    (PDFBlockType.GRID, "GridBlockRenderer"),
+    (PDFBlockType.TABLE, "TableBlockRenderer"),
+    (PDFBlockType.LIST, "ListBlockRenderer"),
+    (PDFBlockType.DYNAMIC_TABLE, "DynamicTableBlockRenderer"),
+):
+    block_registry.register(
+        _block_type.value, f"{_RENDERERS_MODULE}:{_renderer_name}"
+    )
+
+for _block_type in BREAK_BLOCK_TYPES:
+    block_registry.register(
+        _block_type, f"{_RENDERERS_MODULE}:PageBreakBlockRenderer"
+    )
+
+block_registry.register_warm_up_hook(_warm_up_fonts)
+block_registry.register_warm_up_hook(_warm_up_asset_pack)
+
+
+def warm_up() -> None:
+    """Warm up the default registry; call before accepting traffic."""
+    block_registry.warm_up()
@@ -0,0 +1,208 @@
+"""
+Built-in Block Renderers for PDF Generation
+
+Each renderer converts one block DTO into flowables using its block class.
+Renderers are created once per process by the block registry, so the block
+instances (and their stylesheets) are built once and reused.
+"""
+
+from typing import Any, List
+
+from reportlab.platypus import Flowable, PageBreak
+
+from plugins.interactors.dms.pdf_blocks import dtos
+from plugins.interactors.dms.pdf_blocks.pdf_config import PDFConfig
+from plugins.interactors.dms.pdf_flowable_blocks.block_registry import (
+    BlockRenderer,
+)
+from plugins.interactors.dms.pdf_flowable_blocks.generic_table_block import (
+    CellConfig,
+    GenericTableBlockV2,
+    RowConfig,
+)
+from plugins.interactors.dms.pdf_flowable_blocks.grid_block import GridBlockV2
+from plugins.interactors.dms.pdf_flowable_blocks.header_block import (
+    HeaderBlockV2,
+)
+from plugins.interactors.dms.pdf_flowable_blocks.list_block import ListBlockV2
+from plugins.interactors.dms.pdf_flowable_blocks.paragraph_block import (
+    ParagraphBlockV2,
+)
+from plugins.interactors.dms.pdf_flowable_blocks.streaming_table import peek
+from plugins.interactors.dms.pdf_flowable_blocks.table_block import (
+    ColumnarTableData,
+    TableBlockV2,
+)
+
+
+def calculate_table_column_widths(
+    column_widths: List[float], first_row: List[Any]
+) -> List[float]:
+    total_width = PDFConfig.get_page_width() - (2 * PDFConfig.MARGIN)
+
+    num_columns = len(first_row)
+
+    if column_widths:
+        if len(column_widths) != num_columns:
+            raise ValueError(
+                "Number of percentages must match number of columns"
+            )
+        if abs(sum(column_widths) - 100) > 0.01:
+            # Allow for floating point imprecision
+            raise ValueError("Percentages must sum to 100")
+        return [total_width * (pct / 100) for pct in column_widths]
+
+    # Default to equal distribution
+    return [total_width / num_columns] * num_columns
+
+
+class HeaderBlockRenderer(BlockRenderer):
+    def __init__(self):
+        self.header_block = HeaderBlockV2()
+
+    def render(self, block_dto: dtos.PDFHeaderBlockDTO) -> List[Flowable]:
+        return self.header_block.create_header_flowables(
+            logo_url=block_dto.logo_url,
+            header_text=block_dto.header_text,
+            sub_header_text=block_dto.sub_header_text,
+            sub_sub_header_text=block_dto.sub_sub_header_text,
+            right_block_text=block_dto.right_block_text,
+        )
+
+
+class ParagraphBlockRenderer(BlockRenderer):
+    def __init__(self):
+        self.text_block = ParagraphBlockV2()
+
+    def render(self, block_dto: dtos.PDFParagraphBlockDTO) -> List[Flowable]:
+        return self.text_block.create_flowables(
+            heading=block_dto.heading,
+            lines=block_dto.text_lines,
+        )
+
+
+class GridBlockRenderer(BlockRenderer):
+    def __init__(self):
+        self.grid_block = GridBlockV2()
+
+    def render(self, block_dto: dtos.PDFGridBlockDTO) -> List[Flowable]:
+        grid_units = [
+            {
+                "text_lines": [
+                    text_line for text_line in unit_dto.text_lines if text_line
+                ],
+                "unit_width": unit_dto.unit_width,
+                "alignment": unit_dto.alignment,
+            }
+            for unit_dto in block_dto.grid_unit_dtos
+        ]
+        return self.grid_block.create_grid_flowables(
+            heading=block_dto.heading,
+            grid_units=grid_units,
+        )
+
+
+class TableBlockRenderer(BlockRenderer):
+    def __init__(self):
+        self.table_block = GenericTableBlockV2()
+        self.columnar_table_block = TableBlockV2()
+
+    def render(self, block_dto: dtos.PDFTableBlockDTO) -> List[Flowable]:
+        # Columnar data skips the per-cell CellConfig/RowConfig objects
+        if isinstance(block_dto.table_data, ColumnarTableData):
+            return self.columnar_table_block.create_columnar_table_flowables(
+                data=block_dto.table_data,
+                heading=block_dto.heading,
+                column_widths=block_dto.column_widths,
+            )
+
+        table_data = block_dto.table_data
+        is_streamed = table_data is not None and not isinstance(
+            table_data, (list, tuple)
+        )
+        if is_streamed:
+            first_row, table_data = peek(table_data)
+        else:
+            first_row = table_data[0] if table_data else None
+
+        if first_row is None:
+            return []
+
+        column_widths = calculate_table_column_widths(
+            column_widths=block_dto.column_widths,
+            first_row=first_row,
+        )
+
+        def _row_config(row_values) -> RowConfig:
+            return RowConfig(
+                cells=[
+                    CellConfig(value=_value, width=column_widths[index])
+                    for index, _value in enumerate(row_values)
+                ]
+            )
+
+        if is_streamed:
+            # Keep the source lazy; rows are built chunk by chunk
+            row_config_dtos = (
+                _row_config(row_values) for row_values in table_data
+            )
+        else:
+            row_config_dtos = [
+                _row_config(row_values) for row_values in table_data
+            ]
+
+        return self.table_block.create_generic_table_flowables(
+            heading=block_dto.heading, rows=row_config_dtos
+        )
+
+
+class ListBlockRenderer(BlockRenderer):
+    def __init__(self):
+        self.list_block = ListBlockV2()
+
+    def render(self, block_dto: dtos.PDFListBlockDTO) -> List[Flowable]:
+        # TODO: Need to support description too
+        return self.list_block.create_list_flowables(
+            heading=block_dto.heading,
+            lines=block_dto.text_lines,
+            presentation_type=block_dto.presentation_type,
+        )
+
+
+class DynamicTableBlockRenderer(BlockRenderer):
+    def __init__(self):
+        self.table_block = GenericTableBlockV2()
+        self.columnar_table_block = TableBlockV2()
+
+    def render(
+        self, block_dto: dtos.PDFDynamicTableBlockDTO
+    ) -> List[Flowable]:
+        columnar_data = getattr(block_dto, "columnar_data", None)
+        if columnar_data is not None:
+            return self.columnar_table_block.create_columnar_table_flowables(
+                data=columnar_data,
+                heading=block_dto.heading,
+                column_widths=getattr(block_dto, "column_widths", None),
+            )
+
+        row_config_dtos = (
+            RowConfig(
+                cells=[
+                    CellConfig(value=cell_dto.text, width=cell_dto.cell_width)
+                    for cell_dto in row_dto.cell_dtos
+                ]
+            )
+            for row_dto in block_dto.row_dtos
+        )
+        if isinstance(block_dto.row_dtos, (list, tuple)):
+            row_config_dtos = list(row_config_dtos)
+
+        return self.table_block.create_generic_table_flowables(
+            rows=row_config_dtos,
+            heading=block_dto.heading,
+        )
+
+
+class PageBreakBlockRenderer(BlockRenderer):
+    def render(self, block_dto: Any) -> List[Flowable]:
+        return [PageBreak()]
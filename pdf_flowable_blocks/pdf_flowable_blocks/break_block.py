@@ -0,0 +1,34 @@
+"""
+Break Block Module for PDF Generation
+
+Page and section breaks in a block DTO list. Both start a new page; a
+section break also marks where a document may be split into independently
+rendered segments (see ``segmented_render``).
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+PAGE_BREAK_BLOCK_TYPE = "PAGE_BREAK"
+SECTION_BREAK_BLOCK_TYPE = "SECTION_BREAK"
+
+BREAK_BLOCK_TYPES = (PAGE_BREAK_BLOCK_TYPE, SECTION_BREAK_BLOCK_TYPE)
+
+
+@dataclass
+class PDFPageBreakBlockDTO:
+    """Starts a new page."""
+
+    block_type: str = PAGE_BREAK_BLOCK_TYPE
+
+
+@dataclass
+class PDFSectionBreakBlockDTO:
+    """Starts a new page and a new independently renderable section."""
+
+    block_type: str = SECTION_BREAK_BLOCK_TYPE
+
+
+def is_break_block(block_dto: Any) -> bool:
+    """Return whether a block DTO is a page or section break."""
+    return getattr(block_dto, "block_type", None) in BREAK_BLOCK_TYPES
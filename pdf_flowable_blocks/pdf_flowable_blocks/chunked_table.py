@@ -0,0 +1,138 @@
+"""
+Page-Chunked Table Module for PDF Generation
+
+A single large ``Table`` re-measures every remaining row each time it is
+split at a page break, so layout cost grows quadratically with the table.
+This module provides a flowable that measures every row height once up
+front and, at each page break, picks the rows that fit the remaining frame
+height with a binary search over the cumulative heights. Each page gets
+its own ``Table`` holding only its rows, so layout cost is linear in rows.
+"""
+
+import logging
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, Callable, List, Sequence
+
+from reportlab.platypus import Flowable
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Tolerance for floating point error when comparing against a height limit
+_EPSILON = 1e-6
+
+
+def measure_row_heights(
+    rows: Sequence[Sequence[Any]],
+    inner_widths: Sequence[float],
+    vertical_padding: float,
+) -> List[float]:
+    """Measure table row heights the way ``Table`` does, once per row.
+
+    Every cell must be a flowable (e.g. a ``Paragraph``); the wrap result is
+    kept by the paragraph, so the table does not break lines again when the
+    same cell is laid out at the same width.
+
+    Args:
+        rows: Table rows of flowable cells
+        inner_widths: Column widths minus left and right cell padding
+        vertical_padding: Top plus bottom cell padding
+
+    Returns:
+        List[float]: Height of every row, padding included
+    """
+    heights = []
+    for row in rows:
+        content_height = 0
+        for cell, width in zip(row, inner_widths):
+            _, height = cell.wrap(width, 1 << 30)
+            content_height = max(content_height, height)
+        heights.append(content_height + vertical_padding)
+    return heights
+
+
+class PageChunkedTable(Flowable):
+    """Flowable that lays out pre-measured rows as one ``Table`` per page.
+
+    Like ``StreamingTable`` the flowable never draws itself: each split hands
+    the document a table of the rows fitting the available height, followed
+    by the flowable itself holding the remaining rows.
+    """
+
+    def __init__(
+        self,
+        row_heights: Sequence[float],
+        header_height: float,
+        width: float,
+        build_chunk: Callable[[int, int], Flowable],
+        repeat_header: bool = True,
+    ):
+        """Initialize the chunked table.
+
+        Args:
+            row_heights: Measured height of every body row
+            header_height: Height of the header rows
+            width: Table width
+            build_chunk: Builds the table of body rows ``[start, end)``
+            repeat_header: Whether every chunk starts with the header rows,
+                rather than only the first one
+        """
+        super().__init__()
+        self._offsets = [0.0, *accumulate(row_heights)]
+        self._header_height = header_height
+        self._table_width = width
+        self._build_chunk = build_chunk
+        self._repeat_header = repeat_header
+        self._start = 0
+
+    @property
+    def _row_count(self) -> int:
+        return len(self._offsets) - 1
+
+    def _rows_fitting(self, height: float) -> int:
+        """Return the end index of the rows from ``_start`` fitting a height."""
+        if self._start == 0 or self._repeat_header:
+            height -= self._header_height
+        limit = self._offsets[self._start] + height
+        return bisect_right(self._offsets, limit + _EPSILON) - 1
+
+    def wrap(self, availWidth, availHeight):
+        if self._start >= self._row_count:
+            return 0, 0
+        # Report more than the available height so the frame splits us
+        return self._table_width, availHeight + 1
+
+    def split(self, availWidth, availHeight):
+        if self._start >= self._row_count:
+            return []
+
+        end = min(self._rows_fitting(availHeight), self._row_count)
+        if end <= self._start:
+            if not getattr(self, "_postponed", False):
+                # The next row does not fit; retry in the next frame
+                return []
+            # Still no fit in a fresh frame: the row is taller than the
+            # frame, so let the table split inside it
+            end = self._start + 1
+
+        chunk = self._build_chunk(self._start, end)
+        _, height = chunk.wrap(availWidth, availHeight)
+        if height <= availHeight + _EPSILON:
+            parts = [chunk]
+        else:
+            parts = chunk.split(availWidth, availHeight)
+            if not parts:
+                # Nothing fits here; retry in the next frame
+                return []
+
+        self._start = end
+        # The document marks postponed flowables and raises if one is
+        # postponed twice; this flowable is reused, so reset the mark
+        self.__dict__.pop("_postponed", None)
+        if self._start >= self._row_count:
+            return parts
+        return parts + [self]
+
+    def draw(self):
+        pass
@@ -0,0 +1,706 @@
+"""
+Document Intermediate Representation (IR) for PDF Generation
+
+This module provides a compact, pickle-free representation of a document
+that sits between the block DTOs and ReportLab flowables. IR nodes are small
+``__slots__`` objects holding only primitives, so a document can be hashed,
+compared, cached and sent to worker processes. A single compiler
+(``IRCompiler``) turns the IR into flowables.
+
+Binary format:
+    MAGIC followed by one tagged value (the node list). Strings are interned:
+    a repeated string is written as a back-reference to its first occurrence.
+"""
+
+import hashlib
+import logging
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph, Spacer
+from reportlab.platypus.flowables import Flowable
+
+from pdf_letter_generator.commons.render_budget import RenderBudget
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PIR1"
+
+_TAG_NONE = 0
+_TAG_FALSE = 1
+_TAG_TRUE = 2
+_TAG_INT = 3
+_TAG_FLOAT = 4
+_TAG_STR = 5
+_TAG_STR_REF = 6
+_TAG_SEQ = 7
+_TAG_NODE = 8
+
+_DOUBLE = struct.Struct("<d")
+
+
+def color_to_hex(color: Any) -> Optional[str]:
+    """Convert a ReportLab color (or color spec) to a hex string."""
+    if color is None:
+        return None
+    return colors.toColor(color).hexval()
+
+
+def hex_to_color(value: Optional[str]) -> Optional[colors.Color]:
+    """Convert a hex string produced by ``color_to_hex`` back to a color."""
+    if value is None:
+        return None
+    return colors.toColor(value)
+
+
+class IRNode:
+    """Base class for IR nodes. Subclasses declare ``KIND`` and ``__slots__``."""
+
+    __slots__ = ()
+    KIND = 0
+    DEFAULTS: Dict[str, Any] = {}
+
+    def __init__(self, *args, **kwargs):
+        values = dict(self.DEFAULTS)
+        values.update(zip(self.__slots__, args))
+        values.update(kwargs)
+        for name in self.__slots__:
+            value = values.get(name)
+            # Lists become tuples so that nodes stay hashable and compare
+            # equal after a round-trip through the binary format
+            setattr(
+                self, name, tuple(value) if isinstance(value, list) else value
+            )
+
+    def fields(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.fields() == other.fields()
+
+    def __hash__(self):
+        return hash((self.KIND, self.fields()))
+
+    def __repr__(self):
+        args = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in self.__slots__
+        )
+        return f"{type(self).__name__}({args})"
+
+
+class HeaderNode(IRNode):
+    __slots__ = (
+        "logo_url",
+        "header_text",
+        "sub_header_text",
+        "sub_sub_header_text",
+        "right_block_text",
+    )
+    KIND = 1
+
+
+class RemarksHeaderNode(IRNode):
+    __slots__ = HeaderNode.__slots__
+    KIND = 2
+
+
+class ParagraphNode(IRNode):
+    __slots__ = ("heading", "lines")
+    KIND = 3
+
+
+class GridUnitNode(IRNode):
+    __slots__ = ("text_lines", "unit_width", "alignment")
+    KIND = 4
+
+
+class GridNode(IRNode):
+    __slots__ = ("heading", "units")
+    KIND = 5
+
+
+class TableCellNode(IRNode):
+    """Mirror of ``CellConfig``; colors are stored as hex strings."""
+
+    __slots__ = (
+        "value",
+        "width",
+        "align",
+        "bold",
+        "font_size",
+        "background_color",
+        "text_color",
+        "colspan",
+        "rowspan",
+        "pad_right",
+        "height",
+    )
+    KIND = 6
+    DEFAULTS = {
+        "align": "MIDDLE",
+        "bold": False,
+        "font_size": 12,
+        "colspan": 1,
+        "rowspan": 1,
+        "pad_right": False,
+    }
+
+
+class TableRowNode(IRNode):
+    """Mirror of ``RowConfig``; ``style`` is a tuple of (key, hex) pairs."""
+
+    __slots__ = ("cells", "height", "style", "pad_to_max")
+    KIND = 7
+    DEFAULTS = {"pad_to_max": True}
+
+
+class TableNode(IRNode):
+    __slots__ = ("heading", "rows", "borders")
+    KIND = 8
+    DEFAULTS = {"borders": True}
+
+
+class ListNode(IRNode):
+    """List block; ``items`` is a tuple of (text, sub_items) pairs."""
+
+    __slots__ = ("heading", "items", "presentation_type")
+    KIND = 9
+
+
+class RemarkNode(IRNode):
+    __slots__ = ("header_right_text", "header_left_text", "body", "is_html")
+    KIND = 10
+    DEFAULTS = {"is_html": True}
+
+
+class ColumnarTableNode(IRNode):
+    """Column-oriented table; ``columns`` is a tuple of value tuples.
+
+    Colors in ``column_text_colors`` and ``row_backgrounds`` are hex strings.
+    """
+
+    __slots__ = (
+        "heading",
+        "header",
+        "columns",
+        "column_widths",
+        "column_alignments",
+        "column_text_colors",
+        "row_backgrounds",
+    )
+    KIND = 11
+
+
+_NODE_TYPES: Dict[int, type] = {
+    node_type.KIND: node_type
+    for node_type in (
+        HeaderNode,
+        RemarksHeaderNode,
+        ParagraphNode,
+        GridUnitNode,
+        GridNode,
+        TableCellNode,
+        TableRowNode,
+        TableNode,
+        ListNode,
+        RemarkNode,
+        ColumnarTableNode,
+    )
+}
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+class _Encoder:
+    def __init__(self):
+        self.out = bytearray(MAGIC)
+        self.strings: Dict[str, int] = {}
+
+    def write(self, value: Any) -> None:
+        out = self.out
+        if value is None:
+            out.append(_TAG_NONE)
+        elif value is True:
+            out.append(_TAG_TRUE)
+        elif value is False:
+            out.append(_TAG_FALSE)
+        elif isinstance(value, int):
+            out.append(_TAG_INT)
+            # Zigzag so that small negative numbers stay small
+            _write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+        elif isinstance(value, float):
+            out.append(_TAG_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            index = self.strings.get(value)
+            if index is not None:
+                out.append(_TAG_STR_REF)
+                _write_varint(out, index)
+                return
+            self.strings[value] = len(self.strings)
+            encoded = value.encode("utf-8")
+            out.append(_TAG_STR)
+            _write_varint(out, len(encoded))
+            out += encoded
+        elif isinstance(value, IRNode):
+            out.append(_TAG_NODE)
+            _write_varint(out, value.KIND)
+            for field in value.fields():
+                self.write(field)
+        elif isinstance(value, (tuple, list)):
+            out.append(_TAG_SEQ)
+            _write_varint(out, len(value))
+            for item in value:
+                self.write(item)
+        else:
+            raise TypeError(
+                f"Unsupported IR value of type {type(value).__name__}"
+            )
+
+
+class _Decoder:
+    def __init__(self, data: bytes):
+        if data[: len(MAGIC)] != MAGIC:
+            raise ValueError("Not a document IR payload")
+        self.data = data
+        self.pos = len(MAGIC)
+        self.strings: List[str] = []
+
+    def read(self) -> Any:
+        data = self.data
+        tag = data[self.pos]
+        self.pos += 1
+        if tag == _TAG_NONE:
+            return None
+        if tag == _TAG_TRUE:
+            return True
+        if tag == _TAG_FALSE:
+            return False
+        if tag == _TAG_INT:
+            raw, self.pos = _read_varint(data, self.pos)
+            return (raw >> 1) ^ -(raw & 1)
+        if tag == _TAG_FLOAT:
+            (value,) = _DOUBLE.unpack_from(data, self.pos)
+            self.pos += _DOUBLE.size
+            return value
+        if tag == _TAG_STR:
+            length, self.pos = _read_varint(data, self.pos)
+            value = bytes(data[self.pos : self.pos + length]).decode("utf-8")
+            self.pos += length
+            self.strings.append(value)
+            return value
+        if tag == _TAG_STR_REF:
+            index, self.pos = _read_varint(data, self.pos)
+            return self.strings[index]
+        if tag == _TAG_SEQ:
+            count, self.pos = _read_varint(data, self.pos)
+            return tuple(self.read() for _ in range(count))
+        if tag == _TAG_NODE:
+            kind, self.pos = _read_varint(data, self.pos)
+            node_type = _NODE_TYPES[kind]
+            return node_type(*(self.read() for _ in node_type.__slots__))
+        raise ValueError(f"Unknown IR tag {tag} at offset {self.pos - 1}")
+
+
+class DocumentIR:
+    """Ordered list of IR nodes describing a whole document."""
+
+    __slots__ = ("nodes",)
+
+    def __init__(self, nodes: Optional[Sequence[IRNode]] = None):
+        self.nodes: List[IRNode] = list(nodes or [])
+
+    def append(self, node: IRNode) -> None:
+        self.nodes.append(node)
+
+    def extend(self, nodes: Sequence[IRNode]) -> None:
+        self.nodes.extend(nodes)
+
+    def to_bytes(self) -> bytes:
+        encoder = _Encoder()
+        encoder.write(self.nodes)
+        return bytes(encoder.out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DocumentIR":
+        return cls(_Decoder(memoryview(data)).read())
+
+    def digest(self) -> str:
+        """Stable content hash, usable as a cache key."""
+        return hashlib.blake2b(self.to_bytes(), digest_size=16).hexdigest()
+
+    def __eq__(self, other):
+        return isinstance(other, DocumentIR) and self.nodes == other.nodes
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __repr__(self):
+        return f"DocumentIR({len(self.nodes)} nodes)"
+
+
+def list_items_from_lines(lines: Optional[Dict[str, Any]]) -> Tuple:
+    """Convert ``ListBlockV2`` nested ``lines`` dicts into IR list items."""
+    if not lines:
+        return ()
+    return tuple(
+        (
+            text,
+            (
+                sublines.get("presentation_type", "unordered_list"),
+                list_items_from_lines(sublines),
+            )
+            if isinstance(sublines, dict)
+            else None,
+        )
+        for text, sublines in lines.items()
+        if text != "presentation_type"
+    )
+
+
+def lines_from_list_items(
+    items: Tuple, presentation_type: Optional[str]
+) -> Dict[str, Any]:
+    """Inverse of ``list_items_from_lines``."""
+    lines: Dict[str, Any] = {}
+    for text, sub in items:
+        lines[text] = lines_from_list_items(sub[1], sub[0]) if sub else None
+    if presentation_type is not None:
+        lines["presentation_type"] = presentation_type
+    return lines
+
+
+def cell_value(value: Any) -> Any:
+    """Keep primitive cell values as-is and stringify anything else."""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)
+
+
+def table_row_from_config(row: Any) -> TableRowNode:
+    """Convert a ``RowConfig`` into a ``TableRowNode``."""
+    style = None
+    if row.style:
+        style = tuple(
+            (key, color_to_hex(value))
+            for key, value in sorted(row.style.items())
+        )
+    return TableRowNode(
+        cells=tuple(
+            TableCellNode(
+                value=cell_value(cell.value),
+                width=float(cell.width),
+                align=cell.align,
+                bold=cell.bold,
+                font_size=cell.font_size,
+                background_color=color_to_hex(cell.background_color),
+                text_color=color_to_hex(cell.text_color),
+                colspan=cell.colspan,
+                rowspan=cell.rowspan,
+                pad_right=cell.pad_right,
+                height=cell.height,
+            )
+            for cell in row.cells
+        ),
+        height=row.height,
+        style=style,
+        pad_to_max=row.pad_to_max,
+    )
+
+
+def columnar_table_node(
+    data: Any, heading: Optional[str], column_widths: Optional[Sequence[float]]
+) -> ColumnarTableNode:
+    """Convert a ``ColumnarTableData`` into a ``ColumnarTableNode``."""
+
+    def _hex_colors(values):
+        if values is None:
+            return None
+        return tuple(color_to_hex(value) for value in values)
+
+    return ColumnarTableNode(
+        heading=heading,
+        header=tuple(data.header) if data.header else None,
+        columns=tuple(
+            tuple(
+                cell_value(value)
+                for value in (
+                    column.tolist() if hasattr(column, "tolist") else column
+                )
+            )
+            for column in data.columns
+        ),
+        column_widths=tuple(column_widths) if column_widths else None,
+        column_alignments=(
+            tuple(data.column_alignments) if data.column_alignments else None
+        ),
+        column_text_colors=_hex_colors(data.column_text_colors),
+        row_backgrounds=_hex_colors(data.row_backgrounds),
+    )
+
+
+class IRCompiler:
+    """Compiles a ``DocumentIR`` into ReportLab flowables."""
+
+    _HANDLERS = {
+        HeaderNode: "_compile_header",
+        RemarksHeaderNode: "_compile_remarks_header",
+        ParagraphNode: "_compile_paragraph",
+        GridNode: "_compile_grid",
+        TableNode: "_compile_table",
+        ColumnarTableNode: "_compile_columnar_table",
+        ListNode: "_compile_list",
+        RemarkNode: "_compile_remark",
+    }
+
+    REMARK_SPACING = 12
+
+    def compile(
+        self, document: DocumentIR, budget: Optional[RenderBudget] = None
+    ) -> List[Flowable]:
+        """Compile every node of the document, in order."""
+        flowables: List[Flowable] = []
+        for _, node_flowables in self.compile_nodes(document, budget=budget):
+            flowables += node_flowables
+        return flowables
+
+    def compile_nodes(
+        self, document: DocumentIR, budget: Optional[RenderBudget] = None
+    ) -> Iterator[Tuple[Any, List[Flowable]]]:
+        """Yield ``(node, flowables)`` for every compilable node, in order.
+
+        An optional ``budget`` is checked around every node and passed to
+        its compiler, so nested conversions can check it as they go.
+        """
+        for node in document:
+            handler = self._HANDLERS.get(type(node))
+            if not handler:
+                logger.warning(f"No IR compiler for {type(node).__name__}")
+                continue
+            if budget is not None:
+                budget.check()
+                counted = budget.flowables_built
+            node_flowables = getattr(self, handler)(node, budget)
+            if budget is not None:
+                # Flowables the compiler already counted are not re-added
+                counted = budget.flowables_built - counted
+                budget.add_flowables(max(len(node_flowables) - counted, 0))
+            yield node, node_flowables
+
+    @staticmethod
+    def _compile_header(
+        node: HeaderNode, budget: Optional[RenderBudget] = None
+    ) -> List[Flowable]:
+        from pdf_flowable_blocks.pdf_flowable_blocks.header_block import (
+            HeaderBlockV2,
+        )
+
+        return HeaderBlockV2().create_header_flowables(
+            logo_url=node.logo_url,
+            header_text=node.header_text,
+            sub_header_text=node.sub_header_text,
+            sub_sub_header_text=node.sub_sub_header_text,
+            right_block_text=node.right_block_text,
+        )
+
+    @staticmethod
+    def _compile_remarks_header(
+        node: RemarksHeaderNode, budget: Optional[RenderBudget] = None
+    ) -> List[Flowable]:
+        from pdf_flowable_blocks.pdf_flowable_blocks.remarks_header_block import (
+            RemarksHeaderBlock,
+        )
+
+        return RemarksHeaderBlock().create_remarks_header_flowables(
+            logo_url=node.logo_url,
+            header_text=node.header_text,
+            sub_header_text=node.sub_header_text,
+            sub_sub_header_text=node.sub_sub_header_text,
+            right_block_text=node.right_block_text,
+        )
+
+    @staticmethod
+    def _compile_paragraph(
+        node: ParagraphNode, budget: Optional[RenderBudget] = None
+    ) -> List[Flowable]:
+        from pdf_flowable_blocks.pdf_flowable_blocks.paragraph_block import (
+            ParagraphBlockV2,
+        )
+
+        lines = list(node.lines) if isinstance(node.lines, tuple) else node.lines
+        return ParagraphBlockV2().create_flowables(
+            heading=node.heading, lines=lines
+        )
+
+    @staticmethod
+    def _compile_grid(
+        node: GridNode, budget: Optional[RenderBudget] = None
+    ) -> List[Flowable]:
+        from pdf_flowable_blocks.pdf_flowable_blocks.grid_block import (
+            GridBlockV2,
+        )
+
+        grid_units = [
+            {
+                "text_lines": list(unit.text_lines),
+                "unit_width": unit.unit_width,
+                "alignment": unit.alignment,
+            }
+            for unit in node.units
+        ]
+        return GridBlockV2().create_grid_flowables(
+            heading=node.heading, grid_units=grid_units
+        )
+
+    @staticmethod
+    def _compile_table(
+        node: TableNode, budget: Optional[RenderBudget] = None
+    ) -> List[Flowable]:
+        from pdf_flowable_blocks.pdf_flowable_blocks.generic_table_block import (
+            CellConfig,
+            GenericTableBlockV2,
+            RowConfig,
+        )
+
+        rows = [
+            RowConfig(
+                cells=[
+                    CellConfig(
+                        value=cell.value,
+                        width=cell.width,
+                        align=cell.align,
+                        bold=cell.bold,
+                        font_size=cell.font_size,
+                        background_color=hex_to_color(cell.background_color),
+                        text_color=hex_to_color(cell.text_color),
+                        colspan=cell.colspan,
+                        rowspan=cell.rowspan,
+                        pad_right=cell.pad_right,
+                        height=cell.height,
+                    )
+                    for cell in row.cells
+                ],
+                height=row.height,
+                style=(
+                    {key: hex_to_color(value) for key, value in row.style}
+                    if row.style
+                    else None
+                ),
+                pad_to_max=row.pad_to_max,
+            )
+            for row in node.rows
+        ]
+        return GenericTableBlockV2().create_generic_table_flowables(
+            rows=rows,
+            borders=node.borders,
+            heading=node.heading,
+        )
+
+    @staticmethod
+    def _compile_columnar_table(
+        node: ColumnarTableNode, budget: Optional[RenderBudget] = None
+    ) -> List[Flowable]:
+        from pdf_flowable_blocks.pdf_flowable_blocks.table_block import (
+            ColumnarTableData,
+            TableBlockV2,
+        )
+
+        def _colors(values):
+            if values is None:
+                return None
+            return [hex_to_color(value) for value in values]
+
+        data = ColumnarTableData(
+            columns=[list(column) for column in node.columns],
+            header=list(node.header) if node.header else None,
+            column_alignments=(
+                list(node.column_alignments)
+                if node.column_alignments
+                else None
+            ),
+            column_text_colors=_colors(node.column_text_colors),
+            row_backgrounds=_colors(node.row_backgrounds),
+        )
+        return TableBlockV2().create_columnar_table_flowables(
+            data=data,
+            heading=node.heading,
+            column_widths=(
+                list(node.column_widths) if node.column_widths else None
+            ),
+        )
+
+    @staticmethod
+    def _compile_list(
+        node: ListNode, budget: Optional[RenderBudget] = None
+    ) -> List[Flowable]:
+        from pdf_flowable_blocks.pdf_flowable_blocks.list_block import (
+            ListBlockV2,
+        )
+
+        return ListBlockV2().create_list_flowables(
+            heading=node.heading,
+            lines=lines_from_list_items(node.items, node.presentation_type),
+        )
+
+    def _compile_remark(
+        self, node: RemarkNode, budget: Optional[RenderBudget] = None
+    ) -> List[Flowable]:
+        from pdf_flowable_blocks.pdf_flowable_blocks.remark_block import (
+            RemarkBlock,
+        )
+
+        flowables = RemarkBlock().create_remark_flowables(
+            header_right_text=node.header_right_text,
+            header_left_text=node.header_left_text,
+        )
+
+        if node.is_html:
+            from convert_html_to_pdf import HTMLToPDFConverter
+
+            converter = HTMLToPDFConverter(budget=budget)
+            flowables.extend(
+                converter.convert_html_content_to_stories(
+                    html_content=node.body
+                )
+            )
+            flowables.append(Spacer(1, self.REMARK_SPACING))
+        else:
+            flowables.append(
+                Paragraph(
+                    node.body,
+                    style=ParagraphStyle(
+                        name="remarks",
+                        fontName="Helvetica",
+                        fontSize=12,
+                        leading=15,
+                    ),
+                )
+            )
+
+        return flowables
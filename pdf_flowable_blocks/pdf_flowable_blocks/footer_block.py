@@ -0,0 +1,207 @@
+"""
+Footer Block Module for PDF Generation
+
+This module draws running footers and headers (page numbers, document IDs,
+verification hashes) on every page of a Platypus document in one build.
+
+Texts are templates with ``{page}``, ``{total_pages}``, ``{document_id}``
+and ``{verification_hash}`` fields. The total page count is only known
+after the last page, so a text using ``{total_pages}`` is drawn as a
+reference to a Form XObject that is filled in when the canvas is saved,
+instead of building the document twice (``multiBuild``).
+
+Usage:
+    footer_dto = PDFFooterBlockDTO(
+        left_text="Ref: {document_id}",
+        right_text="Page {page} of {total_pages}",
+        document_id="HMDA/TP/2024/0012",
+    )
+    doc.build(flowables, canvasmaker=FooterBlock([footer_dto]).canvasmaker)
+"""
+
+import logging
+from dataclasses import dataclass
+from functools import partial
+from string import Formatter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from reportlab.pdfgen.canvas import Canvas
+
+from plugins.interactors.dms.pdf_blocks.pdf_config import PDFConfig
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+FOOTER_BLOCK_TYPE = "FOOTER"
+RUNNING_HEADER_BLOCK_TYPE = "RUNNING_HEADER"
+
+RUNNING_TEXT_BLOCK_TYPES = (FOOTER_BLOCK_TYPE, RUNNING_HEADER_BLOCK_TYPE)
+
+TOTAL_PAGES_FIELD = "total_pages"
+
+
+@dataclass
+class PDFFooterBlockDTO:
+    """Running text drawn in the bottom margin of every page."""
+
+    left_text: Optional[str] = None
+    center_text: Optional[str] = None
+    right_text: Optional[str] = "Page {page} of {total_pages}"
+    document_id: Optional[str] = None
+    verification_hash: Optional[str] = None
+    block_type: str = FOOTER_BLOCK_TYPE
+
+
+@dataclass
+class PDFRunningHeaderBlockDTO(PDFFooterBlockDTO):
+    """Running text drawn in the top margin of every page."""
+
+    right_text: Optional[str] = None
+    block_type: str = RUNNING_HEADER_BLOCK_TYPE
+
+
+def is_running_text_block(block_dto: Any) -> bool:
+    """Return whether a block DTO is a footer or running header block."""
+    return getattr(block_dto, "block_type", None) in RUNNING_TEXT_BLOCK_TYPES
+
+
+class _TemplateFields(dict):
+    def __missing__(self, key):
+        return ""
+
+
+def _uses_total_pages(template: str) -> bool:
+    return any(
+        field_name == TOTAL_PAGES_FIELD
+        for _, field_name, _, _ in Formatter().parse(template)
+    )
+
+
+class FooterBlock:
+    """Draws footer and running header blocks on every page."""
+
+    def __init__(
+        self,
+        block_dtos: Sequence[PDFFooterBlockDTO],
+        page_size: Tuple[float, float] = PDFConfig.PAGE_SIZE,
+        margin: float = PDFConfig.MARGIN,
+    ):
+        """Initialize the footer block for one document build.
+
+        Args:
+            block_dtos: Footer and running header block DTOs
+            page_size: Page size in points
+            margin: Page margin in points; texts are centered vertically
+                in the top and bottom margins
+        """
+        self.block_dtos = list(block_dtos)
+        self.page_width, self.page_height = page_size
+        self.margin = margin
+        self.font = PDFConfig.get_font_config("footer")
+        self._page_count = 0
+        # (form name, template, fields, alignment, y) drawn after the last page
+        self._deferred: List[Tuple[str, str, Dict[str, Any], str, float]] = []
+
+    @property
+    def canvasmaker(self):
+        """Canvas factory for ``doc.build(..., canvasmaker=...)``."""
+        return partial(FooterCanvas, footer_block=self)
+
+    def _baseline(self, block_dto: PDFFooterBlockDTO) -> float:
+        size = self.font["size"]
+        if block_dto.block_type == RUNNING_HEADER_BLOCK_TYPE:
+            return self.page_height - (self.margin + size) / 2
+        return (self.margin - size) / 2
+
+    def _draw_text(
+        self, canvas: Canvas, text: str, alignment: str, y: float
+    ) -> None:
+        canvas.saveState()
+        canvas.setFont(self.font["name"], self.font["size"])
+        canvas.setFillColor(self.font["color"])
+        if alignment == "left":
+            canvas.drawString(self.margin, y, text)
+        elif alignment == "center":
+            canvas.drawCentredString(self.page_width / 2, y, text)
+        else:
+            canvas.drawRightString(self.page_width - self.margin, y, text)
+        canvas.restoreState()
+
+    def draw_page(self, canvas: Canvas) -> None:
+        """Draw the running texts of the current page.
+
+        Args:
+            canvas: Canvas positioned on the page being finished
+        """
+        try:
+            page = canvas.getPageNumber()
+            self._page_count = max(self._page_count, page)
+
+            for index, block_dto in enumerate(self.block_dtos):
+                y = self._baseline(block_dto)
+                fields = _TemplateFields(
+                    page=page,
+                    document_id=block_dto.document_id or "",
+                    verification_hash=block_dto.verification_hash or "",
+                )
+                for alignment, template in (
+                    ("left", block_dto.left_text),
+                    ("center", block_dto.center_text),
+                    ("right", block_dto.right_text),
+                ):
+                    if not template:
+                        continue
+
+                    if not _uses_total_pages(template):
+                        self._draw_text(
+                            canvas, template.format_map(fields), alignment, y
+                        )
+                        continue
+
+                    # Referenced now, defined in finish() once the total is known
+                    form_name = f"running_text_{index}_{alignment}_{page}"
+                    canvas.doForm(form_name)
+                    self._deferred.append(
+                        (form_name, template, fields, alignment, y)
+                    )
+
+        except Exception as e:
+            logger.error(f"Error drawing running texts: {str(e)}")
+            raise
+
+    def finish(self, canvas: Canvas) -> None:
+        """Define the deferred forms, now that the page count is known.
+
+        Args:
+            canvas: Canvas of the document, before it is saved
+        """
+        try:
+            for form_name, template, fields, alignment, y in self._deferred:
+                fields[TOTAL_PAGES_FIELD] = self._page_count
+                canvas.beginForm(form_name)
+                self._draw_text(canvas, template.format_map(fields), alignment, y)
+                canvas.endForm()
+            self._deferred = []
+
+        except Exception as e:
+            logger.error(f"Error finishing running texts: {str(e)}")
+            raise
+
+
+class FooterCanvas(Canvas):
+    """Canvas that draws a ``FooterBlock`` on every page it finishes."""
+
+    def __init__(self, *args, footer_block: FooterBlock, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._footer_block = footer_block
+
+    def showPage(self):
+        self._footer_block.draw_page(self)
+        super().showPage()
+
+    def save(self):
+        if len(self._code):
+            # Finish a pending page first, as Canvas.save would
+            self.showPage()
+        self._footer_block.finish(self)
+        super().save()
@@ -1,12 +1,35 @@
+from concurrent.futures import Executor
+from functools import partial
 from io import BytesIO
-from typing import Any, List
+from typing import List, Optional
 
 from reportlab.pdfgen import canvas
 from reportlab.platypus import Flowable, SimpleDocTemplate
 
+from pdf_letter_generator.commons.image_registry import (
+    image_registry_scope,
+)
+from pdf_letter_generator.commons.render_budget import RenderBudget
 from plugins.constants.dms_enums import PDFBlockType
 from plugins.interactors.dms.pdf_blocks import dtos
 from plugins.interactors.dms.pdf_blocks.pdf_config import PDFConfig
+from plugins.interactors.dms.pdf_flowable_blocks import document_ir
+from plugins.interactors.dms.pdf_flowable_blocks.block_registry import (
+    block_registry,
+)
+from plugins.interactors.dms.pdf_flowable_blocks.footer_block import (
+    FooterBlock,
+    PDFFooterBlockDTO,
+    is_running_text_block,
+)
+from plugins.interactors.dms.pdf_flowable_blocks.outline import (
+    DocumentOutline,
+    OutlineEntry,
+)
+from plugins.interactors.dms.pdf_flowable_blocks.layout_measure import (
+    LayoutMeasurement,
+    measure_block_flowables,
+)
 
 
 class GeneratePDFWithFlowablesInteractor:
@@ -14,6 +37,127 @@ class GeneratePDFWithFlowablesInteractor:
         self,
         pdf_block_dtos: List[dtos.PDF_BLOCK_UNION_TYPE],
         pdf_watermark_image_url: str,
+        with_outline: bool = False,
+        with_table_of_contents: bool = False,
+        budget: Optional[RenderBudget] = None,
+    ) -> bytes:
+        # Footer and running header blocks are drawn on every page, not
+        # laid out as flowables
+        footer_block_dtos = [
+            block_dto
+            for block_dto in pdf_block_dtos
+            if is_running_text_block(block_dto)
+        ]
+        # Bookmarks come from header and block headings
+        outline = (
+            DocumentOutline()
+            if with_outline or with_table_of_contents
+            else None
+        )
+        # Images repeated across blocks are decoded and embedded once
+        with image_registry_scope():
+            flowables = self._get_flowables(
+                block_dtos=[
+                    block_dto
+                    for block_dto in pdf_block_dtos
+                    if not is_running_text_block(block_dto)
+                ],
+                outline=outline,
+                budget=budget,
+            )
+        if with_table_of_contents:
+            flowables = outline.insert_table_of_contents(flowables)
+        return self._build_pdf(
+            flowables=flowables,
+            pdf_watermark_image_url=pdf_watermark_image_url,
+            footer_block_dtos=footer_block_dtos,
+            budget=budget,
+        )
+
+    def generate_pdf_segmented(
+        self,
+        pdf_block_dtos: List[dtos.PDF_BLOCK_UNION_TYPE],
+        pdf_watermark_image_url: str,
+        with_outline: bool = False,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+    ) -> bytes:
+        """Render the sections between page/section breaks in parallel."""
+        from plugins.interactors.dms.pdf_flowable_blocks.segmented_render import (
+            render_segmented,
+        )
+
+        return render_segmented(
+            block_dtos=pdf_block_dtos,
+            pdf_watermark_image_url=pdf_watermark_image_url,
+            with_outline=with_outline,
+            executor=executor,
+            max_workers=max_workers,
+        )
+
+    def generate_pdf_from_ir(
+        self,
+        document: document_ir.DocumentIR,
+        pdf_watermark_image_url: str,
+        footer_block_dtos: Optional[List[PDFFooterBlockDTO]] = None,
+        budget: Optional[RenderBudget] = None,
+    ) -> bytes:
+        with image_registry_scope():
+            flowables = document_ir.IRCompiler().compile(
+                document, budget=budget
+            )
+        return self._build_pdf(
+            flowables=flowables,
+            pdf_watermark_image_url=pdf_watermark_image_url,
+            footer_block_dtos=footer_block_dtos,
+            budget=budget,
+        )
+
+    def measure_pdf(
+        self, pdf_block_dtos: List[dtos.PDF_BLOCK_UNION_TYPE]
+    ) -> LayoutMeasurement:
+        """Page count and per-block placements, without producing a PDF.
+
+        Images are sized from their headers and never fully fetched.
+        """
+        block_flowables = []
+        with image_registry_scope(probe_only=True):
+            for block_dto in pdf_block_dtos:
+                renderer = block_registry.get(block_dto.block_type)
+                if not renderer:
+                    continue
+
+                block_flowables.append(
+                    (block_dto.block_type, renderer.render(block_dto))
+                )
+
+        return measure_block_flowables(
+            block_flowables,
+            pagesize=PDFConfig.PAGE_SIZE,
+            margin=PDFConfig.MARGIN,
+        )
+
+    def measure_pdf_from_ir(
+        self, document: document_ir.DocumentIR
+    ) -> LayoutMeasurement:
+        with image_registry_scope(probe_only=True):
+            block_flowables = [
+                (type(node).__name__, node_flowables)
+                for node, node_flowables
+                in document_ir.IRCompiler().compile_nodes(document)
+            ]
+        return measure_block_flowables(
+            block_flowables,
+            pagesize=PDFConfig.PAGE_SIZE,
+            margin=PDFConfig.MARGIN,
+        )
+
+    @staticmethod
+    def _build_pdf(
+        flowables: List[Flowable],
+        pdf_watermark_image_url: str,
+        footer_block_dtos: Optional[List[PDFFooterBlockDTO]] = None,
+        budget: Optional[RenderBudget] = None,
     ) -> bytes:
         buffer = BytesIO()
 
@@ -36,9 +180,21 @@ class GeneratePDFWithFlowablesInteractor:
             bottomMargin=PDFConfig.MARGIN,
         )
 
-        flowables = self._get_flowables(block_dtos=pdf_block_dtos)
-        doc.build(
-            flowables, onFirstPage=add_watermark, onLaterPages=add_watermark
+        canvasmaker = canvas.Canvas
+        if footer_block_dtos:
+            canvasmaker = FooterBlock(
+                footer_block_dtos,
+                page_size=PDFConfig.PAGE_SIZE,
+                margin=PDFConfig.MARGIN,
+            ).canvasmaker
+
+        # The budget is checked on every page and after every flowable
+        build = doc.build if budget is None else partial(budget.build, doc)
+        build(
+            flowables,
+            onFirstPage=add_watermark,
+            onLaterPages=add_watermark,
+            canvasmaker=canvasmaker,
         )
 
         pdf_bytes = buffer.getvalue()
@@ -60,39 +216,35 @@ class GeneratePDFWithFlowablesInteractor:
 
         return canvas_obj
 
-    def _get_flowables(
+    def build_document_ir(
         self,
         block_dtos: List[dtos.PDF_BLOCK_UNION_TYPE],
-    ) -> List[Flowable]:
-        method_map = {
-            PDFBlockType.HEADER.value: self._get_header_flowables,
-            PDFBlockType.PARAGRAPH.value: self._get_paragraph_flowables,
-            PDFBlockType.GRID.value: self._get_grid_block_flowables,
-            PDFBlockType.TABLE.value: self._get_table_block_flowables,
-            PDFBlockType.LIST.value: self._get_list_block_flowables,
-            PDFBlockType.DYNAMIC_TABLE.value: self._add_dynamic_table_block_to_canvas,
+    ) -> document_ir.DocumentIR:
+        """Lower block DTOs into a cacheable, serialisable DocumentIR."""
+        lowering_map = {
+            PDFBlockType.HEADER.value: self._lower_header_block,
+            PDFBlockType.PARAGRAPH.value: self._lower_paragraph_block,
+            PDFBlockType.GRID.value: self._lower_grid_block,
+            PDFBlockType.TABLE.value: self._lower_table_block,
+            PDFBlockType.LIST.value: self._lower_list_block,
+            PDFBlockType.DYNAMIC_TABLE.value: self._lower_dynamic_table_block,
         }
 
-        flowables = []
+        document = document_ir.DocumentIR()
         for block_dto in block_dtos:
-            method = method_map.get(block_dto.block_type)
+            method = lowering_map.get(block_dto.block_type)
             if not method:
                 continue
 
-            flowables += method(block_dto=block_dto)
+            node = method(block_dto=block_dto)
+            if node is not None:
+                document.append(node)
 
-        return flowables
+        return document
 
     @staticmethod
-    def _get_header_flowables(
-        block_dto: dtos.PDFHeaderBlockDTO,
-    ) -> List[Flowable]:
-        from plugins.interactors.dms.pdf_flowable_blocks.header_block import (
-            HeaderBlockV2,
-        )
-
-        header_block = HeaderBlockV2()
-        return header_block.create_header_flowables(
+    def _lower_header_block(block_dto: dtos.PDFHeaderBlockDTO):
+        return document_ir.HeaderNode(
             logo_url=block_dto.logo_url,
             header_text=block_dto.header_text,
             sub_header_text=block_dto.sub_header_text,
@@ -101,137 +253,159 @@ class GeneratePDFWithFlowablesInteractor:
         )
 
     @staticmethod
-    def _get_paragraph_flowables(
-        block_dto: dtos.PDFParagraphBlockDTO,
-    ) -> List[Flowable]:
-        from plugins.interactors.dms.pdf_flowable_blocks.paragraph_block import (
-            ParagraphBlockV2,
+    def _lower_paragraph_block(block_dto: dtos.PDFParagraphBlockDTO):
+        return document_ir.ParagraphNode(
+            heading=block_dto.heading, lines=block_dto.text_lines
         )
 
-        text_block = ParagraphBlockV2()
-        return text_block.create_flowables(
+    @staticmethod
+    def _lower_grid_block(block_dto: dtos.PDFGridBlockDTO):
+        return document_ir.GridNode(
             heading=block_dto.heading,
-            lines=block_dto.text_lines,
+            units=[
+                document_ir.GridUnitNode(
+                    text_lines=[
+                        text_line
+                        for text_line in unit_dto.text_lines
+                        if text_line
+                    ],
+                    unit_width=unit_dto.unit_width,
+                    alignment=unit_dto.alignment,
+                )
+                for unit_dto in block_dto.grid_unit_dtos
+            ],
         )
 
     @staticmethod
-    def _get_grid_block_flowables(
-        block_dto: dtos.PDFGridBlockDTO,
-    ) -> List[Flowable]:
-        from plugins.interactors.dms.pdf_flowable_blocks.grid_block import (
-            GridBlockV2,
+    def _lower_table_block(block_dto: dtos.PDFTableBlockDTO):
+        from plugins.interactors.dms.pdf_flowable_blocks.block_renderers import (
+            calculate_table_column_widths,
         )
-
-        grid_units = [
-            {
-                "text_lines": [
-                    text_line for text_line in unit_dto.text_lines if text_line
-                ],
-                "unit_width": unit_dto.unit_width,
-                "alignment": unit_dto.alignment,
-            }
-            for unit_dto in block_dto.grid_unit_dtos
-        ]
-        grid_block = GridBlockV2()
-        return grid_block.create_grid_flowables(
-            heading=block_dto.heading,
-            grid_units=grid_units,
+        from plugins.interactors.dms.pdf_flowable_blocks.table_block import (
+            ColumnarTableData,
         )
 
-    def _get_table_block_flowables(
-        self,
-        block_dto: dtos.PDFTableBlockDTO,
-    ) -> List[Flowable]:
-        from plugins.interactors.dms.pdf_flowable_blocks.generic_table_block import (
-            CellConfig,
-            GenericTableBlockV2,
-            RowConfig,
-        )
+        if isinstance(block_dto.table_data, ColumnarTableData):
+            return document_ir.columnar_table_node(
+                data=block_dto.table_data,
+                heading=block_dto.heading,
+                column_widths=block_dto.column_widths,
+            )
+
+        # The IR holds every value, so row iterators are materialised here
+        table_data = block_dto.table_data
+        if table_data is not None and not isinstance(table_data, (list, tuple)):
+            table_data = list(table_data)
 
-        if not block_dto.table_data:
-            return []
+        if not table_data:
+            return None
 
-        column_widths = self._calculate_table_column_widths(
+        column_widths = calculate_table_column_widths(
             column_widths=block_dto.column_widths,
-            first_row=block_dto.table_data[0],
+            first_row=table_data[0],
         )
-
-        row_config_dtos = []
-        for row_values in block_dto.table_data:
-            cell_dtos = []
-            for index, _value in enumerate(row_values):
-                cell_dto = CellConfig(
-                    value=_value,
-                    width=column_widths[index],
+        return document_ir.TableNode(
+            heading=block_dto.heading,
+            rows=[
+                document_ir.TableRowNode(
+                    cells=[
+                        document_ir.TableCellNode(
+                            value=document_ir.cell_value(_value),
+                            width=column_widths[index],
+                        )
+                        for index, _value in enumerate(row_values)
+                    ],
                 )
-                cell_dtos.append(cell_dto)
-
-            row_config_dto = RowConfig(cells=cell_dtos)
-            row_config_dtos.append(row_config_dto)
-
-        table_block = GenericTableBlockV2()
-        return table_block.create_generic_table_flowables(
-            heading=block_dto.heading, rows=row_config_dtos
+                for row_values in table_data
+            ],
         )
 
     @staticmethod
-    def _get_list_block_flowables(
-        block_dto: dtos.PDFListBlockDTO,
-    ):
-        # TODO: Need to support description too
-        from plugins.interactors.dms.pdf_flowable_blocks.list_block import (
-            ListBlockV2,
-        )
-
-        list_block = ListBlockV2()
-        return list_block.create_list_flowables(
+    def _lower_list_block(block_dto: dtos.PDFListBlockDTO):
+        lines = block_dto.text_lines
+        if isinstance(lines, dict):
+            items = document_ir.list_items_from_lines(lines)
+        else:
+            items = tuple((line, None) for line in lines or [])
+
+        return document_ir.ListNode(
             heading=block_dto.heading,
-            lines=block_dto.text_lines,
+            items=items,
             presentation_type=block_dto.presentation_type,
         )
 
     @staticmethod
-    def _add_dynamic_table_block_to_canvas(
-        block_dto: dtos.PDFDynamicTableBlockDTO,
-    ) -> List[Flowable]:
-        from plugins.interactors.dms.pdf_flowable_blocks.generic_table_block import (
-            CellConfig,
-            GenericTableBlockV2,
-            RowConfig,
-        )
-
-        row_config_dtos = []
-        for row_dto in block_dto.row_dtos:
-            row_config_dto = RowConfig(
-                cells=[
-                    CellConfig(value=cell_dto.text, width=cell_dto.cell_width)
-                    for cell_dto in row_dto.cell_dtos
-                ]
+    def _lower_dynamic_table_block(block_dto: dtos.PDFDynamicTableBlockDTO):
+        columnar_data = getattr(block_dto, "columnar_data", None)
+        if columnar_data is not None:
+            return document_ir.columnar_table_node(
+                data=columnar_data,
+                heading=block_dto.heading,
+                column_widths=getattr(block_dto, "column_widths", None),
             )
-            row_config_dtos.append(row_config_dto)
 
-        return GenericTableBlockV2().create_generic_table_flowables(
-            rows=row_config_dtos,
+        return document_ir.TableNode(
             heading=block_dto.heading,
+            rows=[
+                document_ir.TableRowNode(
+                    cells=[
+                        document_ir.TableCellNode(
+                            value=document_ir.cell_value(cell_dto.text),
+                            width=cell_dto.cell_width,
+                        )
+                        for cell_dto in row_dto.cell_dtos
+                    ],
+                )
+                for row_dto in block_dto.row_dtos
+            ],
         )
 
-    @staticmethod
-    def _calculate_table_column_widths(
-        column_widths: List[float], first_row: List[Any]
-    ):
-        total_width = PDFConfig.get_page_width() - (2 * PDFConfig.MARGIN)
+    def _get_flowables(
+        self,
+        block_dtos: List[dtos.PDF_BLOCK_UNION_TYPE],
+        outline: Optional[DocumentOutline] = None,
+        budget: Optional[RenderBudget] = None,
+    ) -> List[Flowable]:
+        flowables = []
+        for block_dto in block_dtos:
+            renderer = block_registry.get(block_dto.block_type)
+            if not renderer:
+                continue
 
-        num_columns = len(first_row)
+            if outline is not None:
+                entry = self._get_outline_entry(outline, block_dto)
+                if entry:
+                    flowables.append(entry)
 
-        if column_widths:
-            if len(column_widths) != num_columns:
-                raise ValueError(
-                    "Number of percentages must match number of columns"
-                )
-            if abs(sum(column_widths) - 100) > 0.01:
-                # Allow for floating point imprecision
-                raise ValueError("Percentages must sum to 100")
-            return [total_width * (pct / 100) for pct in column_widths]
+            if budget is not None:
+                budget.check()
+            block_flowables = renderer.render(block_dto)
+            if budget is not None:
+                budget.add_flowables(len(block_flowables))
+            flowables += block_flowables
+
+        return flowables
 
-        # Default to equal distribution
-        return [total_width / num_columns] * num_columns
+    def get_outline_levels(
+        self, pdf_block_dtos: List[dtos.PDF_BLOCK_UNION_TYPE]
+    ) -> List[int]:
+        """Requested level of every bookmark ``generate_pdf`` adds, in order.
+
+        Nothing is rendered; only the headings are read.
+        """
+        outline = DocumentOutline()
+        for block_dto in pdf_block_dtos:
+            if is_running_text_block(block_dto):
+                continue
+            if block_registry.get(block_dto.block_type):
+                self._get_outline_entry(outline, block_dto)
+        return [section.level for section in outline.sections]
+
+    @staticmethod
+    def _get_outline_entry(
+        outline: DocumentOutline, block_dto: dtos.PDF_BLOCK_UNION_TYPE
+    ) -> Optional[OutlineEntry]:
+        header_text = getattr(block_dto, "header_text", None)
+        if header_text:
+            return outline.entry(header_text, level=0)
+        return outline.entry(getattr(block_dto, "heading", None), level=1)
@@ -7,7 +7,7 @@ and column widths using ReportLab's high-level components (Platypus).
 
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
@@ -16,15 +16,25 @@ from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
 
 from pdf_letter_generator.pdf_blocks.pdf_config import PDFConfig
 from pdf_flowable_blocks.pdf_flowable_blocks.paragraph_block import ParagraphBlockV2
+from pdf_flowable_blocks.pdf_flowable_blocks.streaming_table import (
+    MeasuredStreamingTable,
+    StreamingTable,
+    iter_with_last,
+    peek,
+)
 from pdf_letter_generator.commons import (
     PDFLineSpacing,
     PDFTextStyles,
 )
+from pdf_letter_generator.commons.paragraph_cache import CachedParagraph
 from pdf_letter_generator.commons.text_utils import sanitize
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Height offered to a row when measuring it, large enough for any row
+MEASURE_HEIGHT = 1 << 30
+
 
 @dataclass
 class CellConfig:
@@ -120,7 +130,7 @@ class GenericTableBlockV2:
         if cell.text_color:
             style.textColor = cell.text_color
 
-        return Paragraph(text, style)
+        return CachedParagraph(text, style)
 
     @staticmethod
     def _calculate_max_columns(rows: List[RowConfig]) -> int:
@@ -207,14 +217,101 @@ class GenericTableBlockV2:
             ]),
         )
 
+    def _create_streaming_table(
+            self,
+            rows: Iterable[RowConfig],
+            available_width: float,
+            borders: bool,
+            repeat_header: bool,
+            chunk_rows: Optional[int] = None
+    ) -> Union[Table, MeasuredStreamingTable, StreamingTable]:
+        """Create a streaming table; the first row is repeated as header.
+
+        Rows are built and measured as they are consumed, and each chunk
+        holds the rows fitting the frame, unless ``chunk_rows`` fixes the
+        number of rows per chunk.
+        """
+        rows = iter(rows)
+        header_row = next(rows)
+        first_body_row, body_rows = peek(rows)
+        header_table = self._wrap_in_container(
+            self._create_row_table(row=header_row, available_width=available_width,
+                                   borders=borders, corner_radii=(10, 10, 0, 0)),
+            available_width,
+        )
+        if first_body_row is None:
+            return header_table
+
+        row_tables = (
+            self._wrap_in_container(
+                self._create_row_table(row=row, available_width=available_width, borders=borders,
+                                       corner_radii=(0, 0, 10, 10) if is_last else None),
+                available_width,
+            )
+            for row, is_last in iter_with_last(body_rows)
+        )
+
+        def _build_chunk(chunk: List[Table], start: int) -> Table:
+            table_rows = [[header_table]] if start == 0 or repeat_header else []
+            header_count = len(table_rows)
+            table_rows.extend([row_table] for row_table in chunk)
+            return Table(
+                table_rows,
+                colWidths=[available_width],
+                repeatRows=header_count,
+                style=TableStyle([
+                    ("TOPPADDING", (0, 0), (-1, -1), 0),
+                    ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
+                    ("LEFTPADDING", (0, 0), (-1, -1), 0),
+                    ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+                ]),
+            )
+
+        if chunk_rows:
+            return StreamingTable.from_rows(row_tables, chunk_rows, _build_chunk)
+
+        def _measure(row_table: Table) -> float:
+            # Row tables are not padded inside the chunk table
+            return row_table.wrap(available_width, MEASURE_HEIGHT)[1]
+
+        return MeasuredStreamingTable(
+            row_tables,
+            _measure,
+            _build_chunk,
+            header_height=_measure(header_table),
+            repeat_header=repeat_header,
+        )
+
     def create_generic_table_flowables(
             self,
-            rows: List[RowConfig],
+            rows: Union[List[RowConfig], Iterable[RowConfig]],
             borders: bool = True,
-            heading: Optional[str] = None
+            heading: Optional[str] = None,
+            repeat_header: bool = True,
+            chunk_rows: Optional[int] = None
     ) -> List[Union[Table, Spacer]]:
-        """Create table flowables from row configurations."""
+        """Create table flowables from row configurations.
+
+        ``rows`` may also be an iterator, which is consumed lazily in
+        page-sized chunks; the first row is then repeated on every chunk
+        when ``repeat_header`` is set.
+        """
         try:
+            if rows is not None and not isinstance(rows, (list, tuple)):
+                first_row, rows = peek(rows)
+                if first_row is None:
+                    return []
+
+                available_width = PDFConfig.get_page_width() - (2 * PDFConfig.MARGIN)
+                flowables = []
+                if heading:
+                    flowables.extend(self._create_heading_flowables(heading))
+                flowables.append(
+                    self._create_streaming_table(rows, available_width, borders, repeat_header, chunk_rows)
+                )
+                flowables.append(Spacer(1, 24))
+                return flowables
+
             if not rows:
                 return []
 
@@ -15,6 +15,7 @@ from reportlab.lib.styles import ParagraphStyle, StyleSheet1
 from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
 
 from pdf_letter_generator.commons.constants import GridBlockStyles
+from pdf_letter_generator.commons.paragraph_cache import CachedParagraph
 
 logger = logging.getLogger(__name__)
 
@@ -153,7 +154,7 @@ class GridBlockV2:
                     parent=self.stylesheet["grid"],
                     alignment=alignment,
                 )
-                row.append(Paragraph(text, style))
+                row.append(CachedParagraph(text, style))
             cells.append(row)
 
         return cells
@@ -180,7 +181,9 @@ class GridBlockV2:
             flowables = []
 
             if heading:
-                header_para = Paragraph(heading, self.stylesheet["header"])
+                header_para = CachedParagraph(
+                    heading, self.stylesheet["header"]
+                )
                 flowables.append(header_para)
                 flowables.append(Spacer(1, heading_spacing))
 
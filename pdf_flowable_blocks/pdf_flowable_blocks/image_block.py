@@ -6,24 +6,35 @@ using ReportLab's components. Images are arranged in rows of 2. Supports both S3
 """
 
 import logging
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from io import BytesIO
-from typing import List, Optional, Tuple, Union
-from urllib.parse import urlparse
+from typing import Dict, List, Optional, Tuple, Union
 
-import boto3
-from botocore.exceptions import ClientError
 from reportlab.lib import colors
 from reportlab.lib.units import inch
-from reportlab.platypus import Image, Table, TableStyle, Spacer, Paragraph, ParagraphStyle
+from reportlab.platypus import Image, Table, TableStyle, Spacer, Paragraph
 from reportlab.platypus.flowables import Flowable
-from reportlab.lib.styles import StyleSheet1
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1
 from pdf_letter_generator.commons import ImageBlockStyles
+from pdf_letter_generator.commons.asset_fetch import asset_fetcher, parse_s3_url
+from pdf_letter_generator.commons.image_preparation import (
+    DEFAULT_JPEG_QUALITY,
+    DEFAULT_TARGET_DPI,
+    ImagePreparationSettings,
+    PreparedImage,
+    fit_draw_size,
+    image_preparer,
+)
+from pdf_letter_generator.commons.image_probe import image_probe
+from pdf_letter_generator.commons.image_registry import current_image_registry
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Images of one block fetched and resized at once by default
+DEFAULT_IMAGE_WORKERS = 8
+
 
 @dataclass
 class MediaStyle:
@@ -35,6 +46,8 @@ class MediaStyle:
     cell_padding: float = 0.1 * inch  # Padding inside table cells
     border_color: colors.Color = colors.white  # Border color for table cells
     border_width: float = 0  # Border width for table cells
+    target_dpi: float = DEFAULT_TARGET_DPI  # Resolution of embedded images
+    jpeg_quality: int = DEFAULT_JPEG_QUALITY  # Quality of re-encoded photos
 
 
 @dataclass
@@ -47,6 +60,8 @@ class ImageDTO:
 class ImageBlock:
     """Handles the creation and management of media blocks in PDFs using Platypus."""
 
+    PLACEHOLDER_TEXT = "Image unavailable"
+
     def __init__(self, style: Optional[MediaStyle] = None):
         """Initialize the MediaBlock with styling configuration.
 
@@ -54,8 +69,11 @@ class ImageBlock:
             style: Optional custom style configuration
         """
         self.style = style or MediaStyle()
+        self.preparation_settings = ImagePreparationSettings(
+            target_dpi=self.style.target_dpi,
+            jpeg_quality=self.style.jpeg_quality,
+        )
         self.stylesheet = self._create_stylesheet()
-        self._s3_client = boto3.client("s3")
 
     def _create_stylesheet(self):
 
@@ -89,24 +107,16 @@ class ImageBlock:
         """Parse S3 URL to extract bucket and key.
 
         Args:
-            url: S3 URL (s3://bucket/key or https://bucket.s3.amazonaws.com/key)
+            url: S3 URL (s3://bucket/key, virtual-hosted or path-style)
 
         Returns:
             Tuple[str, str]: Bucket name and object key
         """
-        parsed = urlparse(url)
-        if parsed.scheme == "s3":
-            # Handle s3:// URLs
-            bucket = parsed.netloc
-            key = parsed.path.lstrip("/")
-        elif "s3.amazonaws.com" in parsed.netloc:
-            # Handle https://bucket.s3.amazonaws.com/key URLs
-            bucket = parsed.netloc.split(".")[0]
-            key = parsed.path.lstrip("/")
-        else:
+        s3_location = parse_s3_url(url)
+        if s3_location is None:
             raise ValueError(f"Invalid S3 URL format: {url}")
 
-        return bucket, key
+        return s3_location
 
     def _fetch_image(self, url: str) -> BytesIO:
         """Fetch image from URL (S3 or HTTP) and return as BytesIO object.
@@ -121,31 +131,86 @@ class ImageBlock:
             Exception: If image fetch fails
         """
         try:
-            if "s3://" in url or "s3.amazonaws.com" in url:
-                # Handle S3 URLs with authentication
-                bucket, key = self._parse_s3_url(url)
-                response = self._s3_client.get_object(Bucket=bucket, Key=key)
-                image_data = response["Body"].read()
-            else:
-                # Handle regular HTTP URLs
-                with urllib.request.urlopen(url) as response:
-                    image_data = response.read()
-
-            return BytesIO(image_data)
-
-        except ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code", "Unknown")
-            logger.error(f"S3 error fetching image {url}: {error_code}")
-            raise
+            # Pooled, process-wide S3 client and HTTP session
+            return BytesIO(asset_fetcher.fetch(url))
+
         except Exception as e:
             logger.error(f"Error fetching image from URL {url}: {str(e)}")
             raise
 
-    def _create_image(self, url: str) -> Image:
+    def _load_image(self, url: str) -> PreparedImage:
+        """Fetch, decode and resize one image; safe to run in a worker thread.
+
+        Args:
+            url: Image URL (S3 or HTTP)
+
+        Returns:
+            PreparedImage: Image resampled for the style's max size
+        """
+        # Resample to the draw size, so the PDF does not embed the
+        # full-resolution original
+        return image_preparer.prepare(
+            self._fetch_image(url).getvalue(),
+            max_width=self.style.max_width,
+            max_height=self.style.max_height,
+            settings=self.preparation_settings,
+        )
+
+    def _load_images(
+        self,
+        urls: List[str],
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Optional[PreparedImage]]:
+        """Load images concurrently with a bounded worker pool.
+
+        Args:
+            urls: Image URLs; duplicates are loaded once
+            max_workers: Maximum concurrent loads
+            timeout: Seconds to wait for all images; unfinished ones fail
+
+        Returns:
+            Dict[str, Optional[PreparedImage]]: Images by URL, None for
+            failures and timeouts
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        loaded: Dict[str, Optional[PreparedImage]] = dict.fromkeys(unique_urls)
+        if not unique_urls:
+            return loaded
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers
+            or min(len(unique_urls), DEFAULT_IMAGE_WORKERS),
+            thread_name_prefix="image-block",
+        )
+        try:
+            futures = {
+                executor.submit(self._load_image, url): url
+                for url in unique_urls
+            }
+            done, not_done = wait(futures, timeout=timeout)
+            for future in done:
+                try:
+                    loaded[futures[future]] = future.result()
+                except Exception as e:
+                    logger.error(
+                        f"Error loading image {futures[future]}: {str(e)}"
+                    )
+            for future in not_done:
+                logger.error(f"Timed out loading image {futures[future]}")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return loaded
+
+    def _create_image(
+        self, url: str, prepared: Optional[PreparedImage] = None
+    ) -> Image:
         """Create a ReportLab Image object from URL with proper sizing.
 
         Args:
             url: Image URL (S3 or HTTP)
+            prepared: Image already loaded for the URL, if any
 
         Returns:
             Image: ReportLab Image object
@@ -154,31 +219,44 @@ class ImageBlock:
             Exception: If image creation fails
         """
         try:
-            # Get image data as BytesIO
-            image_data = self._fetch_image(url)
-
-            # Create Image directly from BytesIO
-            img = Image(image_data)
-
-            # Calculate aspect ratio and resize if needed
-            aspect = img.imageWidth / img.imageHeight
-            if img.imageWidth > self.style.max_width:
-                img.drawWidth = self.style.max_width
-                img.drawHeight = self.style.max_width / aspect
-            if img.drawHeight > self.style.max_height:
-                img.drawHeight = self.style.max_height
-                img.drawWidth = self.style.max_height * aspect
+            registry = current_image_registry()
+            if registry.probe_only:
+                # Measuring a layout: size from the header, fetch nothing
+                width, height = self.get_image_dimensions(url)
+                return registry.image(url, width=width, height=height)
+
+            if prepared is None:
+                prepared = self._load_image(url)
+
+            # Photos repeated within a document are embedded once
+            img = current_image_registry().image(
+                prepared.data,
+                width=prepared.draw_width,
+                height=prepared.draw_height,
+            )
 
             return img
         except Exception as e:
             logger.error(f"Error creating image object: {str(e)}")
             raise
 
-    def _create_image_row(self, images: List[ImageDTO]) -> List[List[Union[Paragraph, Spacer, Image]]]:
+    def _create_placeholder(self) -> Paragraph:
+        """Stand-in for an image that failed to load or timed out."""
+        return Paragraph(
+            self.PLACEHOLDER_TEXT, style=self.stylesheet["description"]
+        )
+
+    def _create_image_row(
+        self,
+        images: List[ImageDTO],
+        loaded: Optional[Dict[str, Optional[PreparedImage]]] = None,
+    ) -> List[List[Union[Paragraph, Spacer, Image]]]:
         """Create a row of images from URLs.
 
         Args:
             images: list of imagedtos
+            loaded: Images loaded by _load_images, by URL; images missing
+                from it are drawn as placeholders
 
         Returns:
             List[Image]: List of ReportLab Image objects
@@ -192,7 +270,12 @@ class ImageBlock:
                 else:
                     image_data.append(Spacer(1, 17))
 
-                img = self._create_image(image.url)
+                if loaded is None:
+                    img = self._create_image(image.url)
+                elif loaded.get(image.url) is None:
+                    img = self._create_placeholder()
+                else:
+                    img = self._create_image(image.url, loaded[image.url])
                 image_data.append(img)
                 image_data.append(Spacer(1, 5))
 
@@ -212,11 +295,22 @@ class ImageBlock:
 
         return row_images
 
-    def create_flowables(self, image_dtos: List[ImageDTO]) -> List[Flowable]:
+    def create_flowables(
+        self,
+        image_dtos: List[ImageDTO],
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Flowable]:
         """Create a list of flowables for the media block with 2-column layout.
 
+        Images are fetched, decoded and resized in parallel; rows keep the
+        order of image_dtos.
+
         Args:
             image_dtos: List of imagedtos
+            max_workers: Maximum images loaded at once; 1 loads serially
+            timeout: Seconds to wait for all images of the block; images
+                still loading are drawn as placeholders
 
         Returns:
             List[Flowable]: List of flowable objects ready for document
@@ -227,10 +321,20 @@ class ImageBlock:
         try:
             flowables = []
 
+            # Load every image up front; failures become placeholders.
+            # Layout measurement only probes image headers instead.
+            loaded = None
+            if not current_image_registry().probe_only:
+                loaded = self._load_images(
+                    [image_dto.url for image_dto in image_dtos],
+                    max_workers=max_workers,
+                    timeout=timeout,
+                )
+
             # Process URLs in pairs to create rows
             for i in range(0, len(image_dtos), 2):
                 images = image_dtos[i: i + 2]
-                row_images = self._create_image_row(images)
+                row_images = self._create_image_row(images, loaded)
 
                 # Create table for the row with proper styling
                 table = Table(
@@ -260,6 +364,9 @@ class ImageBlock:
 
     def get_image_dimensions(self, url: str) -> Tuple[float, float]:
         """Get the dimensions of an image after applying style constraints.
+
+        Only the image header is fetched; see image_probe.
+
         Args:
             url: Image URL (S3 or HTTP)
 
@@ -267,8 +374,13 @@ class ImageBlock:
             Tuple[float, float]: Width and height in points
         """
         try:
-            img = self._create_image(url)
-            return img.drawWidth, img.drawHeight
+            pixel_width, pixel_height = image_probe.probe(url)
+            return fit_draw_size(
+                pixel_width,
+                pixel_height,
+                self.style.max_width,
+                self.style.max_height,
+            )
         except Exception as e:
             logger.error(f"Error getting image dimensions: {str(e)}")
             raise
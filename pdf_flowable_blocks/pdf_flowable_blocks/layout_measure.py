@@ -0,0 +1,210 @@
+"""
+Layout Measurement Module for PDF Generation
+
+This module runs the Platypus layout of a document without producing a
+PDF: flowables are wrapped and split exactly as in a real build, but never
+drawn, page callbacks (watermarks) are skipped, and nothing is serialised.
+It returns the page count and, for every block, the page and bounding box
+of each piece it was laid out as.
+"""
+
+import copy
+import logging
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Flowable, Frame, PageTemplate, SimpleDocTemplate
+from reportlab.platypus.doctemplate import BaseDocTemplate
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PageBox:
+    """Bounding box of a laid out flowable, in points from the bottom-left."""
+
+    page: int
+    x: float
+    y: float
+    width: float
+    height: float
+
+
+@dataclass
+class BlockLayout:
+    """Placement of one block, which may span several pages."""
+
+    block_index: int
+    label: Optional[str]
+    boxes: List[PageBox] = field(default_factory=list)
+
+    @property
+    def first_page(self) -> Optional[int]:
+        return self.boxes[0].page if self.boxes else None
+
+    @property
+    def last_page(self) -> Optional[int]:
+        return self.boxes[-1].page if self.boxes else None
+
+    def page_bbox(self, page: int) -> Optional[Tuple[float, float, float, float]]:
+        """Return the union (x0, y0, x1, y1) of the block's boxes on a page."""
+        boxes = [box for box in self.boxes if box.page == page]
+        if not boxes:
+            return None
+        return (
+            min(box.x for box in boxes),
+            min(box.y for box in boxes),
+            max(box.x + box.width for box in boxes),
+            max(box.y + box.height for box in boxes),
+        )
+
+
+@dataclass
+class LayoutMeasurement:
+    """Result of a measure-only layout run."""
+
+    page_count: int
+    blocks: List[BlockLayout]
+
+
+class NullCanvas(Canvas):
+    """Canvas that keeps page bookkeeping but never decodes or serialises."""
+
+    def drawImage(self, *args, **kwargs):
+        return 0, 0
+
+    def drawInlineImage(self, *args, **kwargs):
+        return 0, 0
+
+    def save(self):
+        pass
+
+
+class _LayoutRecorder:
+    def __init__(self, blocks: List[BlockLayout], block_indexes: Dict[int, int]):
+        self.blocks = blocks
+        # Block index by flowable id; the flowables outlive the build
+        self.block_indexes = block_indexes
+        self.current_index: Optional[int] = None
+
+    def record(self, flowable: Flowable, page: int, x: float, y: float,
+               width: float, height: float) -> None:
+        # Split parts and streamed chunks are created during layout and
+        # carry no tag; they continue the block laid out before them
+        index = self.block_indexes.get(id(flowable), self.current_index)
+        if index is None:
+            return
+        self.current_index = index
+        self.blocks[index].boxes.append(PageBox(page, x, y, width, height))
+
+
+class _MeasuringFrame(Frame):
+    """Frame that records placements instead of drawing flowables."""
+
+    def __init__(self, *args, recorder: _LayoutRecorder, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._recorder = recorder
+
+    def __deepcopy__(self, memo):
+        # Platypus deep-copies the frame to wrap list content; the recorder
+        # (and the flowables it references) must be shared, not copied
+        memo[id(self._recorder)] = self._recorder
+        clone = self.__class__.__new__(self.__class__)
+        memo[id(self)] = clone
+        clone.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return clone
+
+    def _add(self, flowable, canv, trySplit=0):
+        size = {}
+        wrap = flowable.wrap
+
+        def _wrap(availWidth, availHeight):
+            size["value"] = wrap(availWidth, availHeight)
+            return size["value"]
+
+        def _draw_on(canvas, x, y, _sW=0):
+            width, height = size.get("value", (0, 0))
+            if hasattr(flowable, "_hAlignAdjust"):
+                x = flowable._hAlignAdjust(x, _sW)
+            self._recorder.record(
+                flowable, canvas.getPageNumber(), x, y, width, height
+            )
+
+        # Instance attributes shadow the methods for this call only; set
+        # through __dict__ as Drawing validates attribute assignment
+        attributes = vars(flowable)
+        attributes["wrap"] = _wrap
+        attributes["drawOn"] = _draw_on
+        try:
+            return super()._add(flowable, canv, trySplit=trySplit)
+        finally:
+            attributes.pop("wrap", None)
+            attributes.pop("drawOn", None)
+
+    add = _add
+
+
+class _MeasuringDocTemplate(SimpleDocTemplate):
+    def build(self, flowables, recorder: _LayoutRecorder):
+        frame = _MeasuringFrame(
+            self.leftMargin,
+            self.bottomMargin,
+            self.width,
+            self.height,
+            id="normal",
+            recorder=recorder,
+        )
+        self.addPageTemplates(
+            [
+                PageTemplate(id="First", frames=frame, pagesize=self.pagesize),
+                PageTemplate(id="Later", frames=frame, pagesize=self.pagesize),
+            ]
+        )
+        BaseDocTemplate.build(self, flowables, canvasmaker=NullCanvas)
+
+
+def measure_block_flowables(
+    block_flowables: Sequence[Tuple[Optional[str], List[Flowable]]],
+    pagesize: Tuple[float, float],
+    margin: float,
+) -> LayoutMeasurement:
+    """Lay out grouped flowables without rendering, and report placements.
+
+    The page geometry must match the one used for the real build
+    (``SimpleDocTemplate`` with equal margins) for the numbers to agree.
+
+    Args:
+        block_flowables: One ``(label, flowables)`` pair per block
+        pagesize: Page size in points
+        margin: Margin on every side in points
+
+    Returns:
+        LayoutMeasurement: Page count and per-block placements
+    """
+    try:
+        blocks = []
+        flowables = []
+        block_indexes = {}
+        for index, (label, block_flowables_) in enumerate(block_flowables):
+            blocks.append(BlockLayout(block_index=index, label=label))
+            for flowable in block_flowables_:
+                block_indexes[id(flowable)] = index
+                flowables.append(flowable)
+
+        doc = _MeasuringDocTemplate(
+            BytesIO(),
+            pagesize=pagesize,
+            leftMargin=margin,
+            rightMargin=margin,
+            topMargin=margin,
+            bottomMargin=margin,
+        )
+        doc.build(flowables, recorder=_LayoutRecorder(blocks, block_indexes))
+
+        return LayoutMeasurement(page_count=doc.page, blocks=blocks)
+
+    except Exception as e:
+        logger.error(f"Error measuring layout: {str(e)}")
+        raise
@@ -17,6 +17,7 @@ from pdf_letter_generator.commons.constants import (
     ListBlockStyles,
     PresentationType,
 )
+from pdf_letter_generator.commons.paragraph_cache import CachedParagraph
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -115,7 +116,7 @@ class ListBlockV2:
         list_items = []
 
         for header, sublines in lines.items():
-            para = Paragraph(header, self.stylesheet["list"])
+            para = CachedParagraph(header, self.stylesheet["list"])
             if isinstance(sublines, dict):
                 presentation_type = sublines.get("presentation_type", "unordered_list")
                 sublist_items = self._create_list_items(lines=sublines, item_spacing=item_spacing)
@@ -144,7 +145,9 @@ class ListBlockV2:
         try:
             flowables = []
             if heading:
-                header_para = Paragraph(heading, self.stylesheet["header"])
+                header_para = CachedParagraph(
+                    heading, self.stylesheet["header"]
+                )
                 flowables.append(header_para)
                 flowables.append(Spacer(1, heading_spacing))
 
@@ -0,0 +1,280 @@
+"""
+Outline Module for PDF Generation
+
+This module adds PDF bookmarks (the outline shown in the viewer's sidebar)
+and an optional table of contents, in a single layout pass.
+
+An ``OutlineEntry`` is a zero-size flowable placed before a section; when
+it is drawn it records the section's page and adds the bookmark. The table
+of contents reserves its height from the number of entries, which is known
+before layout, and draws each page number as a reference to a Form XObject
+that the entry defines once its page is known. This avoids ``multiBuild``,
+which lays out the whole document again until page numbers settle.
+
+Usage:
+    outline = DocumentOutline()
+    story.append(outline.entry("Plot Details", level=1))
+    story += table_flowables
+    story = outline.insert_table_of_contents(story)
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Flowable, PageBreak
+
+from pdf_letter_generator.commons.constants import PDFMargins, PDFTextStyles
+from pdf_letter_generator.commons.text_utils import strip_markup
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bookmarks at this outline level or deeper start collapsed
+CLOSED_LEVELS = 1
+
+
+def nest_outline_level(open_levels: List[int], level: int) -> int:
+    """Return the outline level of the next section, updating ``open_levels``.
+
+    PDF outlines cannot skip levels, e.g. headings without a header: each
+    section is nested under the closest enclosing one, so sections at the
+    same requested level stay siblings.
+
+    Args:
+        open_levels: Requested levels of the sections enclosing the next one
+        level: Requested level of the next section
+
+    Returns:
+        int: Outline level of the section
+    """
+    while open_levels and open_levels[-1] >= level:
+        open_levels.pop()
+    outline_level = len(open_levels)
+    open_levels.append(level)
+    return outline_level
+
+
+@dataclass
+class OutlineSection:
+    """A bookmarked section; ``page`` is set once the section is laid out."""
+
+    title: str
+    level: int
+    key: str
+    page: Optional[int] = None
+
+
+class OutlineEntry(Flowable):
+    """Zero-size flowable that bookmarks the position of a section."""
+
+    def __init__(self, outline: "DocumentOutline", section: OutlineSection):
+        super().__init__()
+        self.outline = outline
+        self.section = section
+        self.width = self.height = 0
+        # Move to the next page together with the section's first flowable
+        self.keepWithNext = 1
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        self.outline.place(self.canv, self.section)
+
+
+class TableOfContents(Flowable):
+    """Table of contents over the sections of a ``DocumentOutline``.
+
+    Titles are drawn (and linked to their bookmarks) as soon as the table is
+    laid out; page numbers are Form XObjects defined by the entries.
+    """
+
+    TITLE = "Contents"
+    TITLE_FONT = PDFTextStyles.TextBlockHeading.FONT
+    TITLE_SIZE = 14
+    FONT = PDFTextStyles.Body.FONT
+    SIZE = 10
+    LEADING = 16
+    LEVEL_INDENT = PDFMargins.INDENT_SMALL
+    PAGE_NUMBER_WIDTH = 36
+
+    def __init__(
+        self,
+        outline: "DocumentOutline",
+        start: int = 0,
+        end: Optional[int] = None,
+    ):
+        """Initialize a table of contents over ``outline.sections[start:end]``.
+
+        Args:
+            outline: Outline whose sections are listed
+            start: Index of the first listed section
+            end: Index after the last listed section; None for all
+        """
+        super().__init__()
+        self.outline = outline
+        self.start = start
+        self.end = end
+        self.outline.has_table_of_contents = True
+
+    @property
+    def _sections(self) -> List[OutlineSection]:
+        return self.outline.sections[self.start:self.end]
+
+    @property
+    def _title_height(self) -> float:
+        return 2 * self.LEADING if self.start == 0 else 0
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        self.height = self._title_height + len(self._sections) * self.LEADING
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        count = len(self._sections)
+        fitting = int((availHeight - self._title_height) // self.LEADING)
+        if fitting <= 0 or fitting >= count:
+            return []
+        middle = self.start + fitting
+        return [
+            TableOfContents(self.outline, self.start, middle),
+            TableOfContents(self.outline, middle, self.end),
+        ]
+
+    def _fit_title(self, title: str, width: float) -> str:
+        if stringWidth(title, self.FONT, self.SIZE) <= width:
+            return title
+        while title and stringWidth(title + "...", self.FONT, self.SIZE) > width:
+            title = title[:-1]
+        return title.rstrip() + "..."
+
+    def draw(self):
+        canv = self.canv
+        y = self.height
+
+        if self.start == 0:
+            y -= self.LEADING
+            canv.setFont(self.TITLE_FONT, self.TITLE_SIZE)
+            canv.drawString(0, y, self.TITLE)
+            y -= self.LEADING
+
+        canv.setFont(self.FONT, self.SIZE)
+        for section in self._sections:
+            y -= self.LEADING
+            indent = section.level * self.LEVEL_INDENT
+            title_width = self.width - indent - self.PAGE_NUMBER_WIDTH
+            canv.drawString(indent, y, self._fit_title(section.title, title_width))
+
+            # Defined by the section's OutlineEntry once its page is known
+            canv.saveState()
+            canv.translate(self.width, y)
+            canv.doForm(self.outline.page_form_name(section))
+            canv.restoreState()
+
+            canv.linkRect(
+                "",
+                section.key,
+                (indent, y - 3, self.width, y + self.SIZE),
+                relative=1,
+            )
+
+
+class DocumentOutline:
+    """Collects the sections of one document build."""
+
+    def __init__(self, closed_levels: int = CLOSED_LEVELS):
+        """Initialize an empty outline.
+
+        Args:
+            closed_levels: Bookmarks at this level or deeper start collapsed
+        """
+        self.sections: List[OutlineSection] = []
+        self.closed_levels = closed_levels
+        self.has_table_of_contents = False
+        # Requested levels of the sections enclosing the next one
+        self._open_levels: List[int] = []
+
+    def entry(self, title: str, level: int = 0) -> Optional[OutlineEntry]:
+        """Declare a section and return the flowable marking its start.
+
+        Every returned entry must be added to the story.
+
+        Args:
+            title: Section title; Paragraph markup is removed
+            level: Nesting level, 0 for top-level sections
+
+        Returns:
+            Optional[OutlineEntry]: Entry flowable, or None for empty titles
+        """
+        title = strip_markup(title or "")
+        if not title:
+            return None
+        section = OutlineSection(
+            title=title, level=level, key=f"section_{len(self.sections)}"
+        )
+        self.sections.append(section)
+        return OutlineEntry(self, section)
+
+    @staticmethod
+    def page_form_name(section: OutlineSection) -> str:
+        return f"{section.key}_page"
+
+    def place(self, canv, section: OutlineSection) -> None:
+        """Bookmark a section at the current position (called while drawing).
+
+        Args:
+            canv: Canvas, translated to the position of the entry
+            section: Section being placed
+        """
+        try:
+            section.page = canv.getPageNumber()
+            canv.bookmarkHorizontal(section.key, 0, 0)
+
+            level = nest_outline_level(self._open_levels, section.level)
+            canv.addOutlineEntry(
+                section.title,
+                section.key,
+                level=level,
+                closed=level >= self.closed_levels,
+            )
+
+            if self.has_table_of_contents:
+                canv.beginForm(
+                    self.page_form_name(section),
+                    lowerx=-TableOfContents.PAGE_NUMBER_WIDTH,
+                    lowery=-TableOfContents.SIZE,
+                    upperx=0,
+                    uppery=2 * TableOfContents.SIZE,
+                )
+                canv.setFont(TableOfContents.FONT, TableOfContents.SIZE)
+                canv.drawRightString(0, 0, str(section.page))
+                canv.endForm()
+
+        except Exception as e:
+            logger.error(f"Error placing outline entry: {str(e)}")
+            raise
+
+    def table_of_contents(self) -> List[Flowable]:
+        """Return the table of contents flowables, ending with a page break."""
+        return [TableOfContents(self), PageBreak()]
+
+    def insert_table_of_contents(self, flowables: List[Flowable]) -> List[Flowable]:
+        """Insert the table of contents before the first sub-section.
+
+        Sections at level 0 (e.g. the letter header) stay above the table
+        of contents; without sub-sections it goes at the start.
+
+        Args:
+            flowables: Story containing the outline entries
+
+        Returns:
+            List[Flowable]: New story with the table of contents
+        """
+        index = 0
+        for position, flowable in enumerate(flowables):
+            if isinstance(flowable, OutlineEntry) and flowable.section.level > 0:
+                index = position
+                break
+        return flowables[:index] + self.table_of_contents() + flowables[index:]
@@ -15,6 +15,7 @@ from reportlab.platypus import Paragraph, Spacer
 from reportlab.platypus.flowables import Flowable
 
 from pdf_letter_generator.commons import ParagraphBlockStyles
+from pdf_letter_generator.commons.paragraph_cache import CachedParagraph
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -109,7 +110,7 @@ class ParagraphBlockV2:
         """
         # Clean and normalize the text
         text = text if text else ""
-        return Paragraph(text, self.stylesheet[style_name])
+        return CachedParagraph(text, self.stylesheet[style_name])
 
     def create_flowables(
         self,
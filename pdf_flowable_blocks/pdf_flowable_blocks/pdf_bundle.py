@@ -0,0 +1,307 @@
+"""
+PDF Bundle Module
+
+Builds one download out of many generated PDFs (letter, notesheet,
+annexures). Every part carries its own copy of the embedded fonts, logo and
+watermark images and Form XObjects; plain concatenation keeps them all.
+
+``PDFBundleBuilder`` appends parts one at a time, so each input can be
+released once it is added, and points every page's font and XObject
+resources at a single copy per distinct content. Objects are identified
+by a hash of their decoded stream data and their dictionary, with
+referenced objects hashed recursively. Duplicates are matched even when
+they are compressed differently, and Form XObjects match once the images
+inside them have been de-duplicated.
+
+Usage:
+    builder = PDFBundleBuilder()
+    builder.add(letter_pdf, outline_title="Letter")
+    builder.add(notesheet_pdf, outline_title="Notesheet")
+    bundle_pdf = builder.to_bytes()
+"""
+
+import hashlib
+import logging
+from io import BytesIO
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    Destination,
+    DictionaryObject,
+    Fit,
+    IndirectObject,
+    NameObject,
+    StreamObject,
+)
+
+from plugins.interactors.dms.pdf_flowable_blocks.outline import (
+    CLOSED_LEVELS,
+    nest_outline_level,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+PDFSource = Union[bytes, BinaryIO, PdfReader]
+
+# Resource categories holding embedded fonts and images
+DEDUPLICATED_RESOURCES = ("/Font", "/XObject")
+
+# Stream keys describing the encoding rather than the content
+_ENCODING_KEYS = {"/Length", "/Filter", "/DecodeParms"}
+
+
+class PDFBundleBuilder:
+    """Merges PDFs into one bundle, storing shared resources once."""
+
+    def __init__(self):
+        self.writer = PdfWriter()
+        self._canonical: Dict[str, IndirectObject] = {}
+        self._hashes: Dict[int, str] = {}
+        self.duplicates_removed = 0
+        # Requested levels and bookmarks enclosing the next nested bookmark
+        self._open_levels: List[int] = []
+        self._open_bookmarks: List[IndirectObject] = []
+
+    @property
+    def page_count(self) -> int:
+        return len(self.writer.pages)
+
+    def add(
+        self,
+        pdf: PDFSource,
+        outline_title: Optional[str] = None,
+        import_outline: bool = True,
+        outline_levels: Optional[Sequence[int]] = None,
+    ) -> None:
+        """Append all pages of a PDF.
+
+        Args:
+            pdf: PDF bytes, binary file or reader
+            outline_title: Optional bookmark for the part's first page; the
+                part's own bookmarks are nested under it
+            import_outline: Whether to keep the part's own bookmarks
+            outline_levels: Requested level of each of the part's
+                bookmarks, in order (see ``DocumentOutline``); they are then
+                nested under the still open bookmarks of the previous parts,
+                as if all parts were one document
+        """
+        try:
+            if outline_levels is not None and outline_title:
+                raise ValueError(
+                    "outline_levels cannot be combined with outline_title"
+                )
+            if isinstance(pdf, bytes):
+                pdf = BytesIO(pdf)
+            reader = pdf if isinstance(pdf, PdfReader) else PdfReader(pdf)
+
+            first_page = self.page_count
+            self.writer.append(
+                reader,
+                outline_item=outline_title,
+                import_outline=import_outline and outline_levels is None,
+            )
+            for page in self.writer.pages[first_page:]:
+                self._deduplicate_resources(page.get("/Resources"))
+
+            if outline_levels is None:
+                self._open_levels, self._open_bookmarks = [], []
+            elif import_outline:
+                self._add_nested_outline(reader, first_page, outline_levels)
+
+        except Exception as e:
+            logger.error(f"Error adding PDF to bundle: {str(e)}")
+            raise
+
+    def _add_nested_outline(
+        self, reader: PdfReader, first_page: int, levels: Sequence[int]
+    ) -> None:
+        bookmarks = list(_walk_outline(reader.outline))
+        if len(bookmarks) != len(levels):
+            raise ValueError(
+                f"Part has {len(bookmarks)} bookmarks but "
+                f"{len(levels)} outline levels"
+            )
+
+        for bookmark, level in zip(bookmarks, levels):
+            outline_level = nest_outline_level(self._open_levels, level)
+            del self._open_bookmarks[outline_level:]
+            self._open_bookmarks.append(
+                self.writer.add_outline_item(
+                    bookmark.title,
+                    first_page + reader.get_destination_page_number(bookmark),
+                    parent=(
+                        self._open_bookmarks[-1]
+                        if self._open_bookmarks
+                        else None
+                    ),
+                    fit=Fit(bookmark.typ, bookmark.dest_array[2:]),
+                    is_open=outline_level < CLOSED_LEVELS,
+                )
+            )
+
+    def stamp(self, overlay_pdf: PDFSource) -> None:
+        """Merge overlay pages (e.g. footers) onto the bundle pages, in order.
+
+        Args:
+            overlay_pdf: PDF with one overlay page per bundle page
+        """
+        if isinstance(overlay_pdf, bytes):
+            overlay_pdf = BytesIO(overlay_pdf)
+        overlay = (
+            overlay_pdf
+            if isinstance(overlay_pdf, PdfReader)
+            else PdfReader(overlay_pdf)
+        )
+        for page, overlay_page in zip(self.writer.pages, overlay.pages):
+            page.merge_page(overlay_page)
+            # Merging leaves the combined content stream uncompressed
+            page.compress_content_streams()
+            self._deduplicate_resources(page.get("/Resources"))
+
+    def _deduplicate_resources(self, resources) -> None:
+        if resources is None:
+            return
+        resources = resources.get_object()
+
+        for category in DEDUPLICATED_RESOURCES:
+            entries = resources.get(category)
+            if entries is None:
+                continue
+            entries = entries.get_object()
+
+            for name in list(entries.keys()):
+                reference = entries.raw_get(name)
+                if not isinstance(reference, IndirectObject):
+                    continue
+
+                resource = reference.get_object()
+                if resource.get("/Subtype") == "/Form":
+                    # Nested images first, so equal forms hash equal
+                    self._deduplicate_resources(resource.get("/Resources"))
+
+                canonical = self._canonical.setdefault(
+                    self._object_hash(reference), reference
+                )
+                if canonical.idnum != reference.idnum:
+                    entries[NameObject(name)] = canonical
+                    self.duplicates_removed += 1
+
+    def _object_hash(
+        self, reference: IndirectObject, visiting: Optional[Set[int]] = None
+    ) -> str:
+        cached = self._hashes.get(reference.idnum)
+        if cached is not None:
+            return cached
+
+        visiting = visiting if visiting is not None else set()
+        if reference.idnum in visiting:
+            # Reference cycle; the outer object's hash covers it
+            return "cycle"
+        visiting.add(reference.idnum)
+
+        hasher = hashlib.sha256()
+        self._update_hash(hasher, reference.get_object(), visiting)
+        digest = self._hashes[reference.idnum] = hasher.hexdigest()
+        visiting.discard(reference.idnum)
+        return digest
+
+    def _update_hash(self, hasher, value, visiting: Set[int]) -> None:
+        if isinstance(value, IndirectObject):
+            hasher.update(b"R" + self._object_hash(value, visiting).encode())
+        elif isinstance(value, StreamObject):
+            hasher.update(b"S")
+            self._update_dict_hash(hasher, value, visiting, _ENCODING_KEYS)
+            data = value.get_data()
+            hasher.update(len(data).to_bytes(8, "big"))
+            hasher.update(data)
+        elif isinstance(value, DictionaryObject):
+            hasher.update(b"D")
+            self._update_dict_hash(hasher, value, visiting, ())
+        elif isinstance(value, ArrayObject):
+            hasher.update(b"A%d" % len(value))
+            for item in value:
+                self._update_hash(hasher, item, visiting)
+        else:
+            hasher.update(b"V" + repr(value).encode())
+
+    def _update_dict_hash(self, hasher, value, visiting, skipped_keys) -> None:
+        for key in sorted(value.keys()):
+            if key in skipped_keys:
+                continue
+            hasher.update(key.encode())
+            self._update_hash(hasher, value.raw_get(key), visiting)
+
+    def write(self, output: BinaryIO) -> None:
+        """Write the bundle, dropping the de-duplicated copies.
+
+        Args:
+            output: Binary stream, e.g. a file or an HTTP response
+        """
+        try:
+            # Also removes objects no page refers to any more
+            self.writer.compress_identical_objects()
+            self.writer.write(output)
+            logger.debug(
+                f"Bundle of {self.page_count} pages shares "
+                f"{self.duplicates_removed} duplicate resources"
+            )
+
+        except Exception as e:
+            logger.error(f"Error writing PDF bundle: {str(e)}")
+            raise
+
+    def to_bytes(self) -> bytes:
+        output = BytesIO()
+        self.write(output)
+        return output.getvalue()
+
+
+def _walk_outline(outline: list) -> Iterator[Destination]:
+    # Nested lists hold the children of the bookmark before them
+    for item in outline:
+        if isinstance(item, list):
+            yield from _walk_outline(item)
+        else:
+            yield item
+
+
+def build_bundle(
+    parts: Iterable[Union[PDFSource, Tuple[str, PDFSource]]],
+    output: Optional[BinaryIO] = None,
+) -> Optional[bytes]:
+    """Merge PDFs into one bundle, consuming the parts one at a time.
+
+    Args:
+        parts: PDFs, or ``(outline_title, pdf)`` pairs, in bundle order;
+            may be a generator producing each part on demand
+        output: Optional stream to write to; bytes are returned otherwise
+
+    Returns:
+        Optional[bytes]: Bundle bytes, or None when written to ``output``
+    """
+    builder = PDFBundleBuilder()
+    for part in parts:
+        if isinstance(part, tuple):
+            outline_title, pdf = part
+            builder.add(pdf, outline_title=outline_title)
+        else:
+            builder.add(part)
+
+    if output is not None:
+        builder.write(output)
+        return None
+    return builder.to_bytes()
@@ -1,10 +1,14 @@
-import requests
+import logging
 from io import BytesIO
 from typing import List, Optional
 import qrcode
 from PIL import Image as PILImage
 from reportlab.platypus import Spacer, Image, Flowable
 from pdf_letter_generator.commons import QRCodeBlockStyles
+from pdf_letter_generator.commons.asset_fetch import asset_fetcher
+
+# Configure logging
+logger = logging.getLogger(__name__)
 
 
 class QRCodeBlock:
@@ -40,11 +44,16 @@ class QRCodeBlock:
             logo_url (str): The URL of the logo image.
 
         Returns:
-            PIL.Image.Image: The QR code with the logo overlayed.
+            PIL.Image.Image: The QR code with the logo overlayed, or without
+            it if the logo cannot be fetched.
         """
-        # Download the logo image from the URL
-        response = requests.get(logo_url)
-        logo = PILImage.open(BytesIO(response.content))
+        # Download the logo image from the URL; bounded by the fetcher's
+        # timeouts, and skipped at once while its host is failing
+        try:
+            logo = PILImage.open(BytesIO(asset_fetcher.fetch(logo_url)))
+        except Exception as e:
+            logger.error(f"Error fetching QR code logo {logo_url}: {str(e)}")
+            return qr_img
 
         # Ensure the logo has an alpha channel (RGBA)
         logo = logo.convert("RGBA")
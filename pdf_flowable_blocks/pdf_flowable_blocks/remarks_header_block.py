@@ -12,7 +12,6 @@ from reportlab.lib.enums import TA_CENTER
 from reportlab.lib.styles import ParagraphStyle, StyleSheet1
 from reportlab.platypus import (
     Flowable,
-    Image,
     KeepTogether,
     Paragraph,
     Spacer,
@@ -27,6 +26,9 @@ from pdf_letter_generator.commons import (
     PDFTextStyles,
     RemarksHeaderBlockStyles,
 )
+from pdf_letter_generator.commons.image_registry import (
+    current_image_registry,
+)
 from pdf_letter_generator.commons.logo_handler import LogoHandler
 
 # Configure logging
@@ -113,8 +115,9 @@ class RemarksHeaderBlock:
             return [Spacer(1, 1)]
 
         try:
-            # Create Image flowable with proper scaling
-            img = Image(logo_url)
+            # Create Image flowable with proper scaling; the logo is fetched
+            # and embedded once per document
+            img = current_image_registry().image(logo_url)
             aspect = img.imageHeight / float(img.imageWidth)
             img.drawWidth = width
             img.drawHeight = width * aspect
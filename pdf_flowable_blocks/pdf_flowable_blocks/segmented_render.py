@@ -0,0 +1,230 @@
+"""
+Segmented Render Module for PDF Generation
+
+Large bundles (letter, conditions, annexure tables, photo sheets) are
+sequences of independent sections, yet a single ``doc.build`` lays them out
+one after the other on one core. This module splits a block DTO list at
+page and section breaks, renders every segment in a separate worker
+process and merges the results:
+
+- bookmarks of every segment are kept, pointing at the merged pages and
+  nested across segments as in a single build (e.g. annexures under the
+  letter)
+- footers and running headers are stamped after merging, so "Page X of Y"
+  counts pages across the whole bundle
+- objects repeated by every segment (watermark and logo images, fonts)
+  are stored once in the merged output
+
+Segment DTOs are sent to worker processes, so they must be picklable
+(materialise row iterators before calling).
+"""
+
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from io import BytesIO
+from typing import Any, List, Optional, Sequence
+
+from plugins.interactors.dms.pdf_blocks.pdf_config import PDFConfig
+from plugins.interactors.dms.pdf_flowable_blocks.block_registry import warm_up
+from plugins.interactors.dms.pdf_flowable_blocks.break_block import (
+    is_break_block,
+)
+from plugins.interactors.dms.pdf_flowable_blocks.footer_block import (
+    FooterBlock,
+    PDFFooterBlockDTO,
+    is_running_text_block,
+)
+from plugins.interactors.dms.pdf_flowable_blocks.pdf_bundle import (
+    PDFBundleBuilder,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def split_segments(block_dtos: Sequence[Any]) -> List[List[Any]]:
+    """Split block DTOs at page and section breaks.
+
+    Args:
+        block_dtos: Content block DTOs, with break blocks between sections
+
+    Returns:
+        List[List[Any]]: Non-empty segments, without the break blocks
+    """
+    segments: List[List[Any]] = [[]]
+    for block_dto in block_dtos:
+        if is_break_block(block_dto):
+            if segments[-1]:
+                segments.append([])
+            continue
+        segments[-1].append(block_dto)
+    return [segment for segment in segments if segment]
+
+
+def render_segment(
+    block_dtos: List[Any],
+    pdf_watermark_image_url: Optional[str],
+    with_outline: bool = False,
+) -> bytes:
+    """Render one segment to PDF bytes (runs in a worker process).
+
+    Args:
+        block_dtos: Content block DTOs of the segment
+        pdf_watermark_image_url: Optional watermark image URL
+        with_outline: Whether to bookmark the segment's headings
+
+    Returns:
+        bytes: PDF of the segment
+    """
+    from plugins.interactors.dms.pdf_flowable_blocks.generate_pdf import (
+        GeneratePDFWithFlowablesInteractor,
+    )
+
+    return GeneratePDFWithFlowablesInteractor().generate_pdf(
+        pdf_block_dtos=block_dtos,
+        pdf_watermark_image_url=pdf_watermark_image_url,
+        with_outline=with_outline,
+    )
+
+
+def render_footer_overlay(
+    footer_block_dtos: Sequence[PDFFooterBlockDTO], page_count: int
+) -> bytes:
+    """Render footer and running header blocks on blank pages.
+
+    Args:
+        footer_block_dtos: Footer and running header block DTOs
+        page_count: Number of pages of the merged document
+
+    Returns:
+        bytes: PDF with one transparent overlay page per document page
+    """
+    buffer = BytesIO()
+    canvas = FooterBlock(
+        footer_block_dtos,
+        page_size=PDFConfig.PAGE_SIZE,
+        margin=PDFConfig.MARGIN,
+    ).canvasmaker(buffer, pagesize=PDFConfig.PAGE_SIZE)
+    for _ in range(page_count):
+        canvas.showPage()
+    canvas.save()
+    return buffer.getvalue()
+
+
+def get_segment_outline_levels(
+    segments: Sequence[List[Any]],
+) -> List[List[int]]:
+    """Requested bookmark levels of every segment (read, not rendered).
+
+    Args:
+        segments: Block DTOs of every segment
+
+    Returns:
+        List[List[int]]: Level of every bookmark of each segment, in order
+    """
+    from plugins.interactors.dms.pdf_flowable_blocks.generate_pdf import (
+        GeneratePDFWithFlowablesInteractor,
+    )
+
+    interactor = GeneratePDFWithFlowablesInteractor()
+    return [interactor.get_outline_levels(segment) for segment in segments]
+
+
+def merge_segments(
+    segment_pdfs: Sequence[bytes],
+    footer_block_dtos: Optional[Sequence[PDFFooterBlockDTO]] = None,
+    segment_outline_levels: Optional[Sequence[Sequence[int]]] = None,
+) -> bytes:
+    """Merge rendered segments, in order, into one PDF.
+
+    Args:
+        segment_pdfs: PDF bytes of every segment
+        footer_block_dtos: Footer blocks stamped on the merged pages
+        segment_outline_levels: Requested bookmark levels of every segment,
+            to nest bookmarks across segments; without them each segment's
+            bookmarks start at the top level
+
+    Returns:
+        bytes: Merged PDF
+    """
+    try:
+        builder = PDFBundleBuilder()
+        for index, pdf_bytes in enumerate(segment_pdfs):
+            # Outlines are imported with their page references remapped;
+            # each segment outline starts at the top level on its own
+            builder.add(
+                pdf_bytes,
+                outline_levels=(
+                    segment_outline_levels[index]
+                    if segment_outline_levels is not None
+                    else None
+                ),
+            )
+
+        if footer_block_dtos:
+            builder.stamp(
+                render_footer_overlay(footer_block_dtos, builder.page_count)
+            )
+
+        # Every segment embeds the same watermark, logo and font objects
+        return builder.to_bytes()
+
+    except Exception as e:
+        logger.error(f"Error merging PDF segments: {str(e)}")
+        raise
+
+
+def render_segmented(
+    block_dtos: Sequence[Any],
+    pdf_watermark_image_url: Optional[str],
+    with_outline: bool = False,
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+) -> bytes:
+    """Render segments between breaks in parallel and merge them.
+
+    Args:
+        block_dtos: Block DTOs, including break and footer blocks
+        pdf_watermark_image_url: Optional watermark image URL
+        with_outline: Whether to bookmark headings
+        executor: Executor to render segments in, e.g. a long-lived
+            process pool; by default a pool is created for this call
+        max_workers: Worker count of the default pool
+
+    Returns:
+        bytes: Merged PDF
+    """
+    footer_block_dtos = [
+        block_dto for block_dto in block_dtos if is_running_text_block(block_dto)
+    ]
+    segments = split_segments(
+        [
+            block_dto
+            for block_dto in block_dtos
+            if not is_running_text_block(block_dto)
+        ]
+    )
+    render = partial(
+        render_segment,
+        pdf_watermark_image_url=pdf_watermark_image_url,
+        with_outline=with_outline,
+    )
+
+    if len(segments) <= 1:
+        segment_pdfs = [render(segment) for segment in segments]
+    elif executor is not None:
+        segment_pdfs = list(executor.map(render, segments))
+    else:
+        max_workers = max_workers or min(len(segments), os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=warm_up
+        ) as pool:
+            segment_pdfs = list(pool.map(render, segments))
+
+    return merge_segments(
+        segment_pdfs,
+        footer_block_dtos,
+        get_segment_outline_levels(segments) if with_outline else None,
+    )
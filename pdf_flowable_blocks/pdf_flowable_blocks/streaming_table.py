@@ -0,0 +1,286 @@
+"""
+Streaming Table Module for PDF Generation
+
+This module provides a flowable that renders very large tables from a lazy
+source (a Django queryset ``.iterator()``, a CSV reader, a generator).
+Rows are consumed in page-sized chunks and every chunk is emitted as its
+own ``Table``, so memory stays proportional to one page of rows.
+
+``MeasuredStreamingTable`` measures rows as they are pulled and cuts every
+chunk to the rows fitting the frame, so chunks are never split again.
+``StreamingTable`` takes a fixed number of rows per chunk.
+"""
+
+import logging
+from collections import deque
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from reportlab.platypus import Flowable
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Tolerance for floating point error when comparing against a height limit
+_EPSILON = 1e-6
+
+
+def iter_chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive lists of at most ``size`` items.
+
+    Args:
+        items: Source items, consumed lazily
+        size: Maximum number of items per chunk
+
+    Returns:
+        Iterator[List[Any]]: Chunks in source order
+    """
+    iterator = iter(items)
+    size = max(1, size)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_with_last(items: Iterable[Any]) -> Iterator[Tuple[Any, bool]]:
+    """Yield ``(item, is_last)`` pairs, looking one item ahead.
+
+    Args:
+        items: Source items, consumed lazily
+
+    Returns:
+        Iterator[Tuple[Any, bool]]: Items flagged with whether they are last
+    """
+    iterator = iter(items)
+    sentinel = object()
+    current = next(iterator, sentinel)
+    while current is not sentinel:
+        following = next(iterator, sentinel)
+        yield current, following is sentinel
+        current = following
+
+
+def peek(items: Iterable[Any]) -> Tuple[Optional[Any], Iterator[Any]]:
+    """Return the first item and an iterator still yielding every item.
+
+    Args:
+        items: Source items
+
+    Returns:
+        Tuple[Optional[Any], Iterator[Any]]: First item (``None`` if empty)
+        and the full iterator
+    """
+    iterator = iter(items)
+    sentinel = object()
+    first = next(iterator, sentinel)
+    if first is sentinel:
+        return None, iter(())
+
+    def _chain():
+        yield first
+        yield from iterator
+
+    return first, _chain()
+
+
+class StreamingTable(Flowable):
+    """Flowable that lays out table chunks built lazily from a row source.
+
+    The flowable never draws itself: it always asks to be split, and each
+    split hands the document the next chunk followed by the flowable itself
+    (holding the remaining rows). Only the chunk being laid out is alive.
+    """
+
+    def __init__(self, chunks: Iterable[Flowable]):
+        """Initialize the streaming table.
+
+        Args:
+            chunks: Lazily built chunk flowables (usually ``Table`` objects)
+        """
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._pending: Optional[Flowable] = None
+        self._exhausted = False
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Any],
+        chunk_rows: int,
+        build_chunk: Callable[[List[Any], int], Flowable],
+    ) -> "StreamingTable":
+        """Create a streaming table from a row source.
+
+        Args:
+            rows: Row source, consumed lazily
+            chunk_rows: Number of rows per chunk
+            build_chunk: Builds a chunk flowable from its rows; the second
+                argument is the index of the chunk's first row
+
+        Returns:
+            StreamingTable: Streaming flowable over the rows
+        """
+
+        def _chunks():
+            start = 0
+            for chunk in iter_chunks(rows, chunk_rows):
+                yield build_chunk(chunk, start)
+                start += len(chunk)
+
+        return cls(_chunks())
+
+    def _peek_chunk(self) -> Optional[Flowable]:
+        if self._pending is None and not self._exhausted:
+            self._pending = next(self._chunks, None)
+            self._exhausted = self._pending is None
+        return self._pending
+
+    def wrap(self, availWidth, availHeight):
+        if self._peek_chunk() is None:
+            return 0, 0
+        # Report more than the available height so the frame splits us
+        return availWidth, availHeight + 1
+
+    def split(self, availWidth, availHeight):
+        chunk = self._peek_chunk()
+        if chunk is None:
+            return []
+
+        _, height = chunk.wrap(availWidth, availHeight)
+        if height <= availHeight:
+            parts = [chunk]
+        else:
+            parts = chunk.split(availWidth, availHeight)
+            if not parts:
+                # Nothing fits here; retry the whole chunk in the next frame
+                return []
+
+        self._pending = None
+        # The document marks postponed flowables and raises if one is
+        # postponed twice; this flowable is reused, so reset the mark
+        self.__dict__.pop("_postponed", None)
+        return parts + [self]
+
+    def draw(self):
+        pass
+
+
+class MeasuredStreamingTable(Flowable):
+    """Streaming table whose chunks hold exactly the rows fitting a frame.
+
+    Rows are measured once as they are pulled from the source. At each split
+    the flowable takes the rows fitting the available height and hands the
+    document a table of just those rows, followed by itself, so chunk tables
+    never go through ``Table.split``. Only the rows of one frame plus one
+    look-ahead row are held.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[Any],
+        measure_row: Callable[[Any], float],
+        build_chunk: Callable[[List[Any], int], Flowable],
+        header_height: float = 0,
+        repeat_header: bool = True,
+    ):
+        """Initialize the streaming table.
+
+        Args:
+            rows: Prepared rows, consumed lazily
+            measure_row: Returns the height of a prepared row, padding
+                included
+            build_chunk: Builds the table of a list of rows; the second
+                argument is the index of the first row in the source
+            header_height: Height of the header rows
+            repeat_header: Whether every chunk starts with the header rows,
+                rather than only the first one
+        """
+        super().__init__()
+        self._rows = iter(rows)
+        self._measure_row = measure_row
+        self._build_chunk = build_chunk
+        self._header_height = header_height
+        self._repeat_header = repeat_header
+        self._start = 0
+        self._buffer: Deque[Tuple[Any, float]] = deque()
+        self._exhausted = False
+
+    def _pull(self) -> bool:
+        """Measure the next source row into the buffer, if there is one."""
+        if self._exhausted:
+            return False
+        sentinel = object()
+        row = next(self._rows, sentinel)
+        if row is sentinel:
+            self._exhausted = True
+            return False
+        self._buffer.append((row, self._measure_row(row)))
+        return True
+
+    def _has_rows(self) -> bool:
+        return bool(self._buffer) or self._pull()
+
+    def wrap(self, availWidth, availHeight):
+        if not self._has_rows():
+            return 0, 0
+        # Report more than the available height so the frame splits us
+        return availWidth, availHeight + 1
+
+    def split(self, availWidth, availHeight):
+        if not self._has_rows():
+            return []
+
+        limit = availHeight
+        if self._start == 0 or self._repeat_header:
+            limit -= self._header_height
+
+        taken, used = 0, 0.0
+        while taken < len(self._buffer) or self._pull():
+            height = self._buffer[taken][1]
+            if used + height > limit + _EPSILON:
+                break
+            used += height
+            taken += 1
+
+        if taken == 0:
+            if not getattr(self, "_postponed", False):
+                # The next row does not fit; retry in the next frame
+                return []
+            # Still no fit in a fresh frame: the row is taller than the
+            # frame, so let the table split inside it
+            taken = 1
+
+        rows = [self._buffer[index][0] for index in range(taken)]
+        chunk = self._build_chunk(rows, self._start)
+        _, height = chunk.wrap(availWidth, availHeight)
+        if height <= availHeight + _EPSILON:
+            parts = [chunk]
+        else:
+            parts = chunk.split(availWidth, availHeight)
+            if not parts:
+                # Nothing fits here; retry in the next frame
+                return []
+
+        for _ in range(taken):
+            self._buffer.popleft()
+        self._start += taken
+        # The document marks postponed flowables and raises if one is
+        # postponed twice; this flowable is reused, so reset the mark
+        self.__dict__.pop("_postponed", None)
+        if not self._has_rows():
+            return parts
+        return parts + [self]
+
+    def draw(self):
+        pass
@@ -7,14 +7,28 @@ using ReportLab's high-level components (Platypus).
 
 import logging
 from dataclasses import dataclass
-from typing import Any, List, Optional, Union
+from typing import Any, Iterable, List, Optional, Sequence, Union
 
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.lib.styles import ParagraphStyle, StyleSheet1
 from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus.tables import CellStyle
 
+from pdf_letter_generator.commons.glyph_widths import (
+    get_glyph_widths,
+    string_width,
+)
+from pdf_letter_generator.commons.paragraph_cache import CachedParagraph
 from plugins.interactors.dms.pdf_blocks.pdf_config import PDFConfig
+from plugins.interactors.dms.pdf_flowable_blocks.chunked_table import (
+    PageChunkedTable,
+    measure_row_heights,
+)
+from plugins.interactors.dms.pdf_flowable_blocks.streaming_table import (
+    MeasuredStreamingTable,
+    StreamingTable,
+)
 from plugins.pdf_letter_generator.commons.constants import (
     PDFLineSpacing,
     PDFTableSpacing,
@@ -42,6 +56,114 @@ class TableBlockStyle:
     alternate_row_background: Any = colors.whitesmoke
 
 
+@dataclass
+class ColumnarTableData:
+    """Column-oriented table input.
+
+    Each column is a list or a NumPy array of cell values. Optional style
+    columns apply per column (alignment, text color) or per row (background).
+    """
+
+    columns: List[Sequence[Any]]
+    header: Optional[List[str]] = None
+    column_alignments: Optional[List[str]] = None
+    column_text_colors: Optional[List[Any]] = None
+    row_backgrounds: Optional[Sequence[Any]] = None
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+
+# Column alignments of ColumnarTableData, as paragraph alignments
+PARAGRAPH_ALIGNMENTS = {
+    "LEFT": TA_LEFT,
+    "CENTER": TA_CENTER,
+    "CENTRE": TA_CENTER,
+    "RIGHT": TA_RIGHT,
+}
+
+# Paragraph alignments as table ALIGN values, for plain-string cells
+TABLE_ALIGNMENTS = {TA_LEFT: "LEFT", TA_CENTER: "CENTER", TA_RIGHT: "RIGHT"}
+
+# Characters that require ReportLab's markup parser
+MARKUP_CHARS = ("<", ">", "&")
+
+PRINTABLE_ASCII = "".join(map(chr, range(32, 127)))
+
+
+class ColumnarTable(Table):
+    """``Table`` whose row background colors continue across page splits.
+
+    ROWBACKGROUNDS restarts its color cycle in every part of a split table.
+    Each part here gets a ROWBACKGROUNDS command with the colors of its own
+    body rows instead, picked from the cycle by the part's row offset.
+    """
+
+    def __init__(
+        self,
+        data,
+        *args,
+        row_backgrounds: Optional[Sequence[Any]] = None,
+        first_body_row: int = 0,
+        **kwargs,
+    ):
+        """Initialize the table.
+
+        Args:
+            data: Table rows
+            *args: Further ``Table`` arguments
+            row_backgrounds: Background colors cycled through the body rows
+            first_body_row: Index of the first row below the header
+            **kwargs: Further ``Table`` keyword arguments
+        """
+        super().__init__(data, *args, **kwargs)
+        self.row_backgrounds = row_backgrounds
+        self.first_body_row = first_body_row
+        self.row_offset = 0
+        self._set_row_backgrounds()
+
+    def _set_row_backgrounds(self) -> None:
+        if not self.row_backgrounds:
+            return
+        cycle = self.row_backgrounds
+        body_rows = self._nrows - self.first_body_row
+        self.setStyle(
+            [
+                (
+                    "ROWBACKGROUNDS",
+                    (0, self.first_body_row),
+                    (-1, -1),
+                    [
+                        cycle[(self.row_offset + row) % len(cycle)]
+                        for row in range(body_rows)
+                    ],
+                )
+            ]
+        )
+
+    def split(self, availWidth, availHeight):
+        parts = super().split(availWidth, availHeight)
+        if len(parts) != 2 or not self.row_backgrounds:
+            return parts
+
+        # Parts are created by Table itself, with the parent's command
+        first_body_rows = (self.first_body_row, parts[1].repeatRows or 0)
+        row_offset = self.row_offset
+        for part, first_body_row in zip(parts, first_body_rows):
+            part._bkgrndcmds = [
+                command
+                for command in part._bkgrndcmds
+                if command[0] != "ROWBACKGROUNDS"
+            ]
+            part.row_backgrounds = self.row_backgrounds
+            part.first_body_row = first_body_row
+            part.row_offset = row_offset
+            part._set_row_backgrounds()
+            row_offset += part._nrows - first_body_row
+        return parts
+
+
 class TableBlockV2:
     """Class to handle the creation and management of PDF table blocks using Platypus."""
 
@@ -168,7 +290,7 @@ class TableBlockV2:
                 # Use header style for first row, cell style for others
                 style_name = "table_cell"
                 cell_text = str(cell) if cell is not None else ""
-                para = Paragraph(
+                para = CachedParagraph(
                     sanitize(cell_text), self.stylesheet[style_name]
                 )
                 processed_row.append(para)
@@ -249,24 +371,500 @@ class TableBlockV2:
 
         return TableStyle(commands)
 
+    @staticmethod
+    def _column_values(column: Sequence[Any]) -> List[Any]:
+        """Return column values as a list (NumPy arrays via ``tolist``)."""
+        to_list = getattr(column, "tolist", None)
+        return to_list() if to_list else list(column)
+
+    def _column_paragraph_style(
+        self,
+        column: int,
+        data: ColumnarTableData,
+    ) -> ParagraphStyle:
+        """Return the body cell style of one column.
+
+        The table cell style, with the column's alignment and text color
+        applied when given; one style per column, not per cell.
+
+        Args:
+            column: Column index
+            data: Columnar table data
+
+        Returns:
+            ParagraphStyle: Style for the column's body cells
+        """
+        cell_style = self.stylesheet["table_cell"]
+        alignments = data.column_alignments or []
+        text_colors = data.column_text_colors or []
+        alignment = alignments[column] if column < len(alignments) else None
+        text_color = text_colors[column] if column < len(text_colors) else None
+        if not alignment and text_color is None:
+            return cell_style
+
+        return ParagraphStyle(
+            f"table_cell_{column}",
+            parent=cell_style,
+            alignment=(
+                PARAGRAPH_ALIGNMENTS[alignment.upper()]
+                if alignment
+                else cell_style.alignment
+            ),
+            textColor=(
+                text_color if text_color is not None else cell_style.textColor
+            ),
+        )
+
+    def _prepare_column_cells(
+        self,
+        values: List[Any],
+        paragraph_style: ParagraphStyle,
+        inner_width: float,
+    ) -> List[Union[str, Paragraph]]:
+        """Prepare one column, without a paragraph per plain-text cell.
+
+        Text that needs no markup parsing and fits on one line is kept as a
+        string; the table draws it with column commands matching the
+        paragraph style. Other cells become paragraphs, as in
+        _prepare_table_data.
+
+        Args:
+            values: Raw column values
+            paragraph_style: Style of the column's cells
+            inner_width: Column width minus cell padding
+
+        Returns:
+            List[Union[str, Paragraph]]: Cell strings and paragraphs
+        """
+        font_name = paragraph_style.fontName
+        font_size = paragraph_style.fontSize
+        # ASCII text this short fits even in the widest printable glyph
+        widest = max(get_glyph_widths(font_name).advances(PRINTABLE_ASCII))
+        fitting_length = int(inner_width * 1000 / (widest * font_size))
+
+        # Empty paragraphs add no height, unlike empty strings; one shared
+        # paragraph serves every empty cell of the column
+        empty_cell = CachedParagraph("", paragraph_style)
+
+        cells = []
+        for value in values:
+            text = sanitize(str(value) if value is not None else "")
+            if not text:
+                cells.append(empty_cell)
+            elif (
+                any(char in text for char in MARKUP_CHARS)
+                # Paragraphs collapse whitespace; strings keep it
+                or " ".join(text.split()) != text
+                or not (len(text) <= fitting_length and text.isascii())
+                and string_width(text, font_name, font_size) > inner_width
+            ):
+                cells.append(CachedParagraph(text, paragraph_style))
+            else:
+                cells.append(text)
+        return cells
+
+    def _create_columnar_table_style(
+        self,
+        column_styles: List[ParagraphStyle],
+        style: TableBlockStyle,
+        has_header: bool,
+    ) -> TableStyle:
+        """Create table style for columnar data.
+
+        Body cells are styled per column, matching the column's paragraph
+        style, so string cells draw like paragraphs; the table settings of
+        _create_table_style apply to the header row only, as every command
+        is applied cell by cell. Row backgrounds are set by ColumnarTable.
+
+        Args:
+            column_styles: Paragraph style of each column's body cells
+            style: Table style
+            has_header: Whether the first row is a header
+
+        Returns:
+            TableStyle: Configured table style
+        """
+        header = self.DEFAULT_STYLES["header"]
+        first_body_row = 1 if has_header else 0
+        commands = [
+            ("TOPPADDING", (0, 0), (-1, -1), style.cell_padding),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), style.cell_padding),
+            ("LEFTPADDING", (0, 0), (-1, -1), style.cell_padding),
+            ("RIGHTPADDING", (0, 0), (-1, -1), style.cell_padding),
+            ("GRID", (0, 0), (-1, -1), style.grid_width, style.grid_color),
+            (
+                "INNERGRID",
+                (0, 0),
+                (-1, -1),
+                style.grid_width,
+                style.grid_color,
+            ),
+            ("BOX", (0, 0), (-1, -1), style.grid_width, style.grid_color),
+        ]
+        if has_header:
+            commands += [
+                ("VALIGN", (0, 0), (-1, 0), "MIDDLE"),
+                ("FONTNAME", (0, 0), (-1, 0), header.font),
+                ("FONTSIZE", (0, 0), (-1, 0), header.size),
+                ("TEXTCOLOR", (0, 0), (-1, 0), header.color),
+                ("BACKGROUND", (0, 0), (-1, 0), style.header_background),
+                ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+            ]
+
+        for column, paragraph_style in enumerate(column_styles):
+            cells = ((column, first_body_row), (column, -1))
+            commands += [
+                ("FONTNAME", *cells, paragraph_style.fontName),
+                ("FONTSIZE", *cells, paragraph_style.fontSize),
+                ("LEADING", *cells, paragraph_style.leading),
+                ("TEXTCOLOR", *cells, paragraph_style.textColor),
+                (
+                    "ALIGN",
+                    *cells,
+                    TABLE_ALIGNMENTS.get(paragraph_style.alignment, "LEFT"),
+                ),
+                ("VALIGN", *cells, "MIDDLE"),
+            ]
+
+        return TableStyle(commands)
+
+    def create_columnar_table_flowables(
+        self,
+        data: ColumnarTableData,
+        heading: Optional[str] = None,
+        column_widths: Optional[List[float]] = None,
+        style: Optional[TableBlockStyle] = None,
+        repeat_header: bool = True,
+        split_rows: bool = True,
+    ) -> List[Union[Paragraph, Table, Spacer]]:
+        """Create table block flowables from column-oriented data.
+
+        Cells render as the same data passed as rows to
+        create_table_flowables. Plain text fitting its column is drawn as
+        a string, without a paragraph per cell; columns share one style.
+
+        Args:
+            data: Columnar table data
+            heading: Optional table title
+            column_widths: Optional list of column width percentages
+            style: Optional custom style
+            repeat_header: Whether to repeat the header row on new pages
+            split_rows: Whether to allow row splits across pages
+
+        Returns:
+            List[Union[Paragraph, Table, Spacer]]: List of flowable objects
+
+        Raises:
+            ValueError: If columns have different lengths
+        """
+        try:
+            style = style or self.DEFAULT_STYLES["body"]
+            flowables = []
+            available_width = PDFConfig.get_page_width() - (
+                2 * PDFConfig.MARGIN
+            )
+
+            if heading:
+                flowables.append(
+                    CachedParagraph(heading, self.stylesheet["table_title"])
+                )
+
+            if not data.columns:
+                return flowables
+
+            columns = [self._column_values(column) for column in data.columns]
+            if len({len(column) for column in columns}) > 1:
+                raise ValueError("All table columns must have the same length")
+
+            col_widths = self._calculate_column_widths(
+                available_width, columns, column_widths
+            )
+            column_styles = [
+                self._column_paragraph_style(col, data)
+                for col in range(len(columns))
+            ]
+            prepared_columns = [
+                self._prepare_column_cells(
+                    values,
+                    column_style,
+                    col_width - 2 * style.cell_padding,
+                )
+                for values, column_style, col_width in zip(
+                    columns, column_styles, col_widths
+                )
+            ]
+
+            table_rows = [list(row) for row in zip(*prepared_columns)]
+            has_header = bool(data.header)
+            if has_header:
+                table_rows[:0] = self._prepare_table_data([data.header], style)
+
+            if not table_rows:
+                return flowables
+
+            row_backgrounds = (
+                self._column_values(data.row_backgrounds)
+                if data.row_backgrounds is not None
+                else []
+            ) or [style.alternate_row_background, style.row_background]
+            # Body cells of a column share one cell style; the column
+            # commands below set the same values for all of them anyway
+            body_cell_styles = [
+                CellStyle(f"table_column_{col}") for col in range(len(columns))
+            ]
+            cell_styles = [body_cell_styles] * data.num_rows
+            if has_header:
+                cell_styles.insert(
+                    0, [CellStyle("table_header") for _ in columns]
+                )
+            table = ColumnarTable(
+                table_rows,
+                colWidths=col_widths,
+                repeatRows=1 if has_header and repeat_header else 0,
+                splitByRow=split_rows,
+                cellStyles=cell_styles,
+                row_backgrounds=row_backgrounds,
+                first_body_row=1 if has_header else 0,
+            )
+            table.setStyle(
+                self._create_columnar_table_style(
+                    column_styles, style, has_header
+                )
+            )
+
+            flowables.append(table)
+            flowables.append(Spacer(1, PDFTableSpacing.TABLE_BLOCK_SPACING))
+
+            return flowables
+
+        except Exception as e:
+            logger.error(f"Error creating columnar table flowables: {str(e)}")
+            raise
+
+    def _create_chunk_table(
+        self,
+        header_rows: List[List[Paragraph]],
+        body_rows: List[List[Paragraph]],
+        start: int,
+        col_widths: List[float],
+        style: Optional[TableBlockStyle],
+        split_rows: bool,
+    ) -> Table:
+        """Create the ``Table`` of one chunk of a chunked or streamed table.
+
+        Alternating row backgrounds continue across chunks as in a single
+        table.
+
+        Args:
+            header_rows: Header rows of the chunk, if any
+            body_rows: Body rows of the chunk
+            start: Index of the chunk's first row among all body rows
+            col_widths: Column widths
+            style: Optional custom style
+            split_rows: Whether to allow row splits across pages
+
+        Returns:
+            Table: Table of the chunk
+        """
+        body_style = style or self.DEFAULT_STYLES["body"]
+        table = Table(
+            header_rows + body_rows,
+            colWidths=col_widths,
+            repeatRows=len(header_rows),
+            splitByRow=split_rows,
+        )
+        table_style = self._create_table_style(style, row_count=0)
+        # Body row ``start`` is row ``start + 1`` of the whole table, and
+        # odd rows of the whole table use the alternate background
+        row_backgrounds = [
+            body_style.row_background,
+            body_style.alternate_row_background,
+        ]
+        if start % 2 == 0:
+            row_backgrounds.reverse()
+        table_style.add(
+            "ROWBACKGROUNDS",
+            (0, len(header_rows)),
+            (-1, -1),
+            row_backgrounds,
+        )
+        table.setStyle(table_style)
+        return table
+
+    def _create_streaming_table(
+        self,
+        rows: Iterable[List[Any]],
+        column_widths: Optional[List[float]],
+        style: Optional[TableBlockStyle],
+        repeat_header: bool,
+        split_rows: bool,
+        chunk_rows: Optional[int],
+    ) -> Optional[Union[MeasuredStreamingTable, StreamingTable]]:
+        """Create a streaming table from a row iterator.
+
+        The first row is the header. Body rows are measured as they are
+        consumed, and each chunk becomes its own ``Table`` holding the rows
+        that fit the frame (with the header row repeated when
+        ``repeat_header`` is set).
+
+        Args:
+            rows: Row iterator; the first row is the header
+            column_widths: Optional list of column width percentages
+            style: Optional custom style
+            repeat_header: Whether to repeat the header row in every chunk
+            split_rows: Whether to allow row splits across pages
+            chunk_rows: Optional fixed number of body rows per chunk, split
+                by the table when they do not fit a page
+
+        Returns:
+            Optional[Union[MeasuredStreamingTable, StreamingTable]]:
+            Streaming flowable, or None if empty
+        """
+        rows = iter(rows)
+        header_row = next(rows, None)
+        if header_row is None:
+            return None
+
+        body_style = style or self.DEFAULT_STYLES["body"]
+        available_width = PDFConfig.get_page_width() - (2 * PDFConfig.MARGIN)
+        col_widths = self._calculate_column_widths(
+            available_width, header_row, column_widths
+        )
+        processed_header = self._prepare_table_data([header_row], style)
+
+        def _header_rows(start: int) -> List[List[Paragraph]]:
+            return processed_header if start == 0 or repeat_header else []
+
+        if chunk_rows:
+
+            def _build_fixed_chunk(chunk: List[List[Any]], start: int) -> Table:
+                return self._create_chunk_table(
+                    _header_rows(start),
+                    self._prepare_table_data(chunk, style),
+                    start,
+                    col_widths,
+                    style,
+                    split_rows,
+                )
+
+            return StreamingTable.from_rows(
+                rows, chunk_rows, _build_fixed_chunk
+            )
+
+        inner_widths = [
+            col_width - 2 * body_style.cell_padding for col_width in col_widths
+        ]
+        vertical_padding = 2 * body_style.cell_padding
+
+        def _measure(row: List[Paragraph]) -> float:
+            return measure_row_heights([row], inner_widths, vertical_padding)[0]
+
+        def _build_chunk(chunk: List[List[Paragraph]], start: int) -> Table:
+            return self._create_chunk_table(
+                _header_rows(start), chunk, start, col_widths, style, split_rows
+            )
+
+        return MeasuredStreamingTable(
+            (self._prepare_table_data([row], style)[0] for row in rows),
+            _measure,
+            _build_chunk,
+            header_height=_measure(processed_header[0]),
+            repeat_header=repeat_header,
+        )
+
+    def _create_page_chunked_table(
+        self,
+        table_data: List[List[Any]],
+        column_widths: Optional[List[float]],
+        style: Optional[TableBlockStyle],
+        repeat_header: bool,
+        split_rows: bool,
+    ) -> PageChunkedTable:
+        """Create a table laid out as one pre-measured ``Table`` per page.
+
+        The first row is the header. Row heights are measured once, and
+        alternating row backgrounds continue across chunks as in a single
+        table.
+
+        Args:
+            table_data: Table data as list of lists; the first row is the
+                header
+            column_widths: Optional list of column width percentages
+            style: Optional custom style
+            repeat_header: Whether to repeat the header row in every chunk
+            split_rows: Whether to allow row splits across pages
+
+        Returns:
+            PageChunkedTable: Chunked flowable over the body rows
+        """
+        body_style = style or self.DEFAULT_STYLES["body"]
+        available_width = PDFConfig.get_page_width() - (2 * PDFConfig.MARGIN)
+        col_widths = self._calculate_column_widths(
+            available_width, table_data[0], column_widths
+        )
+        processed_data = self._prepare_table_data(table_data, style)
+        processed_header, processed_body = processed_data[:1], processed_data[1:]
+
+        inner_widths = [
+            col_width - 2 * body_style.cell_padding for col_width in col_widths
+        ]
+        vertical_padding = 2 * body_style.cell_padding
+        header_height = measure_row_heights(
+            processed_header, inner_widths, vertical_padding
+        )[0]
+        row_heights = measure_row_heights(
+            processed_body, inner_widths, vertical_padding
+        )
+
+        def _build_chunk(start: int, end: int) -> Table:
+            return self._create_chunk_table(
+                processed_header if start == 0 or repeat_header else [],
+                processed_body[start:end],
+                start,
+                col_widths,
+                style,
+                split_rows,
+            )
+
+        return PageChunkedTable(
+            row_heights,
+            header_height,
+            sum(col_widths),
+            _build_chunk,
+            repeat_header=repeat_header,
+        )
+
     def create_table_flowables(
         self,
         heading: Optional[str] = None,
-        table_data: List[List[Any]] = None,
+        table_data: Union[List[List[Any]], Iterable[List[Any]]] = None,
         column_widths: Optional[List[float]] = None,
         style: Optional[TableBlockStyle] = None,
         repeat_header: bool = True,
         split_rows: bool = True,
+        chunk_rows: Optional[int] = None,
+        page_chunked: bool = False,
     ) -> List[Union[Paragraph, Table, Spacer]]:
         """Create table block flowables.
 
         Args:
             heading: Optional table title
-            table_data: Table data as list of lists
+            table_data: Table data as list of lists, or a row iterator
+                (e.g. a queryset ``.iterator()`` or CSV reader) that is
+                consumed lazily in page-sized chunks
             column_widths: Optional list of column width percentages
             style: Optional custom style
             repeat_header: Whether to repeat header on new pages
             split_rows: Whether to allow row splits across pages
+            chunk_rows: Optional fixed number of body rows per chunk when
+                streaming; by default each chunk holds the measured rows
+                fitting the frame
+            page_chunked: Whether to measure rows once and emit one table
+                per page, instead of one table split at every page break;
+                recommended for tables spanning many pages. Unlike the
+                single table, the header row is repeated on every page
+                (unless repeat_header is False), so the layout and page
+                count differ from the single-table output
 
         Returns:
             List[Union[Paragraph, Table, Spacer]]: List of flowable objects
@@ -286,12 +884,43 @@ class TableBlockV2:
             # Add heading if provided
             if heading:
                 flowables.append(
-                    Paragraph(heading, self.stylesheet["table_title"])
+                    CachedParagraph(heading, self.stylesheet["table_title"])
+                )
+
+            if table_data is not None and not isinstance(
+                table_data, (list, tuple)
+            ):
+                streaming_table = self._create_streaming_table(
+                    table_data,
+                    column_widths,
+                    style,
+                    repeat_header,
+                    split_rows,
+                    chunk_rows,
                 )
+                if streaming_table:
+                    flowables.append(streaming_table)
+                    flowables.append(
+                        Spacer(1, PDFTableSpacing.TABLE_BLOCK_SPACING)
+                    )
+                return flowables
 
             if not table_data:
                 return flowables
 
+            if page_chunked and len(table_data) > 1:
+                flowables.append(
+                    self._create_page_chunked_table(
+                        table_data,
+                        column_widths,
+                        style,
+                        repeat_header,
+                        split_rows,
+                    )
+                )
+                flowables.append(Spacer(1, PDFTableSpacing.TABLE_BLOCK_SPACING))
+                return flowables
+
             # Calculate column widths
             col_widths = self._calculate_column_widths(
                 available_width, table_data[0], column_widths
@@ -0,0 +1,789 @@
+"""
+Pooled S3/HTTP Asset Fetching
+
+Images, logos and signatures are fetched from S3 or over HTTP while a PDF
+is built. Creating a boto3 client per block costs tens of milliseconds plus
+credential resolution, and fetching one URL after another leaves most of a
+photo sheet's build time waiting on the network. ``AssetFetcher`` keeps, per
+process:
+
+- one S3 client and one HTTP session, with connection pools sized by
+  ``max_connections``
+- a thread pool for ``fetch_many``, which fetches many URLs concurrently
+
+S3 URLs are recognised in the ``s3://bucket/key``, virtual-hosted
+(``bucket.s3[.-]region.amazonaws.com/key``) and path-style
+(``s3[.-]region.amazonaws.com/bucket/key``) forms; everything else is
+fetched over HTTP. Clients are created on first use and again after a
+fork, so worker processes never share connections.
+
+Logos and watermarks rarely change, so fetched bytes are cached (up to
+``cache_bytes``) with their ``ETag`` and ``Last-Modified`` validators. A
+cached asset older than ``max_age`` seconds is revalidated with a
+conditional request (``If-None-Match``/``If-Modified-Since``, or their
+S3 ``get_object`` equivalents); "not modified" serves the cached bytes.
+With ``stale_while_revalidate`` the cached bytes are served at once and
+revalidated in the background, so renders never wait on it.
+
+When the media bucket is slow or refusing requests, waiting out a timeout
+per image slows every render to a crawl. So failures are remembered:
+
+- a URL that failed is not requested again for ``negative_ttl`` seconds
+- a host (or S3 bucket) with ``failure_threshold`` consecutive failures is
+  short-circuited for ``reset_timeout`` seconds, after which one trial
+  request decides whether it has recovered
+
+Both raise ``AssetUnavailable`` at once, so blocks fall back to their
+placeholders without waiting. ``stats()`` counts breaker trips, recoveries
+and short-circuited fetches.
+
+Tests can inject a client, e.g. one backed by moto, through ``s3_client``.
+
+Usage:
+    from pdf_letter_generator.commons.asset_fetch import asset_fetcher
+
+    logo_bytes = asset_fetcher.fetch(logo_url)
+    photos = asset_fetcher.fetch_many(photo_urls, return_exceptions=True)
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import unquote, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 16
+DEFAULT_TIMEOUT = 30
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+DEFAULT_NEGATIVE_TTL = 30
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30
+
+# Failed URLs remembered at most
+_MAX_NEGATIVE_ENTRIES = 1024
+
+# bucket.s3.amazonaws.com, bucket.s3.ap-south-1.amazonaws.com,
+# bucket.s3-ap-south-1.amazonaws.com
+_VIRTUAL_HOSTED = re.compile(
+    r"^(?P<bucket>.+)\.s3(?:[.-](?:dualstack\.)?[a-z0-9-]+)?\.amazonaws\.com$"
+)
+# s3.amazonaws.com/bucket/key, s3.ap-south-1.amazonaws.com/bucket/key
+_PATH_STYLE = re.compile(
+    r"^s3(?:[.-](?:dualstack\.)?[a-z0-9-]+)?\.amazonaws\.com$"
+)
+
+# Sources fetched through the pools; anything else is a local path
+URL_PREFIXES = ("s3://", "http://", "https://")
+
+# S3 errors after which an https URL is not retried as a plain download;
+# other failures (no credentials, access denied on a public object) are
+# retried over HTTP
+_S3_MISSING_CODES = ("NoSuchKey", "NoSuchBucket", "404")
+_S3_NOT_MODIFIED_CODES = ("304", "NotModified")
+
+
+@dataclass
+class CachedAsset:
+    """Fetched bytes with the validators to revalidate them."""
+
+    data: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None  # HTTP-date
+    checked_at: float = 0.0  # time.monotonic() of the last fetch
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class AssetUnavailable(Exception):
+    """Raised without a request for a URL or host that is failing."""
+
+    def __init__(self, url: str, reason: str):
+        super().__init__(f"{url} unavailable: {reason}")
+        self.url = url
+        self.reason = reason
+
+
+@dataclass
+class _HostState:
+    failures: int = 0
+    opened_at: Optional[float] = None
+    trial_running: bool = False
+
+
+class HostCircuitBreaker:
+    """Fails fast for hosts whose recent requests all failed."""
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ):
+        """
+        :param failure_threshold: Consecutive failures that open the circuit
+        :param reset_timeout: Seconds before an open circuit lets one trial
+            request through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.trips = 0
+        self.recoveries = 0
+        self.short_circuits = 0
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host: str) -> bool:
+        """
+        Tell whether a request to a host may be made now
+
+        :param host: Host name or S3 bucket
+        :return: False while the host's circuit is open
+        """
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state.opened_at is None:
+                return True
+            if (
+                not state.trial_running
+                and time.monotonic() - state.opened_at >= self.reset_timeout
+            ):
+                # Half-open: this request decides
+                state.trial_running = True
+                return True
+            self.short_circuits += 1
+            return False
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            state = self._hosts.pop(host, None)
+            if state is not None and state.opened_at is not None:
+                self.recoveries += 1
+                logger.info(f"Asset host {host} recovered")
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            state = self._hosts.setdefault(host, _HostState())
+            state.failures += 1
+            state.trial_running = False
+            if state.opened_at is not None:
+                state.opened_at = time.monotonic()
+            elif state.failures >= self.failure_threshold:
+                state.opened_at = time.monotonic()
+                self.trips += 1
+                logger.warning(
+                    f"Asset host {host} failed {state.failures} times; "
+                    f"skipping it for {self.reset_timeout}s"
+                )
+
+    def open_hosts(self) -> List[str]:
+        with self._lock:
+            return [
+                host
+                for host, state in self._hosts.items()
+                if state.opened_at is not None
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+            self.trips = self.recoveries = self.short_circuits = 0
+
+
+def _host_of(url: str) -> str:
+    s3_location = parse_s3_url(url)
+    if s3_location is not None:
+        return f"s3://{s3_location[0]}"
+    return urlparse(url).netloc
+
+
+def _error_code(error: Exception) -> Optional[str]:
+    """S3 error code, or HTTP status as a string, of a failed fetch."""
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code")
+    status_code = getattr(response, "status_code", None)
+    return str(status_code) if status_code is not None else None
+
+
+def is_remote_url(source: str) -> bool:
+    """
+    Tell whether an image source is fetched over S3/HTTP or read from disk
+
+    :param source: URL or local path
+    :return: True for S3 and HTTP(S) URLs
+    """
+    return source.startswith(URL_PREFIXES)
+
+
+def parse_s3_url(url: str) -> Optional[Tuple[str, str]]:
+    """
+    Extract the bucket and key of an S3 URL
+
+    :param url: URL in s3://, virtual-hosted or path-style form
+    :return: Bucket and key, or None if the URL is not an S3 URL
+    """
+    parsed = urlparse(url)
+    path = unquote(parsed.path).lstrip("/")
+    host = (parsed.hostname or "").lower()
+
+    if parsed.scheme == "s3":
+        return (parsed.netloc, path) if parsed.netloc and path else None
+
+    match = _VIRTUAL_HOSTED.match(host)
+    if match and path:
+        return match.group("bucket"), path
+
+    if _PATH_STYLE.match(host) and "/" in path:
+        bucket, key = path.split("/", 1)
+        return bucket, key
+
+    return None
+
+
+class AssetFetcher:
+    """Process-wide S3/HTTP fetcher with pooled connections."""
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: float = DEFAULT_TIMEOUT,
+        s3_client: Any = None,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+        max_age: float = 0,
+        stale_while_revalidate: bool = False,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        breaker: Optional[HostCircuitBreaker] = None,
+    ):
+        """
+        :param max_connections: Size of the S3 and HTTP connection pools and
+            of the ``fetch_many`` thread pool
+        :param timeout: Read timeout in seconds
+        :param s3_client: Optional S3 client to use instead of a default one
+        :param cache_bytes: Total size of cached assets; 0 disables caching
+        :param max_age: Seconds a cached asset is served without
+            revalidation
+        :param stale_while_revalidate: Serve expired cached assets at once
+            and revalidate them in the background
+        :param connect_timeout: Connection timeout in seconds
+        :param negative_ttl: Seconds a failed URL is not requested again;
+            0 disables the negative cache
+        :param breaker: Per-host circuit breaker; a default one if omitted
+        """
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.negative_ttl = negative_ttl
+        self.breaker = breaker or HostCircuitBreaker()
+        self.negative_hits = 0
+        self._failed: "OrderedDict[str, float]" = OrderedDict()
+        self.cache_bytes = cache_bytes
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self.hits = 0
+        self.not_modified = 0
+        self.misses = 0
+        self._s3_client = s3_client
+        self._injected_s3_client = s3_client is not None
+        self._session: Optional[requests.Session] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, CachedAsset]" = OrderedDict()
+        self._cached_bytes = 0
+        self._revalidating: Set[str] = set()
+        self._cache_lock = threading.Lock()
+
+    def configure(
+        self,
+        max_connections: Optional[int] = None,
+        timeout: Optional[float] = None,
+        s3_client: Any = None,
+        cache_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        stale_while_revalidate: Optional[bool] = None,
+        connect_timeout: Optional[float] = None,
+        negative_ttl: Optional[float] = None,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Change the pool size, timeouts, S3 client or caching
+
+        :param max_connections: New connection and thread pool size; pools
+            are recreated on next use
+        :param timeout: New read timeout in seconds; S3 clients are
+            recreated on next use
+        :param s3_client: S3 client to use, e.g. one backed by moto
+        :param cache_bytes: New total size of cached assets
+        :param max_age: Seconds a cached asset is served without
+            revalidation
+        :param stale_while_revalidate: Serve expired cached assets at once
+            and revalidate them in the background
+        :param connect_timeout: New connection timeout in seconds
+        :param negative_ttl: Seconds a failed URL is not requested again
+        :param failure_threshold: Consecutive failures that short-circuit a
+            host
+        :param reset_timeout: Seconds a short-circuited host is skipped
+        """
+        if negative_ttl is not None:
+            self.negative_ttl = negative_ttl
+        if failure_threshold is not None:
+            self.breaker.failure_threshold = failure_threshold
+        if reset_timeout is not None:
+            self.breaker.reset_timeout = reset_timeout
+        if cache_bytes is not None:
+            self.cache_bytes = cache_bytes
+            self._evict()
+        if max_age is not None:
+            self.max_age = max_age
+        if stale_while_revalidate is not None:
+            self.stale_while_revalidate = stale_while_revalidate
+        with self._lock:
+            if max_connections is not None:
+                self.max_connections = max_connections
+                self._close_pools()
+                if not self._injected_s3_client:
+                    self._s3_client = None
+            if timeout is not None or connect_timeout is not None:
+                if timeout is not None:
+                    self.timeout = timeout
+                if connect_timeout is not None:
+                    self.connect_timeout = connect_timeout
+                if not self._injected_s3_client:
+                    self._s3_client = None
+            if s3_client is not None:
+                self._s3_client = s3_client
+                self._injected_s3_client = True
+
+    def _close_pools(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        if self._session is not None:
+            self._session.close()
+        self._executor = self._session = None
+
+    def _after_fork(self) -> None:
+        # Pools and sockets inherited from the parent must not be reused
+        self._lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._revalidating = set()
+        self.breaker._lock = threading.Lock()
+        self._executor = self._session = None
+        if not self._injected_s3_client:
+            self._s3_client = None
+
+    @property
+    def s3_client(self):
+        with self._lock:
+            if self._s3_client is None:
+                import boto3
+                from botocore.config import Config
+
+                self._s3_client = boto3.client(
+                    "s3",
+                    config=Config(
+                        max_pool_connections=self.max_connections,
+                        connect_timeout=self.connect_timeout,
+                        read_timeout=self.timeout,
+                        # The breaker handles failing hosts; do not wait
+                        # out several retries per image
+                        retries={"max_attempts": 2},
+                    ),
+                )
+            return self._s3_client
+
+    @property
+    def session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.max_connections,
+                    pool_maxsize=self.max_connections,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_connections,
+                    thread_name_prefix="asset-fetch",
+                )
+            return self._executor
+
+    def fetch(self, url: str, timeout: Optional[float] = None) -> bytes:
+        """
+        Fetch the bytes of an S3 object or HTTP resource
+
+        Cached bytes are served while fresh and revalidated after that.
+
+        :param url: S3 or HTTP(S) URL
+        :param timeout: Read timeout for this request; S3 requests use the
+            client's
+        :return: Content bytes
+        :raises AssetUnavailable: If the URL failed recently or its host is
+            short-circuited
+        :raises Exception: If the fetch fails
+        """
+        return self.fetch_asset(url, timeout=timeout).data
+
+    def fetch_asset(
+        self, url: str, timeout: Optional[float] = None
+    ) -> CachedAsset:
+        """
+        Fetch like ``fetch``, with the ETag and Last-Modified of the bytes
+
+        :param url: S3 or HTTP(S) URL
+        :param timeout: Read timeout for this request
+        :return: Content bytes and their validators
+        :raises Exception: If the fetch fails, as for ``fetch``
+        """
+        with self._cache_lock:
+            cached = self._cache.get(url)
+            if cached is not None:
+                self._cache.move_to_end(url)
+
+        if cached is None:
+            with self._cache_lock:
+                self.misses += 1
+            return self._store(url, self._fetch(url, timeout=timeout))
+
+        if time.monotonic() - cached.checked_at < self.max_age:
+            with self._cache_lock:
+                self.hits += 1
+            return cached
+
+        if self.stale_while_revalidate:
+            self._revalidate_in_background(url, cached)
+            return cached
+
+        return self._revalidate(url, cached, timeout)
+
+    def fetch_prefix(
+        self, url: str, size: int, timeout: Optional[float] = None
+    ) -> bytes:
+        """
+        Fetch at most the first ``size`` bytes, e.g. to read a file header
+
+        Uses a ranged S3 ``get_object`` or an HTTP ``Range`` request; from
+        servers that ignore the range, only ``size`` bytes are read.
+
+        :param url: S3 or HTTP(S) URL
+        :param size: Number of bytes to fetch
+        :param timeout: Read timeout for this request
+        :return: Up to ``size`` bytes from the start of the content
+        """
+        return self._fetch(url, size, timeout=timeout).data
+
+    def read(self, source: str, size: Optional[int] = None) -> bytes:
+        """
+        Read an asset that may be a URL or a local path
+
+        :param source: S3 or HTTP(S) URL, or a local path
+        :param size: Read at most this many leading bytes; all by default
+        :return: Content bytes
+        """
+        if is_remote_url(source):
+            if size is None:
+                return self.fetch(source)
+            return self.fetch_prefix(source, size)
+        with open(source, "rb") as f:
+            return f.read(-1 if size is None else size)
+
+    def _fetch(
+        self,
+        url: str,
+        size: Optional[int] = None,
+        cached: Optional[CachedAsset] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[CachedAsset]:
+        # Requests guarded by the negative cache and the circuit breaker
+        if self._failed_recently(url):
+            raise AssetUnavailable(url, "failed recently")
+        host = _host_of(url)
+        if not self.breaker.allow(host):
+            raise AssetUnavailable(url, f"host {host} is failing")
+
+        try:
+            asset = self._request(url, size, cached, timeout)
+        except Exception as e:
+            if _error_code(e) in _S3_MISSING_CODES:
+                # The host answered; only this URL is bad
+                self.breaker.record_success(host)
+            else:
+                self.breaker.record_failure(host)
+            self._remember_failure(url)
+            raise
+
+        self.breaker.record_success(host)
+        return asset
+
+    def _request(
+        self,
+        url: str,
+        size: Optional[int] = None,
+        cached: Optional[CachedAsset] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[CachedAsset]:
+        # With ``cached``, a conditional fetch: None when not modified
+        s3_location = parse_s3_url(url)
+        if s3_location is None:
+            return self._fetch_http(url, size, cached, timeout)
+
+        try:
+            return self._fetch_s3(*s3_location, size, cached)
+        except Exception as e:
+            code = _error_code(e)
+            if url.startswith("https://") and code not in _S3_MISSING_CODES:
+                return self._fetch_http(url, size, cached, timeout)
+            logger.error(f"S3 error fetching {url}: {code or str(e)}")
+            raise
+
+    def _failed_recently(self, url: str) -> bool:
+        with self._cache_lock:
+            failed_at = self._failed.get(url)
+            if failed_at is None:
+                return False
+            if time.monotonic() - failed_at < self.negative_ttl:
+                self.negative_hits += 1
+                return True
+            del self._failed[url]
+            return False
+
+    def _remember_failure(self, url: str) -> None:
+        if self.negative_ttl <= 0:
+            return
+        with self._cache_lock:
+            self._failed.pop(url, None)
+            self._failed[url] = time.monotonic()
+            while len(self._failed) > _MAX_NEGATIVE_ENTRIES:
+                self._failed.popitem(last=False)
+
+    def _revalidate(
+        self,
+        url: str,
+        cached: CachedAsset,
+        timeout: Optional[float] = None,
+    ) -> CachedAsset:
+        try:
+            asset = self._fetch(url, cached=cached, timeout=timeout)
+        except Exception as e:
+            if _error_code(e) in _S3_MISSING_CODES:
+                self._forget(url)
+                raise
+            # Better a copy that may be outdated than no asset at all
+            logger.warning(f"Serving cached {url}, revalidation failed: {e}")
+            return cached
+
+        if asset is None:
+            with self._cache_lock:
+                self.not_modified += 1
+                cached.checked_at = time.monotonic()
+            return cached
+        with self._cache_lock:
+            self.misses += 1
+        return self._store(url, asset)
+
+    def _revalidate_in_background(self, url: str, cached: CachedAsset):
+        with self._cache_lock:
+            if url in self._revalidating:
+                return
+            self._revalidating.add(url)
+
+        def revalidate():
+            try:
+                self._revalidate(url, cached)
+            finally:
+                with self._cache_lock:
+                    self._revalidating.discard(url)
+
+        self.executor.submit(revalidate)
+
+    def _store(self, url: str, asset: CachedAsset) -> CachedAsset:
+        asset.checked_at = time.monotonic()
+        if not asset.revalidatable or len(asset.data) > self.cache_bytes:
+            self._forget(url)
+            return asset
+        with self._cache_lock:
+            previous = self._cache.pop(url, None)
+            if previous is not None:
+                self._cached_bytes -= len(previous.data)
+            self._cache[url] = asset
+            self._cached_bytes += len(asset.data)
+        self._evict()
+        return asset
+
+    def _forget(self, url: str) -> None:
+        with self._cache_lock:
+            previous = self._cache.pop(url, None)
+            if previous is not None:
+                self._cached_bytes -= len(previous.data)
+
+    def _evict(self) -> None:
+        with self._cache_lock:
+            while self._cache and self._cached_bytes > self.cache_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted.data)
+
+    def clear_cache(self) -> None:
+        """Drop cached assets, remembered failures and breaker state."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._cached_bytes = 0
+            self._failed.clear()
+            self.hits = self.not_modified = self.misses = 0
+            self.negative_hits = 0
+        self.breaker.reset()
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache and breaker counters, for logging and tuning."""
+        return {
+            "hits": self.hits,
+            "not_modified": self.not_modified,
+            "misses": self.misses,
+            "entries": len(self._cache),
+            "bytes": self._cached_bytes,
+            "negative_hits": self.negative_hits,
+            "breaker_trips": self.breaker.trips,
+            "breaker_recoveries": self.breaker.recoveries,
+            "short_circuits": self.breaker.short_circuits,
+            "open_hosts": len(self.breaker.open_hosts()),
+        }
+
+    def fetch_many(
+        self, urls: Iterable[str], return_exceptions: bool = False
+    ) -> Dict[str, Union[bytes, Exception]]:
+        """
+        Fetch many URLs concurrently; duplicates are fetched once
+
+        :param urls: S3 or HTTP(S) URLs
+        :param return_exceptions: Return the error of a failed URL as its
+            value instead of raising it
+        :return: Bytes (or errors) by URL, in first-seen order
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        if len(unique_urls) <= 1:
+            futures = {}
+        else:
+            futures = {
+                url: self.executor.submit(self.fetch, url)
+                for url in unique_urls
+            }
+
+        results: Dict[str, Union[bytes, Exception]] = {}
+        for url in unique_urls:
+            try:
+                future = futures.get(url)
+                results[url] = future.result() if future else self.fetch(url)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[url] = e
+        return results
+
+    def _fetch_s3(
+        self,
+        bucket: str,
+        key: str,
+        size: Optional[int] = None,
+        cached: Optional[CachedAsset] = None,
+    ) -> Optional[CachedAsset]:
+        kwargs = {"Range": f"bytes=0-{size - 1}"} if size else {}
+        if cached is not None and cached.etag:
+            kwargs["IfNoneMatch"] = cached.etag
+        if cached is not None and cached.last_modified:
+            kwargs["IfModifiedSince"] = parsedate_to_datetime(
+                cached.last_modified
+            )
+
+        try:
+            response = self.s3_client.get_object(
+                Bucket=bucket, Key=key, **kwargs
+            )
+        except Exception as e:
+            if cached is not None and _error_code(e) in _S3_NOT_MODIFIED_CODES:
+                return None
+            raise
+
+        last_modified = response.get("LastModified")
+        return CachedAsset(
+            data=response["Body"].read(),
+            etag=response.get("ETag"),
+            last_modified=format_datetime(
+                last_modified.astimezone(timezone.utc), usegmt=True
+            )
+            if last_modified
+            else None,
+        )
+
+    def _fetch_http(
+        self,
+        url: str,
+        size: Optional[int] = None,
+        cached: Optional[CachedAsset] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[CachedAsset]:
+        timeout = (self.connect_timeout, timeout or self.timeout)
+        try:
+            if size is None:
+                headers = {}
+                if cached is not None and cached.etag:
+                    headers["If-None-Match"] = cached.etag
+                if cached is not None and cached.last_modified:
+                    headers["If-Modified-Since"] = cached.last_modified
+
+                response = self.session.get(
+                    url, headers=headers, timeout=timeout
+                )
+                if cached is not None and response.status_code == 304:
+                    return None
+                response.raise_for_status()
+                return CachedAsset(
+                    data=response.content,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+
+            with self.session.get(
+                url,
+                headers={"Range": f"bytes=0-{size - 1}"},
+                stream=True,
+                timeout=timeout,
+            ) as response:
+                response.raise_for_status()
+                data = b""
+                for chunk in response.iter_content(chunk_size=size):
+                    data += chunk
+                    if len(data) >= size:
+                        break
+                return CachedAsset(data=data[:size])
+
+        except Exception as e:
+            logger.error(f"Error fetching {url}: {str(e)}")
+            raise
+
+
+asset_fetcher = AssetFetcher()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=asset_fetcher._after_fork)
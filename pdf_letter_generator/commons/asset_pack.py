@@ -0,0 +1,381 @@
+"""
+Memory-Mapped Asset Pack
+
+A handful of images - the TG-bPASS logo, watermarks, the tick icon,
+department seals - appear in almost every document, and each render fetches
+and decodes them again. An asset pack holds them pre-resized and already
+decoded to raw pixel rows in a single file, which every worker process
+memory-maps; the pages are shared through the OS page cache.
+
+Pack images are referenced by logical name with an ``asset://`` source,
+e.g. ``asset://tgbpass-logo``, wherever the image registry (and so the
+header blocks and ``LogoHandler``) or ``image_probe`` accept a URL. Drawing
+one needs no network access and no decode.
+
+File layout (all integers big-endian):
+
+- ``MAGIC`` (8 bytes), then the offset and length of the index (8 bytes
+  each)
+- the pixel data, each blob aligned to ``ALIGNMENT`` bytes
+- the index: JSON mapping each name to its mode, pixel size and the
+  offset and length of its pixel rows and, if transparent, its alpha rows
+
+The pack to use is ``$PDF_ASSET_PACK``, or one set with
+``set_asset_pack()``.
+
+Usage:
+    builder = AssetPackBuilder()
+    builder.add("tgbpass-logo", logo_url, max_width=3 * inch,
+                max_height=0.75 * inch)
+    builder.write("/srv/pdf/assets.pack")
+
+    # PDF_ASSET_PACK=/srv/pdf/assets.pack
+    logo = current_image_registry().image("asset://tgbpass-logo")
+
+or from the command line:
+    python -m pdf_letter_generator.commons.asset_pack assets.pack \\
+        tgbpass-logo=logo.png tick=tick.jpg
+"""
+
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image as PILImage
+from reportlab.lib.utils import ImageReader
+
+from pdf_letter_generator.commons.asset_fetch import asset_fetcher
+from pdf_letter_generator.commons.image_preparation import (
+    DEFAULT_TARGET_DPI,
+    POINTS_PER_INCH,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PDFPACK1"
+ALIGNMENT = 64
+
+ASSET_PACK_ENV = "PDF_ASSET_PACK"
+ASSET_URL_PREFIX = "asset://"
+
+_HEADER = struct.Struct(">8sQQ")
+
+
+def is_pack_url(source: str) -> bool:
+    """
+    Tell whether an image source names an asset pack image
+
+    :param source: URL, path or ``asset://`` name
+    :return: True for ``asset://`` sources
+    """
+    return source.startswith(ASSET_URL_PREFIX)
+
+
+class PackedImageReader(ImageReader):
+    """``ImageReader`` over raw pixel rows of an asset pack; never decodes."""
+
+    def __init__(
+        self,
+        name: str,
+        mode: str,
+        size: Tuple[int, int],
+        data: Any,
+        alpha: Optional["PackedImageReader"] = None,
+    ):
+        """
+        :param name: Logical name of the image
+        :param mode: Pixel mode of ``data``: "RGB", "L" or "CMYK"
+        :param size: Width and height in pixels
+        :param data: Raw pixel rows, e.g. a slice of the mapped pack
+        :param alpha: Alpha channel of the image, if transparent
+        """
+        self._ident = name
+        self.fileName = ASSET_URL_PREFIX + name
+        self.fp = None
+        self._image = None
+        self._transparent = None
+        self._width, self._height = size
+        self.mode = mode
+        self._raw = data
+        self._dataA = alpha
+
+    def getRGBData(self):
+        # Copied per call and not kept, so the pixels stay only in the map;
+        # canvas.drawImage concatenates the data, which needs bytes
+        return bytes(self._raw)
+
+    def getTransparent(self):
+        return None
+
+
+class AssetPack:
+    """Read-only, memory-mapped asset pack."""
+
+    def __init__(self, path: str):
+        """
+        :param path: Pack file written by ``AssetPackBuilder``
+        :raises ValueError: If the file is not an asset pack
+        """
+        self.path = path
+        with open(path, "rb") as pack_file:
+            self._map = mmap.mmap(
+                pack_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        magic, index_offset, index_length = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"Not an asset pack: {path}")
+        self.index: Dict[str, Dict[str, Any]] = json.loads(
+            self._map[index_offset:index_offset + index_length]
+        )
+        self._readers: Dict[str, PackedImageReader] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def names(self) -> List[str]:
+        return list(self.index)
+
+    def size(self, name: str) -> Tuple[int, int]:
+        """
+        Pixel size of a pack image
+
+        :param name: Logical name
+        :return: Width and height in pixels
+        :raises KeyError: If the pack has no such image
+        """
+        entry = self.index[name]
+        return entry["width"], entry["height"]
+
+    def reader(self, name: str) -> PackedImageReader:
+        """
+        Reader for a pack image, shared by every caller in the process
+
+        :param name: Logical name
+        :return: PackedImageReader over the mapped pixel rows
+        :raises KeyError: If the pack has no such image
+        """
+        reader = self._readers.get(name)
+        if reader is not None:
+            return reader
+
+        entry = self.index[name]
+        size = (entry["width"], entry["height"])
+        alpha = None
+        if entry.get("alpha_offset") is not None:
+            alpha = PackedImageReader(
+                f"{name}#alpha",
+                "L",
+                size,
+                self._slice(entry["alpha_offset"], entry["alpha_length"]),
+            )
+        reader = PackedImageReader(
+            name,
+            entry["mode"],
+            size,
+            self._slice(entry["offset"], entry["length"]),
+            alpha,
+        )
+        with self._lock:
+            return self._readers.setdefault(name, reader)
+
+    def _slice(self, offset: int, length: int) -> memoryview:
+        return memoryview(self._map)[offset:offset + length]
+
+    def close(self) -> None:
+        with self._lock:
+            self._readers.clear()
+        self._map.close()
+
+
+class AssetPackBuilder:
+    """Collects images, resized and decoded, and writes an asset pack."""
+
+    def __init__(self):
+        self._images: Dict[str, PILImage.Image] = {}
+
+    def add(
+        self,
+        name: str,
+        source: str,
+        max_width: Optional[float] = None,
+        max_height: Optional[float] = None,
+        dpi: float = DEFAULT_TARGET_DPI,
+    ) -> None:
+        """
+        Add an image, resized for the largest box it is drawn in
+
+        :param name: Logical name, used as ``asset://<name>``
+        :param source: S3 or HTTP(S) URL, or a local path
+        :param max_width: Largest draw width in points; keeps the pixel
+            width if omitted
+        :param max_height: Largest draw height in points
+        :param dpi: Resolution at the largest draw size
+        """
+        image = PILImage.open(BytesIO(asset_fetcher.read(source)))
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or (
+            "transparency" in image.info
+        )
+        if has_alpha:
+            image = image.convert("RGBA")
+        elif image.mode not in ("RGB", "L", "CMYK"):
+            image = image.convert("RGB")
+
+        box = (
+            math.ceil(max_width / POINTS_PER_INCH * dpi)
+            if max_width
+            else image.width,
+            math.ceil(max_height / POINTS_PER_INCH * dpi)
+            if max_height
+            else image.height,
+        )
+        if image.width > box[0] or image.height > box[1]:
+            image.thumbnail(box, PILImage.Resampling.LANCZOS)
+
+        self._images[name] = image
+
+    def write(self, path: str) -> None:
+        """
+        Write the pack atomically, replacing any pack at ``path``
+
+        :param path: Destination file
+        """
+        index: Dict[str, Dict[str, Any]] = {}
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as pack_file:
+                pack_file.write(_HEADER.pack(MAGIC, 0, 0))
+                for name, image in self._images.items():
+                    entry = index[name] = {
+                        "width": image.width,
+                        "height": image.height,
+                    }
+                    if image.mode == "RGBA":
+                        alpha = image.getchannel("A").tobytes()
+                        entry["alpha_offset"] = _write_blob(pack_file, alpha)
+                        entry["alpha_length"] = len(alpha)
+                        image = image.convert("RGB")
+                    data = image.tobytes()
+                    entry["mode"] = image.mode
+                    entry["offset"] = _write_blob(pack_file, data)
+                    entry["length"] = len(data)
+
+                index_json = json.dumps(index, sort_keys=True).encode("utf-8")
+                index_offset = _write_blob(pack_file, index_json)
+                pack_file.seek(0)
+                pack_file.write(
+                    _HEADER.pack(MAGIC, index_offset, len(index_json))
+                )
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+
+def _write_blob(pack_file, data: bytes) -> int:
+    offset = -(-pack_file.tell() // ALIGNMENT) * ALIGNMENT
+    pack_file.seek(offset)
+    pack_file.write(data)
+    return offset
+
+
+_asset_pack: Optional[AssetPack] = None
+_asset_pack_loaded = False
+_asset_pack_lock = threading.Lock()
+
+
+def get_asset_pack() -> Optional[AssetPack]:
+    """
+    Return the process-wide asset pack, opening ``$PDF_ASSET_PACK`` once
+
+    :return: The pack, or None if none is configured or it cannot be read
+    """
+    global _asset_pack, _asset_pack_loaded
+    if not _asset_pack_loaded:
+        with _asset_pack_lock:
+            if not _asset_pack_loaded:
+                path = os.environ.get(ASSET_PACK_ENV)
+                if path:
+                    try:
+                        _asset_pack = AssetPack(path)
+                    except Exception as e:
+                        logger.error(f"Error opening asset pack {path}: {e}")
+                _asset_pack_loaded = True
+    return _asset_pack
+
+
+def set_asset_pack(pack: Optional[AssetPack]) -> None:
+    """
+    Use a pack instead of ``$PDF_ASSET_PACK``
+
+    :param pack: Opened pack, or None for no pack
+    """
+    global _asset_pack, _asset_pack_loaded
+    with _asset_pack_lock:
+        _asset_pack, _asset_pack_loaded = pack, True
+
+
+def _pack_and_name(source: str) -> Tuple[AssetPack, str]:
+    name = source[len(ASSET_URL_PREFIX):]
+    pack = get_asset_pack()
+    if pack is None or name not in pack:
+        raise KeyError(f"No asset pack image named {name!r}")
+    return pack, name
+
+
+def pack_reader(source: str) -> PackedImageReader:
+    """
+    Reader for an ``asset://<name>`` source
+
+    :param source: ``asset://<name>`` source
+    :return: Shared PackedImageReader of the image
+    :raises KeyError: If no pack is configured or it has no such image
+    """
+    pack, name = _pack_and_name(source)
+    return pack.reader(name)
+
+
+def pack_image_size(source: str) -> Tuple[int, int]:
+    """
+    Pixel size of an ``asset://<name>`` source
+
+    :param source: ``asset://<name>`` source
+    :return: Width and height in pixels
+    :raises KeyError: If no pack is configured or it has no such image
+    """
+    pack, name = _pack_and_name(source)
+    return pack.size(name)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build an asset pack")
+    parser.add_argument("output", help="Pack file to write")
+    parser.add_argument(
+        "images", nargs="+", help="name=source pairs (URL or path)"
+    )
+    parser.add_argument(
+        "--max-width", type=float, help="Largest draw width in points"
+    )
+    parser.add_argument(
+        "--max-height", type=float, help="Largest draw height in points"
+    )
+    parser.add_argument("--dpi", type=float, default=DEFAULT_TARGET_DPI)
+    args = parser.parse_args()
+
+    builder = AssetPackBuilder()
+    for image in args.images:
+        name, source = image.split("=", 1)
+        builder.add(name, source, args.max_width, args.max_height, args.dpi)
+    builder.write(args.output)
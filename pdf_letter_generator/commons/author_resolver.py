@@ -0,0 +1,299 @@
+"""
+Author Resolution Utility for Remark PDFs
+
+This module resolves the ``added_by`` user IDs of remarks into display
+profiles (name and designation). Lookups are batched: all unique IDs of a
+document (or of a look-ahead window when streaming) are resolved with a
+single call to the profile source, and results are cached with a TTL so
+that repeated exports of the same pipeline do not hit the source again.
+Cache entries are kept per source (see ``cache_namespace``), and users a
+source does not know are remembered only briefly.
+
+Usage:
+    resolver = AuthorResolver(source=IamServiceProfileSource(iam_service))
+    for remark_dto, profile in resolver.iter_with_authors(remark_dtos):
+        ...
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    TypeVar,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_DESIGNATION = "Planning Ofcr"
+DEFAULT_CACHE_TTL_SECONDS = 300
+# Users unknown to a source may be created any moment; retry them soon
+DEFAULT_NEGATIVE_TTL_SECONDS = 30
+DEFAULT_CACHE_MAX_ENTRIES = 10000
+DEFAULT_LOOKAHEAD = 100
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class AuthorProfile:
+    """Display profile of a remark author."""
+
+    user_id: str
+    name: str
+    designation: str = DEFAULT_DESIGNATION
+
+
+# Distinct cache namespaces for sources that do not name their own
+_source_ids = itertools.count()
+
+
+class UserProfileSource(Protocol):
+    """Backend able to resolve many user IDs in one call.
+
+    Sources may set ``cache_namespace``: sources with the same namespace
+    share cached profiles, e.g. every adapter over the one IAM service.
+    """
+
+    def get_profiles(self, user_ids: List[str]) -> Dict[str, AuthorProfile]:
+        """
+        Resolve user IDs into profiles.
+
+        :param user_ids: Unique user IDs to resolve
+        :return: Mapping of user ID to profile; unknown IDs may be omitted
+        """
+
+
+class InMemoryUserProfileSource:
+    """Local stand-in for the IAM service, backed by a dictionary."""
+
+    def __init__(self, profiles: Optional[Dict[str, AuthorProfile]] = None):
+        """
+        :param profiles: Optional initial mapping of user ID to profile
+        """
+        self._profiles = dict(profiles or {})
+        self.call_count = 0
+        # Each dictionary is its own backend
+        self.cache_namespace = f"memory-{next(_source_ids)}"
+
+    def add_profile(self, profile: AuthorProfile) -> None:
+        """Register or replace a profile."""
+        self._profiles[profile.user_id] = profile
+
+    def get_profiles(self, user_ids: List[str]) -> Dict[str, AuthorProfile]:
+        self.call_count += 1
+        return {
+            user_id: self._profiles[user_id]
+            for user_id in user_ids
+            if user_id in self._profiles
+        }
+
+
+class IamServiceProfileSource:
+    """Adapter over an IAM service exposing ``get_user_profiles``."""
+
+    # Every adapter resolves against the same IAM service
+    cache_namespace = "iam"
+
+    def __init__(self, iam_service: Any):
+        """
+        :param iam_service: Service whose ``get_user_profiles(user_ids=...)``
+            returns ``(user_dtos, _)`` with ``user_id`` and ``name`` fields
+        """
+        self._iam_service = iam_service
+
+    def get_profiles(self, user_ids: List[str]) -> Dict[str, AuthorProfile]:
+        user_dtos, _ = self._iam_service.get_user_profiles(user_ids=user_ids)
+        return {
+            dto.user_id: AuthorProfile(
+                user_id=dto.user_id,
+                name=dto.name,
+                designation=getattr(dto, "designation", None)
+                or DEFAULT_DESIGNATION,
+            )
+            for dto in user_dtos
+        }
+
+
+class ProfileCache:
+    """Thread-safe, size-bounded TTL cache of author profiles."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        negative_ttl_seconds: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+    ):
+        """
+        :param ttl_seconds: Time after which an entry is considered stale
+        :param max_entries: Maximum number of cached user IDs
+        :param negative_ttl_seconds: Time after which a user the source
+            reported as unknown is looked up again
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._entries: (
+            "OrderedDict[Tuple[Hashable, str], "
+            "Tuple[float, Optional[AuthorProfile]]]"
+        ) = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(
+        self, user_ids: Iterable[str], namespace: Hashable = None
+    ) -> Tuple[Dict[str, Optional[AuthorProfile]], List[str]]:
+        """
+        Look up cached profiles.
+
+        :param user_ids: User IDs to look up
+        :param namespace: Source the profiles were resolved by
+        :return: Tuple of (hits, misses). A hit may map to ``None`` when the
+            source recently reported the user as unknown.
+        """
+        now = time.monotonic()
+        hits, misses = {}, []
+        with self._lock:
+            for user_id in user_ids:
+                key = (namespace, user_id)
+                entry = self._entries.get(key)
+                if entry is None or entry[0] <= now:
+                    misses.append(user_id)
+                    continue
+                self._entries.move_to_end(key)
+                hits[user_id] = entry[1]
+        return hits, misses
+
+    def set_many(
+        self,
+        profiles: Dict[str, Optional[AuthorProfile]],
+        namespace: Hashable = None,
+    ) -> None:
+        """Store profiles (``None`` marks a known-unknown user)."""
+        now = time.monotonic()
+        with self._lock:
+            for user_id, profile in profiles.items():
+                ttl = (
+                    self.ttl_seconds
+                    if profile is not None
+                    else self.negative_ttl_seconds
+                )
+                key = (namespace, user_id)
+                self._entries[key] = (now + ttl, profile)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared across requests within a worker process
+_shared_profile_cache = ProfileCache()
+
+
+class AuthorResolver:
+    """Resolves remark authors in batches through a pluggable source."""
+
+    def __init__(
+        self,
+        source: Optional[UserProfileSource] = None,
+        cache: Optional[ProfileCache] = None,
+        default_designation: str = DEFAULT_DESIGNATION,
+    ):
+        """
+        :param source: Profile source; defaults to an empty in-memory source
+        :param cache: Profile cache; defaults to the process-wide cache
+        :param default_designation: Designation used for unresolved users
+        """
+        self.source = source or InMemoryUserProfileSource()
+        self.cache = cache if cache is not None else _shared_profile_cache
+        self.default_designation = default_designation
+        self.cache_namespace = getattr(
+            self.source, "cache_namespace", None
+        ) or f"{type(self.source).__name__}-{next(_source_ids)}"
+
+    def _fallback_profile(self, user_id: str) -> AuthorProfile:
+        return AuthorProfile(
+            user_id=user_id,
+            name=user_id,
+            designation=self.default_designation,
+        )
+
+    def resolve(self, user_ids: Iterable[str]) -> Dict[str, AuthorProfile]:
+        """
+        Resolve user IDs with at most one call to the source.
+
+        :param user_ids: User IDs, duplicates allowed
+        :return: Mapping of every requested user ID to a profile
+        """
+        unique_ids = list(dict.fromkeys(uid for uid in user_ids if uid))
+        if not unique_ids:
+            return {}
+
+        cached, misses = self.cache.get_many(
+            unique_ids, self.cache_namespace
+        )
+        if misses:
+            try:
+                fetched = self.source.get_profiles(misses)
+            except Exception as e:
+                # Do not cache failures; render with fallbacks this time
+                logger.error(f"Error resolving remark authors: {e}")
+                fetched = None
+
+            if fetched is not None:
+                resolved = {uid: fetched.get(uid) for uid in misses}
+                self.cache.set_many(resolved, self.cache_namespace)
+                cached.update(resolved)
+
+        return {
+            uid: cached.get(uid) or self._fallback_profile(uid)
+            for uid in unique_ids
+        }
+
+    def iter_with_authors(
+        self,
+        items: Iterable[T],
+        lookahead: int = DEFAULT_LOOKAHEAD,
+        user_id_attr: str = "added_by",
+    ) -> Iterator[Tuple[T, AuthorProfile]]:
+        """
+        Pair each item with its author, resolving one window at a time.
+
+        Works for lists and lazy iterators alike: at most ``lookahead``
+        items are buffered and their unique authors resolved in one call.
+
+        :param items: Items carrying a user ID attribute (e.g. remark DTOs)
+        :param lookahead: Number of items resolved per batch
+        :param user_id_attr: Name of the attribute holding the user ID
+        :return: Iterator of (item, profile) pairs in input order
+        """
+        iterator = iter(items)
+        lookahead = max(1, lookahead)
+        while True:
+            window = list(islice(iterator, lookahead))
+            if not window:
+                return
+
+            profiles = self.resolve(
+                getattr(item, user_id_attr) for item in window
+            )
+            for item in window:
+                user_id = getattr(item, user_id_attr)
+                yield item, profiles.get(user_id) or self._fallback_profile(
+                    user_id
+                )
@@ -0,0 +1,105 @@
+"""
+Private Cache Directories
+
+Caches persisted on disk decide what later processes load, so whoever can
+write a cache entry controls them. The system temp dir is shared by every
+local user, so a cache there must live in a directory of its own:
+
+- ``default_cache_dir`` names a per-user directory under the temp dir
+- ``ensure_private_dir`` creates it with mode 0700, and refuses a
+  directory another user owns or can write to
+- ``read_trusted_file`` reads a cache entry only if the current user owns
+  it and nobody else can write to it
+
+Usage:
+    cache_dir = Path(os.environ.get(CACHE_DIR_ENV) or
+                     default_cache_dir("pdf_font_cache"))
+    if ensure_private_dir(cache_dir):
+        data = read_trusted_file(cache_dir / name)
+"""
+
+import logging
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+PRIVATE_DIR_MODE = 0o700
+
+# Group and other write permission bits
+_FOREIGN_WRITE_BITS = stat.S_IWGRP | stat.S_IWOTH
+
+
+def _current_uid() -> Optional[int]:
+    # No ownership to check where the platform has no uids
+    getuid = getattr(os, "getuid", None)
+    return getuid() if getuid else None
+
+
+def _is_private(st: os.stat_result) -> bool:
+    uid = _current_uid()
+    if uid is not None and st.st_uid != uid:
+        return False
+    return not st.st_mode & _FOREIGN_WRITE_BITS
+
+
+def default_cache_dir(name: str) -> Path:
+    """
+    Per-user cache directory under the system temp dir
+
+    :param name: Cache name, e.g. ``pdf_font_cache``
+    :return: Path of the directory; it may not exist yet
+    """
+    uid = _current_uid()
+    suffix = f"-{uid}" if uid is not None else ""
+    return Path(tempfile.gettempdir()) / f"{name}{suffix}"
+
+
+def ensure_private_dir(path: Path) -> bool:
+    """
+    Create a cache directory only the current user can write to
+
+    :param path: Cache directory
+    :return: True if the directory exists and is private; False, with a
+        warning logged, if it cannot be created or is not to be trusted
+    """
+    try:
+        path.mkdir(mode=PRIVATE_DIR_MODE, parents=True, exist_ok=True)
+        st = os.lstat(path)
+    except OSError as e:
+        logger.warning(f"Cannot create cache directory {path}: {e}")
+        return False
+
+    if not stat.S_ISDIR(st.st_mode) or not _is_private(st):
+        logger.warning(
+            f"Not using cache directory {path}: not a directory owned and "
+            "only writable by the current user"
+        )
+        return False
+    return True
+
+
+def read_trusted_file(path: Path) -> Optional[bytes]:
+    """
+    Read a cache entry, if the current user owns it and nobody else can
+    write to it
+
+    :param path: Cache entry
+    :return: File contents, or None if the entry does not exist
+    :raises PermissionError: If the entry is not to be trusted
+    """
+    flags = os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0)
+    try:
+        fd = os.open(path, flags)
+    except FileNotFoundError:
+        return None
+
+    with os.fdopen(fd, "rb") as cache_file:
+        st = os.fstat(cache_file.fileno())
+        if not stat.S_ISREG(st.st_mode) or not _is_private(st):
+            raise PermissionError(f"Untrusted cache entry {path}")
+        return cache_file.read()
@@ -0,0 +1,202 @@
+"""
+Glyph Width Tables for Fast Text Measurement
+
+``stringWidth`` walks the font metrics for every call, and width-driven
+wrapping calls it once per candidate line (or per prefix), which is
+quadratic in the line length. This module builds, once per font, a table of
+glyph advances (in 1/1000 em, straight from the registered TTF/Type1
+metrics) and measures text with a table lookup plus a cumulative sum.
+Line breaks are then found with a binary search over the cumulative widths.
+
+NumPy is used when installed; otherwise the same algorithm runs on plain
+lists with ``itertools.accumulate`` and ``bisect``.
+
+Usage:
+    from pdf_letter_generator.commons.glyph_widths import string_width
+
+    width = string_width("Plot No. 12, Road No. 3", "Helvetica", 10)
+"""
+
+import threading
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List, Sequence
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+# Codepoints covered by the dense table (Basic Latin to Latin Extended-B)
+DENSE_TABLE_SIZE = 0x250
+
+# Below this length a plain Python loop beats NumPy's call overhead
+VECTORISE_MIN_LENGTH = 64
+
+# Tolerance for floating point error when comparing against a width limit
+_EPSILON = 1e-9
+
+
+class GlyphWidthTable:
+    """Glyph advances of one registered font, in 1/1000 em."""
+
+    def __init__(self, font_name: str):
+        """
+        :param font_name: Name of a registered (or standard) font
+        """
+        self.font_name = font_name
+        self._dense: List[float] = [
+            self._measure(chr(code)) for code in range(DENSE_TABLE_SIZE)
+        ]
+        self._dense_array = (
+            np.array(self._dense, dtype=np.float64) if np is not None else None
+        )
+        self._sparse: Dict[int, float] = {}
+
+    def _measure(self, char: str) -> float:
+        return stringWidth(char, self.font_name, 1000)
+
+    def _advance(self, code: int) -> float:
+        if code < DENSE_TABLE_SIZE:
+            return self._dense[code]
+        advance = self._sparse.get(code)
+        if advance is None:
+            advance = self._sparse[code] = self._measure(chr(code))
+        return advance
+
+    @staticmethod
+    def _codes(text: str):
+        return np.frombuffer(
+            text.encode("utf-32-le", "surrogatepass"), dtype="<u4"
+        )
+
+    def advances(self, text: str) -> Sequence[float]:
+        """
+        Return the advance of every character of the text.
+
+        :param text: Text to measure
+        :return: NumPy array (or list) of advances in 1/1000 em
+        """
+        if np is None or len(text) < VECTORISE_MIN_LENGTH:
+            return [self._advance(ord(char)) for char in text]
+
+        codes = self._codes(text)
+        outside = codes >= DENSE_TABLE_SIZE
+        if not outside.any():
+            return self._dense_array[codes]
+
+        advances = self._dense_array[np.where(outside, 0, codes)]
+        positions = np.flatnonzero(outside)
+        advances[positions] = [
+            self._advance(int(code)) for code in codes[positions]
+        ]
+        return advances
+
+    def string_width(self, text: str, font_size: float) -> float:
+        """
+        Measure text at the given size, like ``pdfmetrics.stringWidth``.
+
+        :param text: Text to measure
+        :param font_size: Font size in points
+        :return: Width in points
+        """
+        advances = self.advances(text)
+        total = sum(advances) if isinstance(advances, list) else advances.sum()
+        return float(total) * 0.001 * font_size
+
+    def wrap(self, text: str, width: float, font_size: float) -> List[str]:
+        """
+        Greedily break text into lines no wider than ``width``.
+
+        Whitespace runs are collapsed to single spaces. Lines break at the
+        last space that fits; a word wider than the line is split at the
+        last character that fits.
+
+        :param text: Text to wrap
+        :param width: Maximum line width in points
+        :param font_size: Font size in points
+        :return: List of lines
+        """
+        text = " ".join(text.split())
+        if not text:
+            return []
+
+        limit = width * 1000.0 / font_size + _EPSILON
+        advances = self.advances(text)
+
+        if isinstance(advances, list):
+            cumulative = [0.0, *accumulate(advances)]
+            spaces = [i for i, char in enumerate(text) if char == " "]
+            search = bisect_right
+        else:
+            cumulative = np.concatenate(([0.0], np.cumsum(advances)))
+            spaces = np.flatnonzero(self._codes(text) == 32)
+
+            def search(values, target):
+                return int(np.searchsorted(values, target, side="right"))
+
+        lines = []
+        length = len(text)
+        start = 0
+        while start < length:
+            # Last end index whose cumulative width still fits the line
+            end = search(cumulative, cumulative[start] + limit) - 1
+            if end >= length:
+                lines.append(text[start:])
+                break
+
+            index = search(spaces, end) - 1
+            space = int(spaces[index]) if index >= 0 else -1
+            if space > start:
+                lines.append(text[start:space])
+                start = space + 1
+                continue
+
+            # No break opportunity: split the word, keeping at least one char
+            end = max(end, start + 1)
+            lines.append(text[start:end])
+            start = end
+            if start < length and text[start] == " ":
+                start += 1
+
+        return lines
+
+
+_tables: Dict[str, GlyphWidthTable] = {}
+_tables_lock = threading.Lock()
+
+
+def get_glyph_widths(font_name: str) -> GlyphWidthTable:
+    """
+    Return the (process-wide) glyph width table of a font, building it once.
+
+    :param font_name: Name of a registered (or standard) font
+    :return: GlyphWidthTable for the font
+    """
+    table = _tables.get(font_name)
+    if table is None:
+        with _tables_lock:
+            table = _tables.get(font_name)
+            if table is None:
+                table = _tables[font_name] = GlyphWidthTable(font_name)
+    return table
+
+
+def clear_glyph_width_tables() -> None:
+    """Drop all tables, e.g. after re-registering a font under the same name."""
+    with _tables_lock:
+        _tables.clear()
+
+
+def string_width(text: str, font_name: str, font_size: float) -> float:
+    """
+    Drop-in replacement for ``pdfmetrics.stringWidth`` backed by glyph tables.
+
+    :param text: Text to measure
+    :param font_name: Font name
+    :param font_size: Font size in points
+    :return: Width in points
+    """
+    return get_glyph_widths(font_name).string_width(text, font_size)
@@ -0,0 +1,259 @@
+"""
+Image Preparation for PDF Embedding
+
+ReportLab embeds an image's original bytes and only scales it when drawing,
+so a 12-megapixel site photo drawn 3 inches wide still adds several MB to
+the PDF. ``ImagePreparer`` resamples each image to a target effective DPI
+for its final draw size before it is embedded:
+
+- photos are re-encoded as JPEG, which ReportLab embeds without decoding
+- graphics with transparency or a palette stay PNG
+- images already at or below the target resolution keep their original
+  bytes unless re-encoding makes them smaller
+
+Results are kept in a process-wide LRU cache bounded by total bytes, keyed
+by a digest of the source bytes, the draw box and the settings, so the same
+photo on several sheets is decoded once.
+
+Usage:
+    prepared = image_preparer.prepare(photo_bytes, max_width, max_height)
+    img = Image(BytesIO(prepared.data), prepared.draw_width,
+                prepared.draw_height)
+"""
+
+import hashlib
+import logging
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Dict, Hashable, Optional, Tuple
+
+from PIL import Image as PILImage
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGET_DPI = 150
+DEFAULT_JPEG_QUALITY = 80
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+POINTS_PER_INCH = 72
+
+# PIL modes that JPEG can store as they are
+_JPEG_MODES = ("RGB", "L", "CMYK")
+
+
+@dataclass(frozen=True)
+class ImagePreparationSettings:
+    """Target resolution and encoding of prepared images."""
+
+    target_dpi: float = DEFAULT_TARGET_DPI
+    jpeg_quality: int = DEFAULT_JPEG_QUALITY
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    """Image bytes ready to embed, with the size to draw them at."""
+
+    data: bytes
+    format: str
+    pixel_width: int
+    pixel_height: int
+    draw_width: float
+    draw_height: float
+
+
+def fit_draw_size(
+    pixel_width: int, pixel_height: int, max_width: float, max_height: float
+) -> Tuple[float, float]:
+    """
+    Draw size of an image (one point per pixel), scaled down to fit a box
+
+    :param pixel_width: Image width in pixels
+    :param pixel_height: Image height in pixels
+    :param max_width: Maximum draw width in points
+    :param max_height: Maximum draw height in points
+    :return: Draw width and height in points
+    """
+    scale = min(1.0, max_width / pixel_width, max_height / pixel_height)
+    return pixel_width * scale, pixel_height * scale
+
+
+def _target_pixels(points: float, dpi: float) -> int:
+    return max(1, math.ceil(points / POINTS_PER_INCH * dpi))
+
+
+def _has_alpha(image: PILImage.Image) -> bool:
+    return image.mode in ("RGBA", "LA", "PA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
+
+
+def _is_graphic(image: PILImage.Image) -> bool:
+    """Transparent or palette images: line art, logos, stamps."""
+    return _has_alpha(image) or image.mode in ("P", "1")
+
+
+class ImagePreparer:
+    """Resamples and re-encodes images for their draw size, with a cache."""
+
+    def __init__(
+        self,
+        settings: Optional[ImagePreparationSettings] = None,
+        max_cache_bytes: int = DEFAULT_CACHE_BYTES,
+    ):
+        """
+        :param settings: Default target DPI and JPEG quality
+        :param max_cache_bytes: Total size of cached prepared images
+        """
+        self.settings = settings or ImagePreparationSettings()
+        self.max_cache_bytes = max_cache_bytes
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[Hashable, PreparedImage]" = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+
+    def prepare(
+        self,
+        image_data: bytes,
+        max_width: float,
+        max_height: float,
+        settings: Optional[ImagePreparationSettings] = None,
+    ) -> PreparedImage:
+        """
+        Prepare image bytes for drawing inside a box
+
+        :param image_data: Original image bytes (JPEG, PNG, ...)
+        :param max_width: Maximum draw width in points
+        :param max_height: Maximum draw height in points
+        :param settings: Optional settings overriding the defaults
+        :return: Prepared image and its draw size
+        """
+        settings = settings or self.settings
+        key = (
+            hashlib.blake2b(image_data, digest_size=16).digest(),
+            max_width,
+            max_height,
+            settings,
+        )
+        with self._lock:
+            prepared = self._cache.get(key)
+            if prepared is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return prepared
+            self.misses += 1
+
+        prepared = self._prepare(image_data, max_width, max_height, settings)
+        self._put(key, prepared)
+        return prepared
+
+    def _prepare(
+        self,
+        image_data: bytes,
+        max_width: float,
+        max_height: float,
+        settings: ImagePreparationSettings,
+    ) -> PreparedImage:
+        try:
+            image = PILImage.open(BytesIO(image_data))
+            source_format = image.format
+            pixel_width, pixel_height = image.size
+            draw_width, draw_height = fit_draw_size(
+                pixel_width, pixel_height, max_width, max_height
+            )
+            target_size = (
+                _target_pixels(draw_width, settings.target_dpi),
+                _target_pixels(draw_height, settings.target_dpi),
+            )
+            needs_resample = (
+                pixel_width > target_size[0] or pixel_height > target_size[1]
+            )
+
+            if not needs_resample and source_format == "JPEG":
+                return PreparedImage(
+                    data=image_data,
+                    format=source_format,
+                    pixel_width=pixel_width,
+                    pixel_height=pixel_height,
+                    draw_width=draw_width,
+                    draw_height=draw_height,
+                )
+
+            graphic = _is_graphic(image)
+            if needs_resample:
+                if image.mode in ("P", "1"):
+                    # Palette images only resize with nearest-neighbour
+                    mode = "RGBA" if _has_alpha(image) else "RGB"
+                    image = image.convert(mode)
+                # JPEG sources are decoded at a reduced scale when possible
+                image.thumbnail(
+                    target_size, PILImage.Resampling.LANCZOS, reducing_gap=3.0
+                )
+
+            output = BytesIO()
+            if graphic:
+                output_format = "PNG"
+                image.save(output, format="PNG", optimize=True)
+            else:
+                output_format = "JPEG"
+                if image.mode not in _JPEG_MODES:
+                    image = image.convert("RGB")
+                image.save(
+                    output,
+                    format="JPEG",
+                    quality=settings.jpeg_quality,
+                    optimize=True,
+                )
+            data = output.getvalue()
+
+            if not needs_resample and len(data) >= len(image_data):
+                # Already small enough; avoid a lossy round trip
+                data, output_format = image_data, source_format
+
+            return PreparedImage(
+                data=data,
+                format=output_format,
+                pixel_width=image.width,
+                pixel_height=image.height,
+                draw_width=draw_width,
+                draw_height=draw_height,
+            )
+
+        except Exception as e:
+            logger.error(f"Error preparing image: {str(e)}")
+            raise
+
+    def _put(self, key: Hashable, prepared: PreparedImage) -> None:
+        size = len(prepared.data)
+        if size > self.max_cache_bytes:
+            return
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = prepared
+            self._cache_bytes += size
+            while self._cache_bytes > self.max_cache_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted.data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and cache size, for logging and tuning."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._cache),
+            "bytes": self._cache_bytes,
+        }
+
+
+image_preparer = ImagePreparer()
@@ -0,0 +1,185 @@
+"""
+Header-Only Image Dimension Probing
+
+Layout planning only needs an image's pixel size, which JPEG, PNG, GIF and
+WebP files store in their first few bytes. Fetching and decoding a full
+photo to read it costs the whole download plus a decode. ``ImageProbe``
+instead:
+
+- reads the first ``PROBE_SIZES[0]`` bytes of a URL (a ranged S3
+  ``get_object`` or an HTTP ``Range`` request) or of a local file
+- parses the size from the header, reading further only when a JPEG has
+  large metadata segments before its frame header
+- falls back to a full fetch, read lazily by PIL, for other formats
+
+Sizes are cached per URL or path in a process-wide LRU, so the same logo
+measured for every document is probed once.
+
+Usage:
+    from pdf_letter_generator.commons.image_probe import image_probe
+
+    pixel_width, pixel_height = image_probe.probe(photo_url)
+"""
+
+import logging
+import struct
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+
+from PIL import Image as PILImage
+
+from pdf_letter_generator.commons.asset_fetch import asset_fetcher
+from pdf_letter_generator.commons.asset_pack import (
+    is_pack_url,
+    pack_image_size,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bytes read per attempt; EXIF thumbnails can push a JPEG frame header
+# past the first few KB
+PROBE_SIZES = (4 * 1024, 64 * 1024, 1024 * 1024)
+DEFAULT_CACHE_ENTRIES = 4096
+
+# JPEG start-of-frame markers; C4, C8 and CC share the range but are not
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            offset += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            # Markers without a length
+            offset += 2
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            if offset + 9 > len(data):
+                return None
+            height, width = struct.unpack(">HH", data[offset + 5:offset + 9])
+            return width, height
+        (length,) = struct.unpack(">H", data[offset + 2:offset + 4])
+        offset += 2 + length
+    return None
+
+
+def _webp_size(data: bytes) -> Optional[Tuple[int, int]]:
+    chunk = data[12:16]
+    if chunk == b"VP8 " and len(data) >= 30:
+        width, height = struct.unpack("<HH", data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and len(data) >= 25:
+        (bits,) = struct.unpack("<I", data[21:25])
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(data) >= 30:
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def parse_image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read the pixel size from the start of a JPEG, PNG, GIF or WebP file
+
+    :param data: Leading bytes of the file
+    :return: Width and height in pixels, or None if the header is not
+        recognised or more bytes are needed
+    """
+    if data[:3] == b"\xff\xd8\xff":
+        return _jpeg_size(data)
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and data[12:16] == b"IHDR":
+        return struct.unpack(">II", data[16:24]) if len(data) >= 24 else None
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        return struct.unpack("<HH", data[6:10])
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return _webp_size(data)
+    return None
+
+
+class ImageProbe:
+    """Reads image pixel sizes from file headers, cached by source."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES):
+        """
+        :param max_entries: Number of sources whose size is cached
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def probe(self, source: str) -> Tuple[int, int]:
+        """
+        Return the pixel size of an image without fetching all of it
+
+        :param source: S3 or HTTP(S) URL, a local path or an ``asset://``
+            name
+        :return: Width and height in pixels
+        :raises Exception: If the image cannot be read
+        """
+        if is_pack_url(source):
+            return pack_image_size(source)
+
+        with self._lock:
+            size = self._cache.get(source)
+            if size is not None:
+                self._cache.move_to_end(source)
+                self.hits += 1
+                return size
+            self.misses += 1
+
+        try:
+            size = self._probe(source)
+        except Exception as e:
+            logger.error(f"Error probing image size of {source}: {str(e)}")
+            raise
+
+        with self._lock:
+            self._cache[source] = size
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return size
+
+    def _probe(self, source: str) -> Tuple[int, int]:
+        data = b""
+        for probe_size in PROBE_SIZES:
+            data = asset_fetcher.read(source, probe_size)
+            size = parse_image_size(data)
+            if size is not None:
+                return size
+            if len(data) < probe_size:
+                # Whole file read; more bytes will not help
+                break
+        else:
+            data = asset_fetcher.read(source)
+
+        # Other formats: PIL reads the size without decoding the pixels
+        with PILImage.open(BytesIO(data)) as image:
+            return image.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and cache size, for logging and tuning."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._cache),
+        }
+
+
+image_probe = ImageProbe()
@@ -0,0 +1,276 @@
+"""
+Document-Scoped Image Registry
+
+ReportLab names an image XObject after a digest of the data it is drawn
+from, and every ``Image`` flowable decodes its own copy. So the same logo
+drawn by the letter header, the notesheet header of every page group and
+an image block is fetched and decoded once per use. It is embedded again
+whenever it comes from a different URL or buffer.
+
+``ImageRegistry`` keeps one ``ImageReader`` per distinct decoded image:
+
+- sources (URL, path or bytes) are fetched and decoded once per document;
+  ``asset://`` sources come from the asset pack, already decoded
+- images with equal pixels share one reader whatever their source, so
+  every use is drawn from the same single XObject
+
+Registries are document-scoped: ``image_registry_scope()`` opens one while
+a document's flowables are built and ``current_image_registry()`` returns it
+to the blocks. Outside a scope each call gets a new registry, which behaves
+as before.
+
+Layout measurement opens a ``probe_only`` scope instead. Its images are
+``ProbedImage`` placeholders sized from the file header (see
+``image_probe``), so measuring a document never downloads or decodes a
+full image.
+
+Usage:
+    with image_registry_scope():
+        flowables = build_flowables()
+    doc.build(flowables)
+
+    with image_registry_scope(probe_only=True):
+        measurement = measure_block_flowables(build_block_flowables())
+
+    # in a block
+    logo = current_image_registry().image(logo_url)
+"""
+
+import hashlib
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from io import BytesIO
+from typing import Dict, Hashable, Iterator, Optional, Union
+
+from PIL import Image as PILImage
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Flowable, Image
+
+from pdf_letter_generator.commons.asset_fetch import (
+    asset_fetcher,
+    is_remote_url,
+)
+from pdf_letter_generator.commons.asset_pack import is_pack_url, pack_reader
+from pdf_letter_generator.commons.image_probe import (
+    image_probe,
+    parse_image_size,
+)
+
+ImageSource = Union[str, bytes, BytesIO]
+
+
+class RegisteredImage(Image):
+    """``Image`` flowable drawing a shared ``ImageReader``."""
+
+    def __init__(
+        self,
+        reader: ImageReader,
+        width: Optional[float] = None,
+        height: Optional[float] = None,
+        mask: str = "auto",
+        hAlign: str = "CENTER",
+    ):
+        """
+        :param reader: Reader returned by an ``ImageRegistry``
+        :param width: Draw width in points; the pixel width by default
+        :param height: Draw height in points; the pixel height by default
+        :param mask: Transparency mask, as for ``Image``
+        :param hAlign: Horizontal alignment in the frame
+        """
+        self.hAlign = hAlign
+        self._mask = mask
+        self._drawing = None
+        self._file = None
+        self._img = reader
+        self._dpi = False
+        self.filename = repr(reader)
+        self._setup(width, height, "direct", 0)
+
+
+class ProbedImage(Flowable):
+    """Stand-in for an image during layout measurement; draws nothing."""
+
+    def __init__(
+        self,
+        image_width: int,
+        image_height: int,
+        width: Optional[float] = None,
+        height: Optional[float] = None,
+        hAlign: str = "CENTER",
+        **kwargs,
+    ):
+        """
+        :param image_width: Pixel width read from the image header
+        :param image_height: Pixel height read from the image header
+        :param width: Draw width in points; the pixel width by default
+        :param height: Draw height in points; the pixel height by default
+        :param hAlign: Horizontal alignment in the frame
+        :param kwargs: ``RegisteredImage`` arguments without effect here
+        """
+        super().__init__()
+        self.hAlign = hAlign
+        self.imageWidth = image_width
+        self.imageHeight = image_height
+        self.drawWidth = width or image_width
+        self.drawHeight = height or image_height
+
+    def wrap(self, availWidth, availHeight):
+        return self.drawWidth, self.drawHeight
+
+    def draw(self):
+        pass
+
+
+class ImageRegistry:
+    """Decoded images of one document, shared by source and by content."""
+
+    def __init__(self, probe_only: bool = False):
+        """
+        :param probe_only: Hand out ``ProbedImage`` placeholders sized from
+            image headers instead of decoded images, for measuring layouts
+        """
+        self.probe_only = probe_only
+        self._by_source: Dict[Hashable, ImageReader] = {}
+        self._by_content: Dict[bytes, ImageReader] = {}
+        self._lock = threading.Lock()
+
+    def reader(self, source: ImageSource) -> ImageReader:
+        """
+        Return the shared reader for an image source
+
+        :param source: URL, path or ``asset://`` name, image bytes, or a
+            binary buffer
+        :return: ImageReader shared by every source with the same pixels
+        :raises RuntimeError: In a probe-only registry, which must not
+            fetch or decode whole images
+        """
+        if self.probe_only:
+            raise RuntimeError(
+                "A probe-only image registry cannot decode images"
+            )
+        if hasattr(source, "read"):
+            source = source.read()
+        if isinstance(source, bytes):
+            digest = hashlib.blake2b(source, digest_size=16).digest()
+            source_key = ("bytes", digest)
+        else:
+            source_key = ("name", source)
+
+        with self._lock:
+            reader = self._by_source.get(source_key)
+            if reader is not None:
+                return reader
+
+            if isinstance(source, str) and is_pack_url(source):
+                # Already decoded, in the shared memory-mapped pack
+                reader = pack_reader(source)
+            else:
+                if isinstance(source, str) and is_remote_url(source):
+                    # Pooled S3 client and HTTP session, shared with blocks
+                    source = asset_fetcher.fetch(source)
+                reader = ImageReader(
+                    BytesIO(source) if isinstance(source, bytes) else source
+                )
+            reader = self._by_content.setdefault(
+                self._content_digest(reader), reader
+            )
+            self._by_source[source_key] = reader
+            return reader
+
+    def image(
+        self,
+        source: ImageSource,
+        width: Optional[float] = None,
+        height: Optional[float] = None,
+        **kwargs,
+    ) -> Union[RegisteredImage, ProbedImage]:
+        """
+        Return an ``Image`` flowable drawing the shared reader of a source
+
+        :param source: URL or path, image bytes, or a binary buffer
+        :param width: Draw width in points
+        :param height: Draw height in points
+        :param kwargs: Further ``RegisteredImage`` arguments
+        :return: Image flowable, or a ``ProbedImage`` in a probe-only
+            registry
+        """
+        if self.probe_only:
+            image_width, image_height = self._probe(source)
+            return ProbedImage(
+                image_width, image_height, width, height, **kwargs
+            )
+        return RegisteredImage(self.reader(source), width, height, **kwargs)
+
+    @staticmethod
+    def _probe(source: ImageSource):
+        if isinstance(source, str):
+            return image_probe.probe(source)
+        if hasattr(source, "read"):
+            source = source.read()
+        size = parse_image_size(source)
+        if size is None:
+            # PIL reads the size without decoding the pixels
+            with PILImage.open(BytesIO(source)) as image:
+                size = image.size
+        return size
+
+    @staticmethod
+    def _content_digest(reader: ImageReader) -> bytes:
+        # Decoding is needed for drawing anyway; the reader caches the data
+        hasher = hashlib.blake2b(digest_size=16)
+        width, height = reader.getSize()
+        hasher.update(b"%dx%d" % (width, height))
+        hasher.update(reader.getRGBData())
+        if reader._dataA is not None:
+            hasher.update(b"alpha")
+            hasher.update(reader._dataA.getRGBData())
+        return hasher.digest()
+
+    def __len__(self):
+        return len(self._by_content)
+
+
+_current_registry: ContextVar[Optional[ImageRegistry]] = ContextVar(
+    "image_registry", default=None
+)
+
+
+def current_image_registry() -> ImageRegistry:
+    """
+    Return the registry of the document being built
+
+    :return: Active registry, or a new one outside ``image_registry_scope``
+    """
+    registry = _current_registry.get()
+    return registry if registry is not None else ImageRegistry()
+
+
+@contextmanager
+def image_registry_scope(probe_only: bool = False) -> Iterator[ImageRegistry]:
+    """
+    Share images between all blocks built inside the scope
+
+    A scope that is already open is reused, so nested builds share it; it
+    must have been opened with the same ``probe_only``.
+
+    :param probe_only: Size images from their headers without fetching or
+        decoding them, for layout measurement
+    :return: Context manager yielding the active registry
+    :raises RuntimeError: If the open scope has the other ``probe_only``
+    """
+    registry = _current_registry.get()
+    if registry is not None:
+        if registry.probe_only != probe_only:
+            raise RuntimeError(
+                f"Image registry scope with probe_only={probe_only} nested "
+                f"in a scope with probe_only={registry.probe_only}"
+            )
+        yield registry
+        return
+
+    token = _current_registry.set(ImageRegistry(probe_only=probe_only))
+    try:
+        yield _current_registry.get()
+    finally:
+        _current_registry.reset(token)
@@ -6,9 +6,12 @@ import logging
 from io import BytesIO
 from typing import Any, Dict, Optional
 
-import requests
 from reportlab.lib.units import inch
-from reportlab.platypus import Image
+
+from pdf_letter_generator.commons.asset_fetch import asset_fetcher
+from pdf_letter_generator.commons.image_registry import (
+    current_image_registry,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -26,11 +29,8 @@ class LogoHandler:
         :return: BytesIO object containing the image data or None
         """
         try:
-            response = requests.get(s3_url, stream=True)
-            response.raise_for_status()
-
-            # Create in-memory buffer
-            image_data = BytesIO(response.content)
+            # Pooled S3 client and HTTP session, shared with the other blocks
+            image_data = BytesIO(asset_fetcher.fetch(s3_url))
             return image_data
 
         except Exception as e:
@@ -50,19 +50,14 @@ class LogoHandler:
         :param logo_source: Path to the logo file or S3 URL
         :param max_width: Maximum allowed width
         :param max_height: Maximum allowed height
-        :param is_url: Whether the logo_source is an S3 URL
+        :param is_url: Whether the logo_source is an S3 URL; URLs are also
+            recognised by their scheme
         :return: Dictionary with logo details or None
         """
         try:
-            if is_url:
-                image_data = LogoHandler.get_logo_from_s3(logo_source)
-                if not image_data:
-                    return None
-                # Load image directly from BytesIO
-                logo = Image(image_data)
-            else:
-                # Load from local path
-                logo = Image(logo_source)
+            # URLs are fetched through the pooled fetcher, paths read from
+            # disk; while measuring, only the image header is read
+            logo = current_image_registry().image(logo_source)
 
             # Calculate scaling
             img_width = logo.imageWidth
@@ -0,0 +1,207 @@
+"""
+Paragraph Parse and Wrap Cache
+
+ReportLab parses the mini-markup of every ``Paragraph`` and re-runs line
+breaking on every ``wrap``. Table cells, list items and boilerplate conditions
+repeat the same strings ("Yes", "N/A", bold headers) across cells and
+documents, so this module keeps a process-wide, LRU-bounded cache of:
+
+- parse results, keyed by (text, style fingerprint, bullet text)
+- wrap results, keyed by (parse key, available width)
+
+``CachedParagraph`` is a drop-in replacement for ``Paragraph`` that consults
+the cache. Cached fragments are cloned per paragraph, and wrap results are
+only reused for paragraphs with the same text, style and width.
+
+Usage:
+    from pdf_letter_generator.commons.paragraph_cache import CachedParagraph
+
+    para = CachedParagraph("<b>Yes</b>", style)
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from reportlab.platypus import Paragraph
+
+DEFAULT_MAX_ENTRIES = 4096
+
+# Style attributes that do not affect parsing or layout
+_IGNORED_STYLE_ATTRS = ("name", "parent")
+
+_MISSING = object()
+
+
+def style_fingerprint(style: Any) -> Tuple:
+    """
+    Build a hashable fingerprint of a style's effective attributes.
+
+    Two styles with equal fingerprints parse and wrap text identically, even
+    if they are distinct objects (each block instance builds its own styles).
+
+    :param style: ParagraphStyle instance
+    :return: Tuple of (attribute, value) pairs
+    """
+    items = []
+    for key, value in sorted(style.__dict__.items()):
+        if key in _IGNORED_STYLE_ATTRS:
+            continue
+        try:
+            hash(value)
+        except TypeError:
+            value = repr(value)
+        items.append((key, value))
+    return tuple(items)
+
+
+def _clone_frags(frags: Any) -> Any:
+    """Shallow-clone a fragment list so paragraphs never share frag objects."""
+    if not isinstance(frags, list):
+        return frags
+    return [f.clone() if hasattr(f, "clone") else f for f in frags]
+
+
+class _LRU:
+    """Minimal thread-safe LRU mapping."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ParagraphCache:
+    """Process-wide cache of paragraph parse and wrap results."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        :param max_entries: Maximum entries kept per cache (parse and wrap)
+        """
+        self.parsed = _LRU(max_entries)
+        self.wrapped = _LRU(max_entries)
+
+    def clear(self) -> None:
+        self.parsed.clear()
+        self.wrapped.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and sizes, for logging and tuning."""
+        return {
+            "parse_hits": self.parsed.hits,
+            "parse_misses": self.parsed.misses,
+            "parse_entries": len(self.parsed),
+            "wrap_hits": self.wrapped.hits,
+            "wrap_misses": self.wrapped.misses,
+            "wrap_entries": len(self.wrapped),
+        }
+
+
+paragraph_cache = ParagraphCache()
+
+
+class CachedParagraph(Paragraph):
+    """``Paragraph`` that reuses cached parse and wrap results."""
+
+    def __init__(
+        self,
+        text,
+        style=None,
+        bulletText=None,
+        frags=None,
+        caseSensitive=1,
+        encoding="utf8",
+    ):
+        self._parse_key: Optional[Tuple] = None
+
+        # Split-off parts (frags given) and unusual inputs bypass the cache
+        if (
+            frags is not None
+            or style is None
+            or not isinstance(text, str)
+            or not isinstance(bulletText, (str, type(None)))
+        ):
+            super().__init__(
+                text, style, bulletText, frags, caseSensitive, encoding
+            )
+            return
+
+        key = (text, style_fingerprint(style), bulletText, caseSensitive)
+        parsed = paragraph_cache.parsed.get(key)
+        if parsed is None:
+            super().__init__(
+                text, style, bulletText, None, caseSensitive, encoding
+            )
+            paragraph_cache.parsed.put(
+                key,
+                (
+                    self.text,
+                    self.style,
+                    _clone_frags(self.frags),
+                    _clone_frags(self.bulletText),
+                ),
+            )
+        else:
+            cleaned_text, parsed_style, parsed_frags, parsed_bullet = parsed
+            self.caseSensitive = caseSensitive
+            self.encoding = encoding
+            self._setup(
+                cleaned_text,
+                parsed_style,
+                _clone_frags(parsed_bullet),
+                _clone_frags(parsed_frags),
+                None,
+            )
+
+        self._parse_key = key
+
+    def wrap(self, availWidth, availHeight):
+        if self._parse_key is None:
+            return super().wrap(availWidth, availHeight)
+
+        key = (self._parse_key, round(availWidth, 3))
+        state = paragraph_cache.wrapped.get(key)
+        if state is not None:
+            self.__dict__.update(state)
+            return self.width, self.height
+
+        before = dict(self.__dict__)
+        result = super().wrap(availWidth, availHeight)
+        if "blPara" in self.__dict__:
+            # Keep only the attributes that wrapping (re)assigned
+            paragraph_cache.wrapped.put(
+                key,
+                {
+                    name: value
+                    for name, value in self.__dict__.items()
+                    if before.get(name, _MISSING) is not value
+                },
+            )
+        return result
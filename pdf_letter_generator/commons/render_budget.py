@@ -0,0 +1,215 @@
+"""
+Render Budget
+
+A pathological input (a dynamic table with tens of thousands of rows, HTML
+with deeply nested lists) can keep ``doc.build`` busy for minutes and tie up
+a worker. A ``RenderBudget`` limits wall time and page count and can be
+cancelled from another thread. It is checked cooperatively:
+
+- while flowables are built, once per block, IR node or HTML tag
+- while laying out (``RenderBudget.build``), after every drawn flowable
+  and on every new page
+
+When a limit is hit, ``RenderBudgetExceeded`` is raised with the progress
+made so far, so callers can report it or retry with a larger budget.
+
+Usage:
+    budget = RenderBudget(max_seconds=30, max_pages=200)
+    try:
+        pdf_bytes = interactor.generate_pdf(dtos, watermark_url, budget=budget)
+    except RenderBudgetExceeded as e:
+        logger.warning(e.to_dict())
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+REASON_TIME = "time"
+REASON_PAGES = "pages"
+REASON_CANCELLED = "cancelled"
+
+
+@dataclass
+class RenderProgress:
+    """Work done before a render was stopped."""
+
+    stage: str
+    elapsed_seconds: float
+    pages_rendered: int
+    flowables_built: int
+    flowables_drawn: int
+
+
+class RenderBudgetExceeded(Exception):
+    """Raised when a render runs out of time or pages, or is cancelled"""
+
+    def __init__(
+        self,
+        reason: str,
+        limit: Optional[float] = None,
+        progress: Optional[RenderProgress] = None,
+    ):
+        self.reason = reason
+        self.limit = limit
+        self.progress = progress
+        if progress is None:
+            # ReportLab re-raises errors from callbacks with only a message
+            super().__init__(reason)
+            return
+        super().__init__(
+            f"Render stopped ({reason}) during {progress.stage} after "
+            f"{progress.elapsed_seconds:.1f}s, {progress.pages_rendered} pages"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Structured form of the error, e.g. for an API response or a log
+
+        :return: Reason, limit and progress fields
+        """
+        return {
+            "reason": self.reason,
+            "limit": self.limit,
+            **(asdict(self.progress) if self.progress else {}),
+        }
+
+
+class RenderBudget:
+    """Wall-time and page limits for one render, checked cooperatively."""
+
+    def __init__(
+        self,
+        max_seconds: Optional[float] = None,
+        max_pages: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ):
+        """
+        :param max_seconds: Wall-time limit, counted from the first check
+        :param max_pages: Page limit
+        :param cancel_event: Event set by another thread to cancel the render
+        """
+        self.max_seconds = max_seconds
+        self.max_pages = max_pages
+        self.cancel_event = cancel_event or threading.Event()
+        self.pages_rendered = 0
+        self.flowables_built = 0
+        self.flowables_drawn = 0
+        self.exceeded: Optional[RenderBudgetExceeded] = None
+        self._started_at: Optional[float] = None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self._started_at is None:
+            return 0.0
+        return time.monotonic() - self._started_at
+
+    def start(self) -> "RenderBudget":
+        """Start the clock; later calls keep the original start time."""
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+        return self
+
+    def cancel(self) -> None:
+        """Ask the render to stop at its next check (thread-safe)."""
+        self.cancel_event.set()
+
+    def progress(self, stage: str) -> RenderProgress:
+        return RenderProgress(
+            stage=stage,
+            elapsed_seconds=round(self.elapsed_seconds, 3),
+            pages_rendered=self.pages_rendered,
+            flowables_built=self.flowables_built,
+            flowables_drawn=self.flowables_drawn,
+        )
+
+    def check(self, stage: str = "build") -> None:
+        """
+        Raise if the render is cancelled or over budget
+
+        :param stage: Name of the current stage, reported in the error
+        :raises RenderBudgetExceeded: If a limit is reached
+        """
+        self.start()
+        if self.cancel_event.is_set():
+            self._exceed(REASON_CANCELLED, None, stage)
+        if (
+            self.max_seconds is not None
+            and self.elapsed_seconds > self.max_seconds
+        ):
+            self._exceed(REASON_TIME, self.max_seconds, stage)
+        if self.max_pages is not None and self.pages_rendered > self.max_pages:
+            self._exceed(REASON_PAGES, self.max_pages, stage)
+
+    def _exceed(self, reason: str, limit: Optional[float], stage: str):
+        self.exceeded = RenderBudgetExceeded(
+            reason, limit, self.progress(stage)
+        )
+        raise self.exceeded
+
+    def add_flowables(self, count: int, stage: str = "build") -> None:
+        """
+        Count built flowables and check the budget
+
+        :param count: Number of flowables just built
+        :param stage: Name of the current stage
+        """
+        self.flowables_built += count
+        self.check(stage)
+
+    def on_page(self, canvas, doc=None) -> None:
+        """
+        Page callback (``onFirstPage``/``onLaterPages`` signature)
+
+        :param canvas: Canvas of the page being started
+        :param doc: Document template, unused
+        """
+        self.pages_rendered = max(self.pages_rendered, canvas.getPageNumber())
+        self.check("layout")
+
+    def after_flowable(self, flowable) -> None:
+        """Flowable callback, called by the doc template after each draw."""
+        self.flowables_drawn += 1
+        self.check("layout")
+
+    def build(
+        self,
+        doc,
+        flowables,
+        onFirstPage=None,
+        onLaterPages=None,
+        **kwargs,
+    ):
+        """
+        Run ``doc.build`` with the budget checked on every page and flowable
+
+        :param doc: BaseDocTemplate instance
+        :param flowables: Story to build
+        :param onFirstPage: Optional first page callback, run after the check
+        :param onLaterPages: Optional later pages callback
+        :param kwargs: Further ``doc.build`` arguments, e.g. ``canvasmaker``
+        :raises RenderBudgetExceeded: With the progress when a limit is hit
+        """
+
+        def page_callback(on_page):
+            def callback(canvas, doc):
+                self.on_page(canvas, doc)
+                if on_page is not None:
+                    on_page(canvas, doc)
+
+            return callback
+
+        doc.afterFlowable = self.after_flowable
+        try:
+            doc.build(
+                flowables,
+                onFirstPage=page_callback(onFirstPage),
+                onLaterPages=page_callback(onLaterPages),
+                **kwargs,
+            )
+        except RenderBudgetExceeded:
+            if self.exceeded is not None:
+                # Drop ReportLab's annotated copy, which lost the progress
+                raise self.exceeded from None
+            raise
@@ -0,0 +1,347 @@
+"""
+Signature Asset Processing with a Persisted Cache
+
+Signatures are usually scanned on white paper and uploaded as multi-MB
+JPEGs, then drawn two inches wide. Embedding them as they are costs a
+download, two decodes (PIL for the size, ReportLab for the data) and
+megabytes of PDF per signature block, and the white paper hides whatever
+is drawn under it. ``SignatureProcessor`` turns a signature into a small
+transparent PNG once:
+
+- the paper around the ink is trimmed
+- the ink is resampled for its drawn size at ``SIGNATURE_DPI``
+- the ink is drawn in one colour, its average, with paper transparent
+  and faint ink partly so through an alpha channel derived from darkness;
+  a flat colour compresses to little more than the alpha channel
+
+Processed signatures are kept in memory and in a private cache directory
+(see ``cache_dirs``), keyed by URL, version, drawn size and processing
+settings, so other workers and later requests never decode the original
+again. The version is the one passed in, e.g. the upload's timestamp, or
+else the ETag or Last-Modified the fetcher got with the bytes (the
+modification time and size of a local file), so a replaced signature is
+processed afresh. A signature without any version is processed every time.
+
+Usage:
+    from pdf_letter_generator.commons.signature_assets import (
+        signature_processor,
+    )
+
+    signature = signature_processor.process(url, 2 * inch, 0.75 * inch)
+    img = Image(BytesIO(signature.data), signature.draw_width,
+                signature.draw_height)
+"""
+
+import hashlib
+import logging
+import math
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Hashable, Optional, Tuple
+
+from PIL import Image as PILImage
+from PIL import ImageChops, ImageOps, ImageStat
+
+from pdf_letter_generator.commons.asset_fetch import (
+    asset_fetcher,
+    is_remote_url,
+)
+from pdf_letter_generator.commons.cache_dirs import (
+    default_cache_dir,
+    ensure_private_dir,
+    read_trusted_file,
+)
+from pdf_letter_generator.commons.image_probe import parse_image_size
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump when processing changes, so cached signatures are redone
+PROCESSING_VERSION = 1
+
+SIGNATURE_CACHE_DIR_ENV = "PDF_SIGNATURE_CACHE_DIR"
+
+# Signatures are line art; a little more resolution than photos
+SIGNATURE_DPI = 200
+DEFAULT_MEMORY_ENTRIES = 256
+
+# Grey levels at or above PAPER_LEVEL are paper; at or below INK_LEVEL
+# fully opaque ink; in between partly transparent
+PAPER_LEVEL = 235
+INK_LEVEL = 96
+
+_INK_MASK = [255 if level < PAPER_LEVEL else 0 for level in range(256)]
+_INK_ALPHA = [
+    0
+    if level >= PAPER_LEVEL
+    else min(255, (PAPER_LEVEL - level) * 255 // (PAPER_LEVEL - INK_LEVEL))
+    for level in range(256)
+]
+
+# Pixels of solid ink, whose colour the signature is drawn in
+_OPAQUE_MASK = [255 if level == 255 else 0 for level in range(256)]
+
+POINTS_PER_INCH = 72
+
+
+@dataclass(frozen=True)
+class ProcessedSignature:
+    """Transparent PNG of a signature, with the size to draw it at."""
+
+    data: bytes
+    draw_width: float
+    draw_height: float
+
+
+def fit_signature_size(
+    pixel_width: int, pixel_height: int, max_width: float, max_height: float
+) -> Tuple[float, float]:
+    """
+    Largest draw size with the image's aspect ratio that fits a box
+
+    :param pixel_width: Image width in pixels
+    :param pixel_height: Image height in pixels
+    :param max_width: Box width in points
+    :param max_height: Box height in points
+    :return: Draw width and height in points
+    """
+    aspect = pixel_width / pixel_height
+    if aspect > max_width / max_height:
+        return max_width, max_width / aspect
+    return max_height * aspect, max_height
+
+
+class SignatureProcessor:
+    """Trims and converts signatures to transparent PNGs, with caches."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        dpi: float = SIGNATURE_DPI,
+        max_memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+    ):
+        """
+        :param cache_dir: Cache directory; defaults to
+            ``$PDF_SIGNATURE_CACHE_DIR`` or a per-user
+            ``pdf_signature_cache`` directory under the system temp dir
+        :param dpi: Resolution of processed signatures at their drawn size
+        :param max_memory_entries: Signatures kept in memory
+        """
+        self.cache_dir = Path(
+            cache_dir
+            or os.environ.get(SIGNATURE_CACHE_DIR_ENV)
+            or default_cache_dir("pdf_signature_cache")
+        )
+        self._usable: Optional[bool] = None
+        self.dpi = dpi
+        self.max_memory_entries = max_memory_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[Hashable, ProcessedSignature]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def process(
+        self,
+        source: str,
+        max_width: float,
+        max_height: float,
+        version: Optional[str] = None,
+    ) -> ProcessedSignature:
+        """
+        Return a signature trimmed and sized to fit a box
+
+        :param source: S3 or HTTP(S) URL, or a local path
+        :param max_width: Box width in points
+        :param max_height: Box height in points
+        :param version: Version of the signature at the URL, e.g. its
+            upload time; part of the cache key. Defaults to the validators
+            of the fetched bytes
+        :return: Processed signature and its draw size
+        :raises Exception: If the signature cannot be fetched or processed
+        """
+        image_data = None
+        if version is None:
+            try:
+                image_data, version = self._read_versioned(source)
+            except Exception as e:
+                logger.error(f"Error reading signature {source}: {str(e)}")
+                raise
+            if version is None:
+                # Nothing tells a replaced signature apart; do not cache
+                with self._lock:
+                    self.misses += 1
+                return self._process_source(
+                    source, image_data, max_width, max_height
+                )
+
+        key = (source, version, max_width, max_height)
+        with self._lock:
+            signature = self._memory.get(key)
+            if signature is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return signature
+
+        cache_path = self._cache_path(key)
+        signature = self._load(cache_path, max_width, max_height)
+        if signature is not None:
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            with self._lock:
+                self.misses += 1
+            signature = self._process_source(
+                source, image_data, max_width, max_height
+            )
+            self._store(cache_path, signature)
+
+        with self._lock:
+            self._memory[key] = signature
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+        return signature
+
+    @staticmethod
+    def _read_versioned(source: str) -> Tuple[bytes, Optional[str]]:
+        # Bytes of the signature, with the version they were read at
+        if is_remote_url(source):
+            asset = asset_fetcher.fetch_asset(source)
+            return asset.data, asset.etag or asset.last_modified
+        with open(source, "rb") as source_file:
+            st = os.fstat(source_file.fileno())
+            return source_file.read(), f"{st.st_mtime_ns}-{st.st_size}"
+
+    def _process_source(
+        self,
+        source: str,
+        image_data: Optional[bytes],
+        max_width: float,
+        max_height: float,
+    ) -> ProcessedSignature:
+        try:
+            if image_data is None:
+                image_data = asset_fetcher.read(source)
+            return self._process(image_data, max_width, max_height)
+        except Exception as e:
+            logger.error(f"Error processing signature {source}: {str(e)}")
+            raise
+
+    def _process(
+        self, image_data: bytes, max_width: float, max_height: float
+    ) -> ProcessedSignature:
+        image = ImageOps.exif_transpose(PILImage.open(BytesIO(image_data)))
+        source_alpha = None
+        if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+            source_alpha = image.convert("RGBA").getchannel("A")
+        grey = image.convert("L")
+
+        # Ink: darker than paper and, in a transparent source, not clear
+        ink = grey.point(_INK_MASK)
+        if source_alpha is not None:
+            ink = ImageChops.multiply(ink, source_alpha)
+        bbox = ink.getbbox()
+        if bbox is None:
+            raise ValueError("Signature image has no ink")
+
+        rgba = image.convert("RGBA").crop(bbox)
+        grey = grey.crop(bbox)
+        draw_width, draw_height = fit_signature_size(
+            rgba.width, rgba.height, max_width, max_height
+        )
+        target_size = (
+            max(1, math.ceil(draw_width / POINTS_PER_INCH * self.dpi)),
+            max(1, math.ceil(draw_height / POINTS_PER_INCH * self.dpi)),
+        )
+        if rgba.width > target_size[0] or rgba.height > target_size[1]:
+            rgba = rgba.resize(target_size, PILImage.Resampling.LANCZOS)
+            grey = grey.resize(target_size, PILImage.Resampling.LANCZOS)
+
+        alpha = grey.point(_INK_ALPHA)
+        if source_alpha is not None:
+            alpha = ImageChops.multiply(alpha, rgba.getchannel("A"))
+
+        # Draw the ink in the average colour of its solid pixels
+        solid = alpha.point(_OPAQUE_MASK)
+        ink_mask = solid if solid.getbbox() is not None else alpha
+        ink_colour = tuple(
+            round(value)
+            for value in ImageStat.Stat(rgba.convert("RGB"), ink_mask).mean
+        )
+        signature = PILImage.new("RGBA", rgba.size, ink_colour)
+        signature.putalpha(alpha)
+
+        output = BytesIO()
+        signature.save(output, format="PNG", optimize=True)
+        return ProcessedSignature(
+            data=output.getvalue(),
+            draw_width=draw_width,
+            draw_height=draw_height,
+        )
+
+    def _ensure_dir(self) -> bool:
+        # Checked once; a directory others can write to is never used
+        if self._usable is None:
+            self._usable = ensure_private_dir(self.cache_dir)
+        return self._usable
+
+    def _cache_path(self, key: Tuple) -> Path:
+        parts = (PROCESSING_VERSION, self.dpi, *key)
+        digest = hashlib.sha256(
+            "|".join(str(part) for part in parts).encode("utf-8")
+        ).hexdigest()[:32]
+        return self.cache_dir / f"signature-{digest}.png"
+
+    def _load(
+        self, cache_path: Path, max_width: float, max_height: float
+    ) -> Optional[ProcessedSignature]:
+        try:
+            if not self._ensure_dir():
+                return None
+            data = read_trusted_file(cache_path)
+            if data is None:
+                return None
+            pixel_width, pixel_height = parse_image_size(data)
+            draw_width, draw_height = fit_signature_size(
+                pixel_width, pixel_height, max_width, max_height
+            )
+            return ProcessedSignature(data, draw_width, draw_height)
+        except Exception as e:
+            logger.warning(f"Ignoring signature cache entry {cache_path}: {e}")
+            return None
+
+    def _store(self, cache_path: Path, signature: ProcessedSignature) -> None:
+        try:
+            if not self._ensure_dir():
+                return
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(signature.data)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"Could not write signature cache: {e}")
+
+    def clear(self) -> None:
+        """Drop the in-memory entries; the cache directory is kept."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters, for logging and tuning."""
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "entries": len(self._memory),
+        }
+
+
+signature_processor = SignatureProcessor()
@@ -2,9 +2,10 @@
 Text utility functions for common text processing tasks.
 """
 
-from textwrap import wrap
+import html
+import re
 
-from reportlab.pdfbase.pdfmetrics import stringWidth
+from pdf_letter_generator.commons.glyph_widths import get_glyph_widths
 
 
 def sanitize(text: str) -> str:
@@ -30,12 +31,41 @@ def sanitize(text: str) -> str:
     return text.strip()
 
 
+# Tags that break lines or start blocks; others (<b>, <font>...) are inline
+_BREAK_TAG = re.compile(
+    r"<\s*/?\s*(?:br|p|para|div|li|ul|ol|h[1-6]|tr|td|th|table|bullet)\b"
+    r"[^>]*>",
+    re.IGNORECASE,
+)
+_MARKUP_TAG = re.compile(r"<[^>]*>")
+
+
+def strip_markup(text: str) -> str:
+    """
+    Convert Paragraph markup to plain text (e.g. for PDF outline titles).
+
+    Inline tags are removed without a trace, so "<b>H</b>ello" stays
+    "Hello"; line breaks and block tags become spaces.
+
+    Args:
+        text (str): Text with ReportLab mini-markup and entities
+
+    Returns:
+        str: Plain text with whitespace collapsed
+    """
+    text = _MARKUP_TAG.sub("", _BREAK_TAG.sub(" ", text))
+    return " ".join(html.unescape(text).split())
+
+
 def wrap_text_to_width(
     text: str, width: float, font_name: str, font_size: int
 ) -> list:
     """
     Wrap text to fit within a specified width using the given font settings.
 
+    Lines break at word boundaries using exact glyph widths; words wider
+    than the line are split at the last character that fits.
+
     Args:
         text (str): Text to wrap
         width (float): Maximum width in points
@@ -48,20 +78,4 @@ def wrap_text_to_width(
     if not text:
         return []
 
-    # First try wrapping at word boundaries
-    lines = wrap(text, width=max(1, int(width / (font_size * 0.5))))
-
-    # If any line is still too wide, force wrap at character level
-    final_lines = []
-    for line in lines:
-        while stringWidth(line, font_name, font_size) > width:
-            # Find the maximum number of characters that can fit
-            for i in range(len(line), 0, -1):
-                if stringWidth(line[:i], font_name, font_size) <= width:
-                    final_lines.append(line[:i])
-                    line = line[i:]
-                    break
-        if line:
-            final_lines.append(line)
-
-    return final_lines
+    return get_glyph_widths(font_name).wrap(text, width, font_size)
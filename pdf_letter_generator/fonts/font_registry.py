@@ -0,0 +1,483 @@
+"""
+Font Registry with a Persisted Parsed-Font Cache
+
+Registering a ``TTFont`` parses the whole TrueType file (metrics, cmap,
+glyph offsets used for subsetting), and every worker process repeats that
+at import time. This module instead declares fonts and families up front
+and registers them with ReportLab on first use, once per process.
+
+Parsed font tables are persisted to a compact cache file per font (keyed by
+path, size, mtime and ReportLab version), which later processes load
+instead of re-parsing the TTF. Entries hold typed arrays and a JSON index,
+so loading one never runs code, and they are only read from a private
+cache directory (see ``cache_dirs``).
+
+Usage:
+    from pdf_letter_generator.fonts.font_registry import font_registry
+
+    font_registry.ensure_family("Inter")
+"""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from fnmatch import fnmatch
+from io import BytesIO
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+import reportlab
+from reportlab import rl_config
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import (
+    TTEncoding,
+    TTFNameBytes,
+    TTFont,
+    TTFontFace,
+)
+
+from pdf_letter_generator.commons.cache_dirs import (
+    default_cache_dir,
+    ensure_private_dir,
+    read_trusted_file,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump when the cached face layout changes
+CACHE_FORMAT_VERSION = 2
+
+FONT_CACHE_MAGIC = b"PDFFONT2"
+
+FONT_CACHE_DIR_ENV = "PDF_FONT_CACHE_DIR"
+
+INTER_FONT_DIR = Path(__file__).resolve().parent / "Inter-4.1" / "extras" / "ttf"
+
+# Face attributes rebuilt on load instead of being persisted
+_TRANSIENT_FACE_ATTRS = ("_pdfScale", "_ttf_data")
+
+# Glyph tables stored as arrays rather than in the JSON index
+_ARRAY_FACE_ATTRS = (
+    "charToGlyph",
+    "charWidths",
+    "glyphToChar",
+    "hmetrics",
+    "glyphPos",
+)
+
+# Magic, then the offset and length of the JSON index
+_HEADER = struct.Struct(">8sQQ")
+_INT_TYPECODE = "q"
+_FLOAT_TYPECODE = "d"
+
+
+class FontCache:
+    """On-disk cache of parsed TrueType faces."""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        :param cache_dir: Cache directory; defaults to ``$PDF_FONT_CACHE_DIR``
+            or a per-user ``pdf_font_cache`` directory under the system
+            temp dir
+        """
+        self.cache_dir = Path(
+            cache_dir
+            or os.environ.get(FONT_CACHE_DIR_ENV)
+            or default_cache_dir("pdf_font_cache")
+        )
+        self._usable: Optional[bool] = None
+
+    def _ensure_dir(self) -> bool:
+        # Checked once; a directory others can write to is never used
+        if self._usable is None:
+            self._usable = ensure_private_dir(self.cache_dir)
+        return self._usable
+
+    def _cache_path(self, font_path: Path) -> Path:
+        stat = font_path.stat()
+        key = "|".join(
+            str(part)
+            for part in (
+                CACHE_FORMAT_VERSION,
+                reportlab.Version,
+                font_path,
+                stat.st_size,
+                stat.st_mtime_ns,
+            )
+        )
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return self.cache_dir / f"{font_path.stem}-{digest}.fontcache"
+
+    def load_face(self, filename: str) -> Optional[TTFontFace]:
+        """
+        Load a parsed face from the cache.
+
+        :param filename: Path of the TTF file
+        :return: TTFontFace, or None on a cache miss or unreadable entry
+        """
+        font_path = Path(filename).resolve()
+        try:
+            if not self._ensure_dir():
+                return None
+            data = read_trusted_file(self._cache_path(font_path))
+            if data is None:
+                return None
+            return _face_from_state(
+                _decode_face_state(data), font_path.read_bytes()
+            )
+        except Exception as e:
+            logger.warning(f"Ignoring font cache entry for {filename}: {e}")
+            return None
+
+    def store_face(self, filename: str, face: TTFontFace) -> None:
+        """
+        Persist a parsed face; failures are logged and otherwise ignored.
+
+        :param filename: Path of the TTF file
+        :param face: Parsed face of that file
+        """
+        font_path = Path(filename).resolve()
+        state = {
+            name: value
+            for name, value in vars(face).items()
+            if name not in _TRANSIENT_FACE_ATTRS
+        }
+        try:
+            if not self._ensure_dir():
+                return
+            data = _encode_face_state(state)
+            cache_path = self._cache_path(font_path)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"Could not write font cache for {filename}: {e}")
+
+
+def _encode_value(value: Any) -> Any:
+    """Encode a small face attribute as JSON, keeping its exact type."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, TTFNameBytes):
+        return {"name": value.decode("latin-1")}
+    if isinstance(value, bytes):
+        return {"bytes": value.decode("latin-1")}
+    if isinstance(value, tuple):
+        return {"tuple": [_encode_value(item) for item in value]}
+    if isinstance(value, list):
+        return {"list": [_encode_value(item) for item in value]}
+    if isinstance(value, dict):
+        return {
+            "dict": [
+                [_encode_value(key), _encode_value(item)]
+                for key, item in value.items()
+            ]
+        }
+    raise TypeError(f"Cannot cache a {type(value).__name__} face attribute")
+
+
+def _decode_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    (kind, content), = value.items()
+    if kind == "name":
+        return TTFNameBytes(content.encode("latin-1"))
+    if kind == "bytes":
+        return content.encode("latin-1")
+    if kind == "tuple":
+        return tuple(_decode_value(item) for item in content)
+    if kind == "list":
+        return [_decode_value(item) for item in content]
+    if kind == "dict":
+        return {
+            _decode_value(key): _decode_value(item) for key, item in content
+        }
+    raise ValueError(f"Unknown cached value kind {kind!r}")
+
+
+def _int_array(values: Iterable[int]) -> array:
+    return array(_INT_TYPECODE, values)
+
+
+def _float_array(values: Iterable[float]) -> array:
+    return array(_FLOAT_TYPECODE, values)
+
+
+def _encode_face_state(state: Dict[str, Any]) -> bytes:
+    """Lay out a face as typed array blobs plus a JSON index.
+
+    The large glyph tables are stored as raw arrays; the remaining
+    attributes as JSON. Loading parses data only, never code.
+    """
+    arrays: Dict[str, array] = {}
+    char_to_glyph = state["charToGlyph"]
+    arrays["charToGlyph.keys"] = _int_array(char_to_glyph)
+    arrays["charToGlyph.values"] = _int_array(char_to_glyph.values())
+    char_widths = state["charWidths"]
+    arrays["charWidths.keys"] = _int_array(char_widths)
+    arrays["charWidths.values"] = _float_array(char_widths.values())
+    glyph_to_char = state["glyphToChar"]
+    arrays["glyphToChar.keys"] = _int_array(glyph_to_char)
+    arrays["glyphToChar.counts"] = _int_array(
+        len(chars) for chars in glyph_to_char.values()
+    )
+    arrays["glyphToChar.values"] = _int_array(
+        char for chars in glyph_to_char.values() for char in chars
+    )
+    arrays["hmetrics"] = _int_array(
+        value for metrics in state["hmetrics"] for value in metrics
+    )
+    arrays["glyphPos"] = _int_array(state["glyphPos"])
+
+    index: Dict[str, Any] = {
+        "byteorder": sys.byteorder,
+        "attributes": {
+            name: _encode_value(value)
+            for name, value in state.items()
+            if name not in _ARRAY_FACE_ATTRS
+        },
+        "arrays": {},
+    }
+    output = BytesIO()
+    output.write(_HEADER.pack(FONT_CACHE_MAGIC, 0, 0))
+    for name, values in arrays.items():
+        index["arrays"][name] = [
+            values.typecode,
+            output.tell(),
+            len(values) * values.itemsize,
+        ]
+        output.write(values.tobytes())
+
+    index_json = json.dumps(index).encode("utf-8")
+    index_offset = output.tell()
+    output.write(index_json)
+    output.seek(0)
+    output.write(_HEADER.pack(FONT_CACHE_MAGIC, index_offset, len(index_json)))
+    return output.getvalue()
+
+
+def _decode_face_state(data: bytes) -> Dict[str, Any]:
+    """Inverse of ``_encode_face_state``."""
+    magic, index_offset, index_length = _HEADER.unpack_from(data)
+    if magic != FONT_CACHE_MAGIC:
+        raise ValueError("Not a font cache entry")
+    index = json.loads(data[index_offset:index_offset + index_length])
+    if index["byteorder"] != sys.byteorder:
+        raise ValueError("Font cache entry has another byte order")
+
+    arrays: Dict[str, array] = {}
+    for name, (typecode, offset, length) in index["arrays"].items():
+        if typecode not in (_INT_TYPECODE, _FLOAT_TYPECODE):
+            raise ValueError(f"Unexpected array type {typecode!r}")
+        values = array(typecode)
+        values.frombytes(data[offset:offset + length])
+        arrays[name] = values
+
+    state = {
+        name: _decode_value(value)
+        for name, value in index["attributes"].items()
+    }
+    state["charToGlyph"] = dict(
+        zip(arrays["charToGlyph.keys"], arrays["charToGlyph.values"])
+    )
+    state["charWidths"] = dict(
+        zip(arrays["charWidths.keys"], arrays["charWidths.values"])
+    )
+    glyph_chars = iter(arrays["glyphToChar.values"])
+    state["glyphToChar"] = {
+        glyph: list(islice(glyph_chars, count))
+        for glyph, count in zip(
+            arrays["glyphToChar.keys"], arrays["glyphToChar.counts"]
+        )
+    }
+    hmetrics = arrays["hmetrics"]
+    state["hmetrics"] = list(zip(hmetrics[::2], hmetrics[1::2]))
+    state["glyphPos"] = arrays["glyphPos"].tolist()
+    return state
+
+
+def _face_from_state(state: Dict[str, Any], ttf_data: bytes) -> TTFontFace:
+    """Rebuild a ``TTFontFace`` from cached attributes and the raw file."""
+    face = TTFontFace.__new__(TTFontFace)
+    face.__dict__.update(state)
+    # Raw file bytes are needed to build subsets when embedding
+    face._ttf_data = ttf_data
+    units_per_em = face.unitsPerEm
+    if units_per_em == 1000:
+        face._pdfScale = lambda x: x
+    else:
+        scale = 1000 / units_per_em
+        face._pdfScale = lambda x: x * scale
+    return face
+
+
+class CachedTTFont(TTFont):
+    """``TTFont`` whose parsed face is loaded from a ``FontCache`` if present."""
+
+    def __init__(
+        self,
+        name: str,
+        filename: str,
+        cache: Optional[FontCache] = None,
+        asciiReadable: Optional[bool] = None,
+    ):
+        face = cache.load_face(filename) if cache else None
+        if face is None:
+            super().__init__(name, filename, asciiReadable=asciiReadable)
+            if cache:
+                cache.store_face(filename, self.face)
+            return
+
+        # Mirrors TTFont.__init__, minus parsing the file
+        self.fontName = name
+        self.face = face
+        self.encoding = TTEncoding()
+        self.state = WeakKeyDictionary()
+        if asciiReadable is None:
+            asciiReadable = rl_config.ttfAsciiReadable
+        self._asciiReadable = asciiReadable
+        if hasattr(TTFont, "shapable"):
+            # Text shaping exists from ReportLab 4.1 onwards
+            self.shapable = not any(
+                fnmatch(name, pattern)
+                for pattern in getattr(rl_config, "unShapedFontGlob", None)
+                or ()
+            )
+
+
+class FontRegistry:
+    """Declares fonts and families and registers them once, on first use."""
+
+    def __init__(self, cache: Optional[FontCache] = None):
+        """
+        :param cache: Parsed-font cache; pass None to always parse TTF files
+        """
+        self.cache = cache
+        self._font_paths: Dict[str, str] = {}
+        self._families: Dict[str, Dict[str, str]] = {}
+        self._family_members: Dict[str, Tuple[str, ...]] = {}
+        self._registered_families = set()
+        self._lock = threading.RLock()
+
+    def declare_font(self, name: str, path: str) -> None:
+        """
+        Declare a TrueType font without loading it.
+
+        :param name: Font name used in styles and canvases
+        :param path: Path of the TTF file
+        """
+        with self._lock:
+            self._font_paths[name] = str(path)
+
+    def declare_family(
+        self,
+        family: str,
+        normal: str,
+        bold: Optional[str] = None,
+        italic: Optional[str] = None,
+        bold_italic: Optional[str] = None,
+        members: Iterable[str] = (),
+    ) -> None:
+        """
+        Declare a font family of already declared fonts.
+
+        :param family: Family name (used by ``<b>``/``<i>`` markup)
+        :param normal: Regular font name
+        :param bold: Bold font name (defaults to regular)
+        :param italic: Italic font name (defaults to regular)
+        :param bold_italic: Bold italic font name (defaults to bold)
+        :param members: Further fonts registered along with the family
+        """
+        bold = bold or normal
+        with self._lock:
+            self._families[family] = {
+                "normal": normal,
+                "bold": bold,
+                "italic": italic or normal,
+                "boldItalic": bold_italic or bold,
+            }
+            self._family_members[family] = tuple(members)
+
+    def ensure_font(self, name: str) -> str:
+        """
+        Register a declared font with ReportLab if not registered yet.
+
+        :param name: Font name
+        :return: The font name, for use in styles
+        :raises KeyError: If the font was never declared nor registered
+        """
+        if name in pdfmetrics.getRegisteredFontNames():
+            return name
+
+        with self._lock:
+            if name in pdfmetrics.getRegisteredFontNames():
+                return name
+            path = self._font_paths[name]
+            pdfmetrics.registerFont(CachedTTFont(name, path, cache=self.cache))
+            logger.debug(f"Registered font {name} from {path}")
+        return name
+
+    def ensure_family(self, family: str) -> str:
+        """
+        Register every font of a declared family, and the family mapping.
+
+        :param family: Family name
+        :return: The family name, for use in styles
+        """
+        if family in self._registered_families:
+            return family
+
+        with self._lock:
+            if family in self._registered_families:
+                return family
+            fonts = self._families[family]
+            for name in (*fonts.values(), *self._family_members[family]):
+                self.ensure_font(name)
+            pdfmetrics.registerFontFamily(
+                family,
+                normal=fonts["normal"],
+                bold=fonts["bold"],
+                italic=fonts["italic"],
+                boldItalic=fonts["boldItalic"],
+            )
+            self._registered_families.add(family)
+        return family
+
+    def warm_up(self) -> None:
+        """Register every declared font and family (e.g. before forking)."""
+        with self._lock:
+            families = list(self._families)
+            fonts = list(self._font_paths)
+        for family in families:
+            self.ensure_family(family)
+        for name in fonts:
+            self.ensure_font(name)
+
+
+font_registry = FontRegistry(cache=FontCache())
+
+font_registry.declare_font("Inter", INTER_FONT_DIR / "Inter-Regular.ttf")
+font_registry.declare_font("Inter-Medium", INTER_FONT_DIR / "Inter-Medium.ttf")
+font_registry.declare_font("Inter-Bold", INTER_FONT_DIR / "Inter-Bold.ttf")
+font_registry.declare_font("Inter-Italic", INTER_FONT_DIR / "Inter-Italic.ttf")
+font_registry.declare_font(
+    "Inter-BoldItalic", INTER_FONT_DIR / "Inter-BoldItalic.ttf"
+)
+font_registry.declare_family(
+    "Inter",
+    normal="Inter",
+    bold="Inter-Bold",
+    italic="Inter-Italic",
+    bold_italic="Inter-BoldItalic",
+    members=("Inter-Medium",),
+)
@@ -3,6 +3,7 @@ Utilities for PDF block generation and validation
 """
 from reportlab.lib.units import inch
 
+from pdf_letter_generator.commons.glyph_widths import string_width
 from pdf_letter_generator.pdf_blocks.pdf_config import PDFConfig
 
 
@@ -57,12 +58,12 @@ def draw_text_line(
 
     # Adjust text based on alignment
     if align == "center":
-        text_width = canvas.stringWidth(
+        text_width = string_width(
             text, font_config["name"], font_config["size"]
         )
         x = x - text_width / 2
     elif align == "right":
-        text_width = canvas.stringWidth(
+        text_width = string_width(
             text, font_config["name"], font_config["size"]
         )
         x = x - text_width
@@ -241,7 +242,7 @@ class PDFLayoutManager:
         y = y_position if y_position is not None else self.current_y
 
         # Calculate text width for alignment
-        text_width = self.canvas.stringWidth(
+        text_width = string_width(
             text, font_config["name"], font_config["size"]
         )
         page_width = PDFConfig.get_page_width()
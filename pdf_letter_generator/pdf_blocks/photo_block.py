@@ -3,14 +3,27 @@ Photo Block Module
 
 This module handles the addition of photos to PDF documents with support for
 grid layouts, captions, and proper scaling.
+
+Each photo is read, resized for its drawn width and decoded once, up front
+and in parallel for a grid; the canvas then draws the shared ImageReader.
 """
 
-from reportlab.lib import utils
+from concurrent.futures import ThreadPoolExecutor
+
 from reportlab.lib.units import inch
-from reportlab.pdfbase.pdfmetrics import stringWidth
 
+from pdf_letter_generator.commons.asset_fetch import asset_fetcher
+from pdf_letter_generator.commons.glyph_widths import get_glyph_widths
+from pdf_letter_generator.commons.image_preparation import image_preparer
+from pdf_letter_generator.commons.image_probe import image_probe
+from pdf_letter_generator.commons.image_registry import (
+    current_image_registry,
+)
 from plugins.interactors.dms.pdf_blocks.pdf_config import PDFConfig
 
+# Photos of one grid read and resized at once
+DEFAULT_PHOTO_WORKERS = 8
+
 
 class PhotoBlockValidator:
     """Validator for photo block data"""
@@ -54,22 +67,67 @@ class PhotoBlock:
         self.margin = PDFConfig.MARGIN
         self.photo_spacing = 0.5 * inch
         self.caption_height = 0.3 * inch
+        # Decoded photos, shared by every use of the same image
+        self.image_registry = current_image_registry()
 
     def get_image_dimensions(self, image_path, desired_width):
         """
         Calculate image dimensions while maintaining aspect ratio
 
-        :param image_path: Path to the image file
+        :param image_path: Path or URL of the image file; only its header
+            is read
         :param desired_width: Desired width in points
         :return: tuple of (width, height) in points
         """
-        img = utils.ImageReader(image_path)
-        orig_width, orig_height = img.getSize()
+        orig_width, orig_height = image_probe.probe(image_path)
         aspect = orig_height / float(orig_width)
 
         return desired_width, desired_width * aspect
 
-    def add_photo_with_caption(self, x, y, photo_data, width):
+    def _prepare_photo(self, image_path, desired_width):
+        # Resampled for the drawn width; safe to run in a worker thread
+        return image_preparer.prepare(
+            asset_fetcher.read(image_path),
+            max_width=desired_width,
+            max_height=float("inf"),
+        )
+
+    def load_photos(self, image_paths, desired_width):
+        """
+        Read, resize and decode photos once for drawing at a given width
+
+        :param image_paths: Paths or URLs of the image files
+        :param desired_width: Desired width in points
+        :return: dict of path to (ImageReader, height in points)
+        """
+        unique_paths = list(dict.fromkeys(image_paths))
+        if len(unique_paths) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(len(unique_paths), DEFAULT_PHOTO_WORKERS),
+                thread_name_prefix="photo-block",
+            ) as executor:
+                prepared = list(
+                    executor.map(
+                        lambda path: self._prepare_photo(path, desired_width),
+                        unique_paths,
+                    )
+                )
+        else:
+            prepared = [
+                self._prepare_photo(path, desired_width)
+                for path in unique_paths
+            ]
+
+        photos = {}
+        for path, image in zip(unique_paths, prepared):
+            aspect = image.draw_height / float(image.draw_width)
+            photos[path] = (
+                self.image_registry.reader(image.data),
+                desired_width * aspect,
+            )
+        return photos
+
+    def add_photo_with_caption(self, x, y, photo_data, width, photo=None):
         """
         Add a single photo with caption to the PDF
 
@@ -77,14 +135,19 @@ class PhotoBlock:
         :param y: Y coordinate for photo placement
         :param photo_data: Dictionary containing photo path and caption
         :param width: Desired width of the photo
+        :param photo: (ImageReader, height) from load_photos, if loaded
         :return: Height of photo + caption
         """
+        if photo is None:
+            photo = self.load_photos([photo_data["path"]], width)[
+                photo_data["path"]
+            ]
+
         # Add photo
-        img_width, img_height = self.get_image_dimensions(
-            photo_data["path"], width
-        )
+        reader, img_height = photo
+        img_width = width
         self.canvas.drawImage(
-            photo_data["path"],
+            reader,
             x,
             y - img_height,
             width=img_width,
@@ -103,28 +166,11 @@ class PhotoBlock:
 
         self.canvas.setFont(font_name, font_size)
 
-        # Wrap caption if it's too long
-        if stringWidth(caption, font_name, font_size) > available_width:
-            words = caption.split()
-            lines = []
-            current_line = []
-
-            for word in words:
-                test_line = " ".join(current_line + [word])
-                if (
-                    stringWidth(test_line, font_name, font_size)
-                    <= available_width
-                ):
-                    current_line.append(word)
-                else:
-                    if current_line:
-                        lines.append(" ".join(current_line))
-                        current_line = [word]
-                    else:
-                        lines.append(word)
-
-            if current_line:
-                lines.append(" ".join(current_line))
+        # Wrap caption if it's too long; widths come from the font's cached
+        # glyph table
+        glyph_widths = get_glyph_widths(font_name)
+        if glyph_widths.string_width(caption, font_size) > available_width:
+            lines = glyph_widths.wrap(caption, available_width, font_size)
 
             for i, line in enumerate(lines):
                 self.canvas.drawString(
@@ -152,6 +198,9 @@ class PhotoBlock:
             - (photos_per_row - 1) * self.photo_spacing
         )
         photo_width = available_width / photos_per_row
+        photos = self.load_photos(
+            [photo["path"] for photo in data["photos"]], photo_width
+        )
 
         current_x = self.margin
         current_y = self.layout_manager.get_current_y()
@@ -167,7 +216,11 @@ class PhotoBlock:
                 row_height = 0
 
             photo_height = self.add_photo_with_caption(
-                current_x, current_y, photo, photo_width
+                current_x,
+                current_y,
+                photo,
+                photo_width,
+                photos[photo["path"]],
             )
             row_height = max(row_height, photo_height)
 
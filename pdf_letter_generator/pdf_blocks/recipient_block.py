@@ -10,6 +10,7 @@ from typing import Dict
 
 from reportlab.lib.colors import black
 
+from pdf_letter_generator.commons.glyph_widths import string_width
 from plugins.interactors.dms.pdf_blocks.pdf_config import PDFConfig
 from plugins.pdf_letter_generator.commons.constants import (
     BOLD_FONT,
@@ -112,15 +113,13 @@ def add_recipient_block(canvas, data: Dict[str, str], layout):
 
         for word in words:
             # Calculate width of the word
-            word_width = canvas.stringWidth(word + " ", font, font_size)
+            word_width = string_width(word + " ", font, font_size)
 
             # If adding this word would exceed max width, start a new line
             if current_line_width + word_width > max_width:
                 lines.append(" ".join(current_line))
                 current_line = [word]
-                current_line_width = canvas.stringWidth(
-                    word + " ", font, font_size
-                )
+                current_line_width = word_width
             else:
                 current_line.append(word)
                 current_line_width += word_width
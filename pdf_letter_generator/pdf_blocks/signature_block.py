@@ -6,12 +6,9 @@ with consistent formatting and validation.
 """
 
 import logging
-import urllib.request
 from dataclasses import dataclass
-from io import BytesIO
 from typing import Any, List, Optional
 
-from PIL import Image
 from reportlab.lib.colors import black
 from reportlab.lib.enums import TA_LEFT
 from reportlab.lib.styles import ParagraphStyle
@@ -20,6 +17,10 @@ from reportlab.platypus import Image as RLImage
 from reportlab.platypus import Paragraph, Spacer
 from reportlab.platypus.flowables import Flowable
 
+from pdf_letter_generator.commons.image_registry import (
+    current_image_registry,
+)
+from pdf_letter_generator.commons.signature_assets import signature_processor
 from plugins.interactors.dms.pdf_blocks.pdf_config import PDFConfig
 from plugins.pdf_letter_generator.commons import PDFLineSpacing
 from plugins.pdf_letter_generator.commons.constants import REGULAR_FONT
@@ -72,6 +73,7 @@ class SignatureBlock:
         lines: List[str],
         layout,
         signature_image_url: Optional[str] = None,
+        signature_version: Optional[str] = None,
     ) -> float:
         """
         Add a signature block to the PDF.
@@ -81,6 +83,9 @@ class SignatureBlock:
             lines: List of strings to be displayed in the signature block
             layout: Layout manager for positioning
             signature_image_url: Optional URL of the signature image
+            signature_version: Version of the image at the URL (e.g. its
+                upload time), so a replaced signature is not served from
+                the signature cache
 
         Returns:
             float: Height of the added block
@@ -134,7 +139,10 @@ class SignatureBlock:
         # Handle signature image or draw box
         if signature_image_url:
             signature_img = self._fetch_and_resize_image(
-                signature_image_url, signature_width, signature_height
+                signature_image_url,
+                signature_width,
+                signature_height,
+                signature_version,
             )
             if signature_img:
                 signature_img.drawOn(
@@ -186,39 +194,36 @@ class SignatureBlock:
 
     @staticmethod
     def _fetch_and_resize_image(
-        image_url: str, max_width: float, max_height: float
+        image_url: str,
+        max_width: float,
+        max_height: float,
+        version: Optional[str] = None,
     ) -> RLImage:
         """
         Fetch image from URL and resize it to fit within specified dimensions.
 
+        The signature is trimmed to its ink and converted to a transparent
+        PNG at the drawn size once; later blocks reuse the cached result.
+
         Args:
             image_url: URL of the signature image
             max_width: Maximum width in points
             max_height: Maximum height in points
+            version: Version of the image at the URL, if known
 
         Returns:
             RLImage: ReportLab Image object ready to be drawn
         """
         try:
-            # Fetch image from URL
-            with urllib.request.urlopen(image_url) as response:
-                img_data = response.read()
-
-            # Open image with PIL
-            img = Image.open(BytesIO(img_data))
-
-            # Calculate aspect ratio and new dimensions
-            aspect = img.width / img.height
-            if aspect > max_width / max_height:
-                new_width = max_width
-                new_height = max_width / aspect
-            else:
-                new_height = max_height
-                new_width = max_height * aspect
+            signature = signature_processor.process(
+                image_url, max_width, max_height, version=version
+            )
 
-            # Create ReportLab image
-            rl_img = RLImage(
-                BytesIO(img_data), width=new_width, height=new_height
+            # Create ReportLab image, shared by repeated signatures
+            rl_img = current_image_registry().image(
+                signature.data,
+                width=signature.draw_width,
+                height=signature.draw_height,
             )
             return rl_img
 
@@ -1,33 +1,14 @@
 from sign_block import SignBlock
 from pathlib import Path
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfbase import pdfmetrics
 
-regular_font_path = "pdf_letter_generator/fonts/Inter-4.1/extras/ttf/Inter-Regular.ttf"
-medium_font_path = "pdf_letter_generator/fonts/Inter-4.1/extras/ttf/Inter-Medium.ttf"
-bold_font_path = "pdf_letter_generator/fonts/Inter-4.1/extras/ttf/Inter-Bold.ttf"
-italic_font_path = "pdf_letter_generator/fonts/Inter-4.1/extras/ttf/Inter-Italic.ttf"
-bolditalic_font_path = "pdf_letter_generator/fonts/Inter-4.1/extras/ttf/Inter-BoldItalic.ttf"
-
-# Register fonts
-pdfmetrics.registerFont(TTFont("Inter", regular_font_path))
-pdfmetrics.registerFont(TTFont("Inter-Medium", medium_font_path))
-pdfmetrics.registerFont(TTFont("Inter-Bold", bold_font_path))
-pdfmetrics.registerFont(TTFont("Inter-Italic", italic_font_path))
-pdfmetrics.registerFont(TTFont("Inter-BoldItalic", bolditalic_font_path))
-
-pdfmetrics.registerFontFamily(
-    "Inter",
-    normal="Inter",
-    bold="Inter-Bold",
-    italic="Inter-Italic",
-    boldItalic="Inter-BoldItalic"
-)
+from pdf_letter_generator.fonts.font_registry import font_registry
 
 # Read your local PDF file
 pdf_path = "pc_documents.pdf"  # Replace with your actual file path
 if Path(pdf_path).exists():
+    font_registry.ensure_family("Inter")
+
     with open(pdf_path, "rb") as pdf_file:
         input_pdf_bytes = pdf_file.read()  # Read PDF as bytes
 